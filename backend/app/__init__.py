@@ -24,13 +24,19 @@ for custom_site_packages in possible_paths:
 from flask import Flask, send_from_directory
 from app.config import config
 from app.extensions import db, migrate, jwt, ma, cors, socketio
+from app.database import init_engines
+from app.metrics import init_metrics
+from app.profiling import init_profiling
+from app.services.presence import init_presence
+from app.services.resume import init_resume
 
 
-def create_app(config_name: str = None) -> Flask:
+def create_app(config_name: str = None, overrides: dict = None) -> Flask:
     """Create and configure the Flask application.
     
     Args:
         config_name: Configuration name (development, testing, production)
+        overrides: Config values set over the configuration, e.g. by tests
         
     Returns:
         Configured Flask application instance
@@ -42,21 +48,33 @@ def create_app(config_name: str = None) -> Flask:
     static_folder = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static')
     app = Flask(__name__, static_folder=static_folder, static_url_path='')
     app.config.from_object(config[config_name])
+    if overrides:
+        app.config.update(overrides)
     
     # Initialize extensions
     db.init_app(app)
+    init_engines(app, db)
+    init_metrics(app, db)
+    init_profiling(app)
     migrate.init_app(app, db)
+    init_resume(app, db)
+    init_presence(app)
     jwt.init_app(app)
     ma.init_app(app)
     cors.init_app(app, origins=app.config['CORS_ORIGINS'])
+    
+    # Register Socket.IO handlers; imported before init_app so every app's
+    # server gets them (handlers declared after init_app only reach that server)
+    from app.routes import socketio_handlers
     socketio.init_app(app)
     
     # Register blueprints (must be before static file serving)
     from app.routes import register_blueprints
     register_blueprints(app)
     
-    # Register Socket.IO handlers
-    from app.routes import socketio_handlers
+    # Register CLI commands
+    from app.cli import register_commands
+    register_commands(app)
     
     # Health check endpoint
     @app.route('/api/health', methods=['GET'])
@@ -0,0 +1,81 @@
+"""Flask CLI commands."""
+import click
+from flask import Flask
+from flask.cli import with_appcontext
+
+
+def register_commands(app: Flask) -> None:
+    """Register all application CLI commands.
+    
+    Args:
+        app: Flask application instance
+    """
+    app.cli.add_command(archive_games_command)
+    app.cli.add_command(recompute_ratings_command)
+    app.cli.add_command(project_games_command)
+    app.cli.add_command(profile_token_command)
+
+
+@click.command('archive-games')
+@click.option('--days', default=30, show_default=True,
+              help='Archive finished games last updated more than this many days ago.')
+@click.option('--batch-size', default=500, show_default=True,
+              help='Games moved per transaction.')
+@click.option('--limit', type=int, default=None,
+              help='Maximum number of games to archive in this run.')
+@with_appcontext
+def archive_games_command(days: int, batch_size: int, limit: int):
+    """Move old finished games into the games_archive table."""
+    from app.services.archive import archive_finished_games
+    
+    archived = archive_finished_games(days, batch_size=batch_size, limit=limit)
+    click.echo(f'Archived {archived} games')
+
+
+@click.command('recompute-ratings')
+@click.option('--chunk-size', default=10000, show_default=True,
+              help='Games streamed and replayed per chunk.')
+@click.option('--k-factor', default=32.0, show_default=True, help='Elo K-factor.')
+@click.option('--no-numpy', is_flag=True, help='Replay sequentially without NumPy.')
+@with_appcontext
+def recompute_ratings_command(chunk_size: int, k_factor: float, no_numpy: bool):
+    """Recompute all Elo ratings by replaying the game history."""
+    import time
+    from app.services.rating import recompute_ratings
+    
+    started = time.perf_counter()
+    result = recompute_ratings(chunk_size=chunk_size, k=k_factor, use_numpy=not no_numpy)
+    elapsed = time.perf_counter() - started
+    click.echo(f"Replayed {result['games']} games for {result['users']} users "
+               f"in {elapsed:.2f}s ({'numpy' if result['vectorized'] else 'python'})")
+
+
+@click.command('project-games')
+@click.option('--batch-size', default=1000, show_default=True,
+              help='Games rebuilt and written per transaction.')
+@click.option('--game-id', type=int, default=None, help='Only rebuild this game.')
+@with_appcontext
+def project_games_command(batch_size: int, game_id: int):
+    """Rebuild games rows from the game event log."""
+    import time
+    from app.services.events import project_games
+    
+    started = time.perf_counter()
+    result = project_games(batch_size=batch_size, game_id=game_id)
+    elapsed = time.perf_counter() - started
+    click.echo(f"Replayed {result['games']} games, updated {result['updated']} rows "
+               f"in {elapsed:.2f}s")
+
+
+@click.command('profile-token')
+@click.option('--ttl', default=300, show_default=True, help='Seconds until the token expires.')
+@with_appcontext
+def profile_token_command(ttl: int):
+    """Print a signed X-Profile-Token header value."""
+    from flask import current_app
+    from app.profiling import make_profile_token
+    
+    secret = current_app.config.get('PROFILING_SECRET')
+    if not secret:
+        raise click.ClickException('PROFILING_SECRET is not set')
+    click.echo(make_profile_token(secret, ttl))
@@ -1,6 +1,7 @@
 """Application configuration."""
 import os
 from datetime import timedelta
+from app.database import pool_options, REPLICA_BIND_KEY
 
 
 class Config:
@@ -12,6 +13,18 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///bingo.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Optional read replica for read-only routes; clients that just wrote
+    # keep reading from the primary for DB_REPLICA_STICKY_SECONDS
+    DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {REPLICA_BIND_KEY: DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    DB_REPLICA_STICKY_SECONDS = float(os.getenv('DB_REPLICA_STICKY_SECONDS', 5))
+    
+    # SQLite connection PRAGMAs (ignored for other databases, None keeps the SQLite default)
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    
     # JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
@@ -23,6 +36,65 @@ class Config:
     # CORS - Allow all origins when serving static files from same origin
     # In production with static files, CORS is less critical since everything is same-origin
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
+    
+    # Per-request profiling: requests with a token signed by PROFILING_SECRET
+    # (see `flask profile-token`) or a random sample are run under cProfile
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False').lower() == 'true'
+    PROFILING_SECRET = os.getenv('PROFILING_SECRET')
+    PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', 0))
+    PROFILING_DIR = os.getenv('PROFILING_DIR')  # Defaults to <instance>/profiles
+    PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', 50))
+    
+    # AI search instrumentation for every move (always on for ?debug=1 moves)
+    AI_SEARCH_STATS = os.getenv('AI_SEARCH_STATS', 'False').lower() == 'true'
+    
+    # Solve AI moves exactly once this many cells are empty (0 disables)
+    AI_ENDGAME_EMPTY_CELLS = int(os.getenv('AI_ENDGAME_EMPTY_CELLS', 16))
+    
+    # AI engine of new AI games ('minimax' or 'mcts') and MCTS search budget
+    AI_ENGINE_DEFAULT = os.getenv('AI_ENGINE_DEFAULT', 'minimax')
+    MCTS_ITERATIONS = int(os.getenv('MCTS_ITERATIONS', 4000))
+    MCTS_TIME_BUDGET = float(os.getenv('MCTS_TIME_BUDGET')) if os.getenv('MCTS_TIME_BUDGET') else None
+    MCTS_WORKERS = int(os.getenv('MCTS_WORKERS', 1))  # >1 runs root-parallel on the AI worker pool
+    
+    # Difficulty of new AI games ('easy', 'medium', 'hard' or 'expert') and the
+    # highest level played; lower the cap under load to save CPU
+    AI_DIFFICULTY_DEFAULT = os.getenv('AI_DIFFICULTY_DEFAULT', 'hard')
+    AI_MAX_DIFFICULTY = os.getenv('AI_MAX_DIFFICULTY', 'expert')
+    
+    # Search the AI's replies to each human move on the worker pool while the human thinks (off by default)
+    AI_PONDER_ENABLED = os.getenv('AI_PONDER_ENABLED', 'False').lower() == 'true'
+    AI_PONDER_BUDGET = float(os.getenv('AI_PONDER_BUDGET', 10))  # Seconds of queued searches per game
+    AI_PONDER_IDLE = float(os.getenv('AI_PONDER_IDLE', 120))  # Seconds until unused results are dropped
+    AI_PONDER_MAX_GAMES = int(os.getenv('AI_PONDER_MAX_GAMES', 32))
+    
+    # Game event log: a snapshot of the game state every this many events (and at the end)
+    GAME_SNAPSHOT_INTERVAL = int(os.getenv('GAME_SNAPSHOT_INTERVAL', 16))
+    
+    # Spectators get the latest game state at most once per interval, sent in chunks
+    SPECTATOR_FRAME_INTERVAL = float(os.getenv('SPECTATOR_FRAME_INTERVAL', 0.25))  # Seconds
+    SPECTATOR_CHUNK_SIZE = int(os.getenv('SPECTATOR_CHUNK_SIZE', 500))  # Spectators per yield
+    
+    # Reconnecting clients catch up from the latest events of each game kept in memory;
+    # larger gaps get the full game state
+    RESUME_BUFFER_SIZE = int(os.getenv('RESUME_BUFFER_SIZE', 64))  # Events per game
+    RESUME_MAX_GAMES = int(os.getenv('RESUME_MAX_GAMES', 4096))
+    
+    # Presence of users in games and lobby rooms; 'local' keeps it in this process
+    PRESENCE_BACKEND = os.getenv('PRESENCE_BACKEND', 'local')
+    PRESENCE_TTL = float(os.getenv('PRESENCE_TTL', 60))  # Seconds without a heartbeat until a sid expires
+    PRESENCE_SWEEP_INTERVAL = float(os.getenv('PRESENCE_SWEEP_INTERVAL', 15))
+    PRESENCE_FORFEIT_GRACE = float(os.getenv('PRESENCE_FORFEIT_GRACE', 60))  # Seconds an absent opponent has to move
+    
+    # GET /api/metrics requires "Authorization: Bearer <METRICS_TOKEN>" when set
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    METRICS_ACTIVE_TTL = float(os.getenv('METRICS_ACTIVE_TTL', 15))  # Seconds active game counts are reused
+    
+    # Batch analysis (POST /api/ai/analyze) on a process pool
+    AI_ANALYSIS_WORKERS = int(os.getenv('AI_ANALYSIS_WORKERS', 0)) or None  # None = CPU count
+    AI_ANALYSIS_DEFAULT_DEPTH = int(os.getenv('AI_ANALYSIS_DEFAULT_DEPTH', 4))
+    AI_ANALYSIS_MAX_DEPTH = int(os.getenv('AI_ANALYSIS_MAX_DEPTH', 6))
+    AI_ANALYSIS_MAX_POSITIONS = int(os.getenv('AI_ANALYSIS_MAX_POSITIONS', 200))
 
 
 class DevelopmentConfig(Config):
@@ -37,6 +109,7 @@ class TestingConfig(Config):
     
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_BINDS = {}
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
 
 
@@ -45,6 +118,18 @@ class ProductionConfig(Config):
     
     DEBUG = False
     TESTING = False
+    
+    # Connection pool
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    SQLALCHEMY_ENGINE_OPTIONS = pool_options(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
 
 
 config = {
@@ -0,0 +1,199 @@
+"""Database engine configuration and read/write session routing."""
+import time
+from typing import Dict, Optional
+from flask import Flask, current_app, g, has_app_context, has_request_context, request, session
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.dml import UpdateBase
+
+# Bind key of the read replica engine in SQLALCHEMY_BINDS
+REPLICA_BIND_KEY = 'replica'
+
+# Client key -> monotonic time until which reads must go to the primary
+_sticky_until: Dict[str, float] = {}
+_STICKY_PRUNE_SIZE = 10000
+
+
+def sqlite_pragmas_from_config(config) -> Dict[str, object]:
+    """Collect the SQLite PRAGMA settings from the application config.
+
+    Settings left as None are skipped so SQLite keeps its own default.
+
+    Args:
+        config: Flask config mapping
+
+    Returns:
+        Ordered dictionary of PRAGMA name to value
+    """
+    pragmas = {
+        'journal_mode': config.get('SQLITE_JOURNAL_MODE'),
+        'synchronous': config.get('SQLITE_SYNCHRONOUS'),
+        'busy_timeout': config.get('SQLITE_BUSY_TIMEOUT_MS'),
+        'mmap_size': config.get('SQLITE_MMAP_SIZE'),
+    }
+    return {name: value for name, value in pragmas.items() if value is not None}
+
+
+def install_sqlite_pragmas(engine: Engine, pragmas: Dict[str, object]) -> None:
+    """Apply PRAGMA settings to every new connection of a SQLite engine.
+
+    journal_mode=WAL is persistent in the database file, the other settings
+    are per connection, so all of them are issued from the connect event.
+
+    Args:
+        engine: SQLAlchemy engine
+        pragmas: PRAGMA name to value mapping
+    """
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+
+def init_engines(app: Flask, db) -> None:
+    """Configure every engine created by Flask-SQLAlchemy for the app.
+
+    Args:
+        app: Flask application instance
+        db: Flask-SQLAlchemy extension
+    """
+    pragmas = sqlite_pragmas_from_config(app.config)
+    with app.app_context():
+        for engine in db.engines.values():
+            install_sqlite_pragmas(engine, pragmas)
+
+
+def pool_options(pool_size: Optional[int] = None, max_overflow: Optional[int] = None,
+                 pool_recycle: Optional[int] = None, pool_pre_ping: bool = False) -> dict:
+    """Build SQLALCHEMY_ENGINE_OPTIONS for a pooled engine.
+
+    Args:
+        pool_size: Number of connections kept open in the pool
+        max_overflow: Connections allowed above pool_size under load
+        pool_recycle: Seconds after which a connection is replaced
+        pool_pre_ping: Test connections for liveness on checkout
+
+    Returns:
+        Engine options dictionary
+    """
+    options = {'pool_pre_ping': pool_pre_ping}
+    if pool_size is not None:
+        options['pool_size'] = pool_size
+    if max_overflow is not None:
+        options['max_overflow'] = max_overflow
+    if pool_recycle is not None:
+        options['pool_recycle'] = pool_recycle
+    return options
+
+
+def _request_user():
+    """User of the current request or Socket.IO event, if known."""
+    if getattr(request, 'sid', None) is not None:
+        # Socket.IO events carry no JWT; handle_connect keeps the user in the socket's session
+        return session.get('user_id')
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+def client_keys() -> list:
+    """Identify the client of the current request for read-your-writes stickiness.
+
+    Authenticated clients are keyed by user, so a REST write by a user also
+    pins that user's socket reads. Only anonymous clients fall back to the
+    remote address, which all clients behind one proxy share.
+
+    Returns:
+        List of client key strings
+    """
+    user_id = _request_user()
+    if user_id:
+        return [f'user:{user_id}']
+    if request.remote_addr:
+        return [f'addr:{request.remote_addr}']
+    return []
+
+
+def mark_sticky(keys: list) -> None:
+    """Pin reads of the given clients to the primary for the sticky window.
+
+    Args:
+        keys: Client keys from client_keys()
+    """
+    window = current_app.config.get('DB_REPLICA_STICKY_SECONDS', 0)
+    if not window or not keys:
+        return
+    now = time.monotonic()
+    if len(_sticky_until) > _STICKY_PRUNE_SIZE:
+        for key in [k for k, until in _sticky_until.items() if until <= now]:
+            del _sticky_until[key]
+    for key in keys:
+        _sticky_until[key] = now + window
+
+
+def is_sticky(keys: list) -> bool:
+    """Check if any of the given clients wrote within the sticky window.
+
+    Args:
+        keys: Client keys from client_keys()
+
+    Returns:
+        True if reads must stay on the primary
+    """
+    now = time.monotonic()
+    return any(_sticky_until.get(key, 0) > now for key in keys)
+
+
+def use_replica_for_request() -> None:
+    """Route reads of the current request to the replica unless the client is sticky."""
+    g.db_use_replica = not is_sticky(client_keys())
+
+
+class RoutingSession(Session):
+    """Session that sends reads of read-only requests to the replica engine.
+
+    Flushes and DML statements always go to the primary, as does everything
+    when no replica bind is configured.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """Select the replica engine for reads of read-only requests."""
+        if (bind is None and not self._flushing and not isinstance(clause, UpdateBase)
+                and has_app_context() and g.get('db_use_replica', False)):
+            engine = self._db.engines.get(REPLICA_BIND_KEY)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _record_flush(session, flush_context):
+    session.info['db_wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _record_orm_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['db_wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _pin_writer_to_primary(session):
+    if session.info.pop('db_wrote', False) and has_request_context():
+        mark_sticky(client_keys())
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _forget_write(session):
+    session.info.pop('db_wrote', None)
@@ -0,0 +1,348 @@
+"""Prometheus-compatible metrics.
+
+Metrics live in process memory and are rendered in the Prometheus text
+exposition format by GET /api/metrics. Updates take no locks: under eventlet
+green threads only switch on I/O, so a dictionary update is never interleaved
+with another one. The only metric that reads the database (active games and
+rooms) is recomputed at most once per `active_ttl` seconds.
+"""
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from flask import Flask, g, has_app_context, request
+from sqlalchemy import event
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Seconds the active game and room counts are reused between scrapes
+DEFAULT_ACTIVE_TTL = 15.0
+
+_active_ttl = DEFAULT_ACTIVE_TTL
+# (computed at, samples) of the last active counts
+_active_counts: Optional[Tuple[float, List[Tuple[dict, float]]]] = None
+
+
+def _escape(value) -> str:
+    """Escape a label value for the text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    """Format a label set as {name="value",...}."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """Base class of a named metric with a fixed set of label names."""
+
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict) -> Tuple:
+        return tuple(labels.get(name, '') for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Render the sample lines of the metric."""
+
+    def render(self) -> str:
+        """Render the metric with its HELP and TYPE lines."""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type_name}']
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increase the counter of a label set."""
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Current value of a label set."""
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+                for key, value in list(self._values.items())]
+
+
+class Gauge(Counter):
+    """Value that can go up and down per label set."""
+
+    type_name = 'gauge'
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        """Decrease the gauge of a label set."""
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        """Set the gauge of a label set."""
+        self._values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets per label set."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Label set -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """Record an observation."""
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class CallbackMetric(Metric):
+    """Metric whose samples are computed when the registry is rendered."""
+
+    def __init__(self, name: str, documentation: str, type_name: str,
+                 callback: Callable[[], Iterable[Tuple[dict, float]]], labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.type_name = type_name
+        self.callback = callback
+
+    def samples(self) -> List[str]:
+        return [f'{self.name}{_format_labels(self.labelnames, self._key(labels))} {_format_value(value)}'
+                for labels, value in self.callback()]
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric to the registry and return it."""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        blocks = []
+        for metric in list(self._metrics.values()):
+            try:
+                blocks.append(metric.render())
+            except Exception as e:
+                blocks.append(f'# {metric.name} unavailable: {_escape(e)}')
+        return '\n'.join(blocks) + '\n'
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.register(Counter(
+    'bingo_http_requests_total', 'HTTP requests by route, method and status.',
+    ['endpoint', 'method', 'status']))
+HTTP_REQUEST_SECONDS = registry.register(Histogram(
+    'bingo_http_request_duration_seconds', 'HTTP request latency by route.',
+    ['endpoint', 'method']))
+DB_QUERIES = registry.register(Counter(
+    'bingo_db_queries_total', 'SQL statements executed.'))
+DB_QUERY_SECONDS = registry.register(Counter(
+    'bingo_db_query_seconds_total', 'Time spent executing SQL statements.'))
+DB_QUERIES_PER_REQUEST = registry.register(Histogram(
+    'bingo_db_queries_per_request', 'SQL statements executed per HTTP request.',
+    ['endpoint'], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55)))
+DB_SECONDS_PER_REQUEST = registry.register(Histogram(
+    'bingo_db_seconds_per_request', 'Time spent in SQL statements per HTTP request.',
+    ['endpoint']))
+AI_SEARCH_SECONDS = registry.register(Histogram(
+    'bingo_ai_search_duration_seconds', 'Time to choose an AI move.'))
+AI_PONDER_MOVES = registry.register(Counter(
+    'bingo_ai_ponder_moves_total', 'AI moves of pondered games by whether the reply was ready.',
+    ['result']))
+SOCKET_CONNECTED = registry.register(Gauge(
+    'bingo_socket_connected_sids', 'Currently connected Socket.IO clients.'))
+SOCKET_CONNECTED.set(0)
+SOCKET_EMITS = registry.register(Counter(
+    'bingo_socket_broadcasts_total', 'Broadcasts emitted by event.', ['event']))
+SOCKET_RECIPIENTS = registry.register(Counter(
+    'bingo_socket_broadcast_recipients_total', 'Clients reached by broadcasts by event.', ['event']))
+SOCKET_RESUMES = registry.register(Counter(
+    'bingo_socket_resumes_total', 'Game resumes by how the client caught up (buffer, log or snapshot).',
+    ['result']))
+SPECTATOR_FRAMES = registry.register(Counter(
+    'bingo_socket_spectator_frames_total',
+    'Spectator frames by whether they were sent or replaced by a newer one.', ['result']))
+
+
+def _query_counts() -> List[Tuple[dict, float]]:
+    """Count active games and rooms, reusing counts younger than the TTL."""
+    global _active_counts
+    from app.extensions import db
+    from app.models import Game, Room
+
+    now = time.monotonic()
+    if _active_counts is not None and now - _active_counts[0] < _active_ttl:
+        return _active_counts[1]
+    samples = [({'kind': 'games'}, Game.query.filter_by(status='playing').count())]
+    for status, count in (db.session.query(Room.status, db.func.count(Room.id))
+                          .filter(Room.status.in_(['waiting', 'playing']))
+                          .group_by(Room.status)):
+        samples.append(({'kind': f'rooms_{status}'}, count))
+    _active_counts = (now, samples)
+    return samples
+
+
+def _search_totals(field: str) -> Callable[[], List[Tuple[dict, float]]]:
+    """Expose a counter of the aggregate AI search instrumentation."""
+    def callback():
+        from app.services.ai import search_totals
+        return [({}, getattr(search_totals, field))]
+    return callback
+
+
+registry.register(CallbackMetric(
+    'bingo_active', 'Active games and waiting/playing rooms.', 'gauge', _query_counts, ['kind']))
+registry.register(CallbackMetric(
+    'bingo_ai_searches_total', 'Instrumented AI searches.', 'counter', _search_totals('searches')))
+registry.register(CallbackMetric(
+    'bingo_ai_search_nodes_total', 'Nodes visited by instrumented AI searches.', 'counter',
+    _search_totals('nodes')))
+registry.register(CallbackMetric(
+    'bingo_ai_search_cutoffs_total', 'Alpha-beta cutoffs in instrumented AI searches.', 'counter',
+    _search_totals('cutoffs')))
+
+
+def _cache_counter(module: str, name: str, field: str) -> Callable[[], List[Tuple[dict, float]]]:
+    """Expose a counter of an LRUCache held by a service module."""
+    def callback():
+        from importlib import import_module
+        return [({}, getattr(import_module(module), name).to_dict()[field])]
+    return callback
+
+
+registry.register(CallbackMetric(
+    'bingo_ai_endgame_cache_hits_total', 'Endgame positions answered from the cache.', 'counter',
+    _cache_counter('app.services.endgame', 'cache', 'hits')))
+registry.register(CallbackMetric(
+    'bingo_ai_endgame_cache_misses_total', 'Endgame positions solved by search.', 'counter',
+    _cache_counter('app.services.endgame', 'cache', 'misses')))
+registry.register(CallbackMetric(
+    'bingo_ai_endgame_cache_entries', 'Solved positions held in the endgame cache.', 'gauge',
+    _cache_counter('app.services.endgame', 'cache', 'size')))
+registry.register(CallbackMetric(
+    'bingo_ai_move_cache_hits_total', 'AI moves answered from the position cache.', 'counter',
+    _cache_counter('app.services.ai', 'move_cache', 'hits')))
+registry.register(CallbackMetric(
+    'bingo_ai_move_cache_misses_total', 'AI moves that needed a search.', 'counter',
+    _cache_counter('app.services.ai', 'move_cache', 'misses')))
+registry.register(CallbackMetric(
+    'bingo_ai_move_cache_entries', 'Positions held in the AI move cache.', 'gauge',
+    _cache_counter('app.services.ai', 'move_cache', 'size')))
+
+
+def count_broadcast(event_name: str, room: Optional[str] = None) -> None:
+    """Count a Socket.IO broadcast and the clients in its room.
+
+    Args:
+        event_name: Emitted event name
+        room: Target room name
+    """
+    SOCKET_EMITS.inc(event=event_name)
+    if room is None:
+        return
+    from app.extensions import socketio
+    try:
+        recipients = len(socketio.server.manager.rooms.get('/', {}).get(room, ()))
+    except AttributeError:
+        return
+    SOCKET_RECIPIENTS.inc(recipients, event=event_name)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's own context, which is dropped with it if the statement fails
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_start
+    DB_QUERIES.inc()
+    DB_QUERY_SECONDS.inc(elapsed)
+    if has_app_context():
+        g.metrics_db_queries = g.get('metrics_db_queries', 0) + 1
+        g.metrics_db_seconds = g.get('metrics_db_seconds', 0.0) + elapsed
+
+
+def init_metrics(app: Flask, db) -> None:
+    """Install request timing hooks and SQL statement events.
+
+    Args:
+        app: Flask application instance
+        db: Flask-SQLAlchemy extension
+    """
+    global _active_ttl
+    _active_ttl = app.config.get('METRICS_ACTIVE_TTL', DEFAULT_ACTIVE_TTL)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+        g.metrics_db_queries = 0
+        g.metrics_db_seconds = 0.0
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.get('metrics_started')
+        if started is None:
+            return response
+        endpoint = request.endpoint or 'unmatched'
+        HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started,
+                                     endpoint=endpoint, method=request.method)
+        DB_QUERIES_PER_REQUEST.observe(g.get('metrics_db_queries', 0), endpoint=endpoint)
+        DB_SECONDS_PER_REQUEST.observe(g.get('metrics_db_seconds', 0.0), endpoint=endpoint)
+        return response
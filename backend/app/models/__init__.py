@@ -3,7 +3,10 @@ from app.models.user import User
 from app.models.game import Game
 from app.models.player import Player
 from app.models.room import Room
+from app.models.game_archive import GameArchive
+from app.models.game_event import GameEvent, GameSnapshot
+from app.models.user_stats import UserStats
 
-__all__ = ['User', 'Game', 'Player', 'Room']
+__all__ = ['User', 'Game', 'Player', 'Room', 'GameArchive', 'GameEvent', 'GameSnapshot', 'UserStats']
 
 
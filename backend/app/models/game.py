@@ -1,19 +1,34 @@
 """Game model."""
+import json
 from datetime import datetime
+from typing import List
 from app.extensions import db
+from app.services.board_spec import STANDARD, BoardSpec
+from app.services.game_logic import create_board, drop_piece
 
 
 class Game(db.Model):
     """Game model for storing game state."""
     
     __tablename__ = 'games'
+    __table_args__ = (
+        db.Index('ix_games_status_updated_at', 'status', 'updated_at'),
+    )
     
     id: int = db.Column(db.Integer, primary_key=True)
     game_mode: str = db.Column(db.String(20), nullable=False)  # 'ai', 'local', 'online'
     status: str = db.Column(db.String(20), nullable=False, default='waiting')  # 'waiting', 'playing', 'finished', 'draw'
     current_player: int = db.Column(db.Integer, nullable=False, default=1)  # 1 or 2
-    board_state: str = db.Column(db.Text, nullable=False)  # JSON string of board matrix
+    board_state: str = db.Column(db.Text, nullable=False)  # JSON string of board matrix, see board
+    board_moves: int = db.Column(db.SmallInteger, nullable=False, default=0, server_default='0')  # Moves included in board_state
+    moves: str = db.Column(db.Text, nullable=False, default='', server_default='')  # Played columns, one digit per move
+    ai_engine: str = db.Column(db.String(20), nullable=False, default='minimax', server_default='minimax')  # AI games: 'minimax' or 'mcts'
+    difficulty: str = db.Column(db.String(10), nullable=False, default='hard', server_default='hard')  # AI games: 'easy', 'medium', 'hard', 'expert'
+    rows: int = db.Column(db.SmallInteger, nullable=False, default=6, server_default='6')  # Board spec, see board_spec
+    cols: int = db.Column(db.SmallInteger, nullable=False, default=7, server_default='7')
+    connect: int = db.Column(db.SmallInteger, nullable=False, default=4, server_default='4')  # Pieces in a row that win
     winner: int = db.Column(db.Integer, nullable=True)  # 1, 2, or NULL
+    seq: int = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Last event logged (GameEvent.seq)
     owner_id: int = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at: datetime = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -21,14 +36,41 @@ class Game(db.Model):
     # Relationships
     players = db.relationship('Player', backref='game', lazy=True, cascade='all, delete-orphan')
     
+    @property
+    def spec(self) -> BoardSpec:
+        """Board spec of the game (standard until the defaults are applied on insert)."""
+        return BoardSpec(self.rows or STANDARD.rows, self.cols or STANDARD.cols,
+                         self.connect or STANDARD.connect)
+    
+    @property
+    def board(self) -> List[List[int]]:
+        """Current board: board_state with the moves played since it was written.
+        
+        Moves only append to `moves`; board_state is rewritten when the game
+        logs a snapshot (see events.record), so at most a snapshot interval
+        of moves is replayed here.
+        """
+        board = json.loads(self.board_state) if self.board_state else create_board(self.spec)
+        moves = self.moves or ''
+        if (self.board_moves or 0) < len(moves):
+            pieces = sum(1 for row in board for cell in row if cell)
+            player = 1 if pieces % 2 == 0 else 2
+            for column in moves[self.board_moves or 0:]:
+                drop_piece(board, int(column), player)
+                player = 3 - player
+        return board
+    
+    def checkpoint_board(self, board: List[List[int]]) -> None:
+        """Store the current board in board_state."""
+        self.board_state = json.dumps(board)
+        self.board_moves = len(self.moves or '')
+    
     def to_dict(self) -> dict:
         """Convert game to dictionary.
         
         Returns:
             Dictionary representation of game
         """
-        import json
-        
         # Include players information
         players_dict = {}
         for player in self.players:
@@ -39,9 +81,13 @@ class Game(db.Model):
             'game_mode': self.game_mode,
             'status': self.status,
             'current_player': self.current_player,
-            'board_state': json.loads(self.board_state) if self.board_state else None,
+            'board_state': self.board,
             'winner': self.winner,
             'owner_id': self.owner_id,
+            'ai_engine': self.ai_engine,
+            'difficulty': self.difficulty,
+            'board_spec': self.spec.to_dict(),
+            'seq': self.seq or 0,
             'players': players_dict,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
@@ -0,0 +1,85 @@
+"""Archived game model."""
+from datetime import datetime
+from app.extensions import db
+from app.services.board_spec import BoardSpec
+from app.services.game_logic import unpack_board
+
+
+class GameArchive(db.Model):
+    """Compact cold-storage row for a finished game.
+    
+    Each archived game keeps its original id, the packed move sequence and
+    final board, and denormalized player info instead of `players` rows.
+    """
+    
+    __tablename__ = 'games_archive'
+    
+    id: int = db.Column(db.Integer, primary_key=True, autoincrement=False)  # Original games.id
+    game_mode: str = db.Column(db.String(20), nullable=False)
+    status: str = db.Column(db.String(20), nullable=False)  # 'finished' or 'draw'
+    winner: int = db.Column(db.Integer, nullable=True)
+    owner_id: int = db.Column(db.Integer, nullable=True, index=True)
+    moves: str = db.Column(db.Text, nullable=False, default='')  # Played columns, one digit per move
+    board: str = db.Column(db.String(100), nullable=False)  # Final board, one digit per cell
+    rows: int = db.Column(db.SmallInteger, nullable=False, default=6, server_default='6')  # Board spec
+    cols: int = db.Column(db.SmallInteger, nullable=False, default=7, server_default='7')
+    connect: int = db.Column(db.SmallInteger, nullable=False, default=4, server_default='4')
+    player1_user_id: int = db.Column(db.Integer, nullable=True, index=True)
+    player1_nickname: str = db.Column(db.String(80), nullable=True)
+    player2_user_id: int = db.Column(db.Integer, nullable=True, index=True)
+    player2_nickname: str = db.Column(db.String(80), nullable=True)
+    ai_player: int = db.Column(db.SmallInteger, nullable=True)  # Player number of the AI, if any
+    ai_engine: str = db.Column(db.String(20), nullable=False, default='minimax', server_default='minimax')
+    difficulty: str = db.Column(db.String(10), nullable=False, default='hard', server_default='hard')
+    seq: int = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Last event logged
+    created_at: datetime = db.Column(db.DateTime, nullable=False)
+    finished_at: datetime = db.Column(db.DateTime, nullable=False)
+    archived_at: datetime = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def to_dict(self) -> dict:
+        """Convert archived game to the same dictionary shape as Game.to_dict.
+        
+        Returns:
+            Dictionary representation of the archived game
+        """
+        players_dict = {}
+        for number, user_id, nickname, color in (
+            (1, self.player1_user_id, self.player1_nickname, 'red'),
+            (2, self.player2_user_id, self.player2_nickname, 'yellow'),
+        ):
+            if nickname is None:
+                continue
+            players_dict[number] = {
+                'id': None,
+                'user_id': user_id,
+                'nickname': nickname,
+                'color': color,
+                'is_ai': self.ai_player == number,
+                'game_id': self.id,
+                'player_number': number,
+            }
+        
+        # Finished games keep the last mover as current player
+        pieces = len(self.board) - self.board.count('0')
+        
+        return {
+            'id': self.id,
+            'game_mode': self.game_mode,
+            'status': self.status,
+            'current_player': 1 if pieces % 2 else 2,
+            'board_state': unpack_board(self.board, self.cols),
+            'winner': self.winner,
+            'owner_id': self.owner_id,
+            'ai_engine': self.ai_engine,
+            'difficulty': self.difficulty,
+            'board_spec': BoardSpec(self.rows, self.cols, self.connect).to_dict(),
+            'seq': self.seq or 0,
+            'players': players_dict,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.finished_at.isoformat(),
+            'archived': True,
+        }
+    
+    def __repr__(self) -> str:
+        """String representation."""
+        return f'<GameArchive {self.id} - {self.game_mode}>'
@@ -0,0 +1,72 @@
+"""Game event log and snapshot models."""
+import json
+from datetime import datetime
+from app.extensions import db
+
+
+class GameEvent(db.Model):
+    """One entry of the append-only game event log.
+    
+    Events of a game are numbered 1, 2, ... by `seq` (Game.seq holds the
+    last one). Moves, resignations and timeouts only store the player and
+    column; `data` holds the JSON details of 'created' and 'finished'.
+    Events outlive their game row, so game_id is not a foreign key.
+    """
+    
+    __tablename__ = 'game_events'
+    __table_args__ = (
+        db.UniqueConstraint('game_id', 'seq', name='uq_game_events_game_id_seq'),
+    )
+    
+    TYPES = ('created', 'move', 'resign', 'timeout', 'finished')
+    
+    id: int = db.Column(db.Integer, primary_key=True)
+    game_id: int = db.Column(db.Integer, nullable=False)
+    seq: int = db.Column(db.Integer, nullable=False)
+    type: str = db.Column(db.String(10), nullable=False)  # One of TYPES
+    player: int = db.Column(db.SmallInteger, nullable=True)  # Mover, resigning or timed-out player
+    column: int = db.Column(db.SmallInteger, nullable=True)  # 'move' only
+    data: str = db.Column(db.Text, nullable=True)  # JSON details of 'created' and 'finished'
+    created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def to_dict(self) -> dict:
+        """Convert event to dictionary.
+        
+        Returns:
+            Dictionary representation of the event
+        """
+        return {
+            'game_id': self.game_id,
+            'seq': self.seq,
+            'type': self.type,
+            'player': self.player,
+            'column': self.column,
+            'data': json.loads(self.data) if self.data else None,
+            'created_at': self.created_at.isoformat(),
+        }
+    
+    def __repr__(self) -> str:
+        """String representation."""
+        return f'<GameEvent {self.game_id}#{self.seq} {self.type}>'
+
+
+class GameSnapshot(db.Model):
+    """Compact game state after event `seq`, the starting point of replays."""
+    
+    __tablename__ = 'game_snapshots'
+    
+    game_id: int = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    seq: int = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    status: str = db.Column(db.String(20), nullable=False)
+    current_player: int = db.Column(db.SmallInteger, nullable=False)
+    winner: int = db.Column(db.SmallInteger, nullable=True)
+    moves: str = db.Column(db.Text, nullable=False, default='')  # Played columns, one digit per move
+    board: str = db.Column(db.String(100), nullable=False)  # One digit per cell
+    rows: int = db.Column(db.SmallInteger, nullable=False)
+    cols: int = db.Column(db.SmallInteger, nullable=False)
+    connect: int = db.Column(db.SmallInteger, nullable=False)
+    created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self) -> str:
+        """String representation."""
+        return f'<GameSnapshot {self.game_id}#{self.seq}>'
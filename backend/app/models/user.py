@@ -15,6 +15,8 @@ class User(db.Model):
     password_hash: str = db.Column(db.String(256), nullable=False)
     created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     is_active: bool = db.Column(db.Boolean, default=True, nullable=False)
+    rating: float = db.Column(db.Float, default=1200.0, server_default='1200', nullable=False)  # Elo rating for online games
+    rated_games: int = db.Column(db.Integer, default=0, server_default='0', nullable=False)
     
     # Relationships
     games = db.relationship('Game', backref='owner', lazy='dynamic')
@@ -50,6 +52,8 @@ class User(db.Model):
             'email': self.email,
             'created_at': self.created_at.isoformat(),
             'is_active': self.is_active,
+            'rating': self.rating,
+            'rated_games': self.rated_games,
         }
     
     def __repr__(self) -> str:
@@ -0,0 +1,59 @@
+"""User statistics model."""
+from datetime import datetime
+from app.extensions import db
+
+
+class UserStats(db.Model):
+    """Incrementally maintained game result aggregates for a user."""
+    
+    __tablename__ = 'user_stats'
+    __table_args__ = (
+        # Leaderboard order is (wins DESC, user_id DESC), served by a backward scan
+        db.Index('ix_user_stats_ranking', 'wins', 'user_id'),
+    )
+    
+    MODES = ('ai', 'online')
+    COUNTERS = ('wins', 'losses', 'draws', 'games_played', 'ai_wins', 'ai_losses', 'ai_draws',
+                'online_wins', 'online_losses', 'online_draws')
+    
+    user_id: int = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    wins: int = db.Column(db.Integer, nullable=False, default=0)
+    losses: int = db.Column(db.Integer, nullable=False, default=0)
+    draws: int = db.Column(db.Integer, nullable=False, default=0)
+    games_played: int = db.Column(db.Integer, nullable=False, default=0)
+    ai_wins: int = db.Column(db.Integer, nullable=False, default=0)
+    ai_losses: int = db.Column(db.Integer, nullable=False, default=0)
+    ai_draws: int = db.Column(db.Integer, nullable=False, default=0)
+    online_wins: int = db.Column(db.Integer, nullable=False, default=0)
+    online_losses: int = db.Column(db.Integer, nullable=False, default=0)
+    online_draws: int = db.Column(db.Integer, nullable=False, default=0)
+    updated_at: datetime = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    user = db.relationship('User', backref=db.backref('stats', uselist=False))
+    
+    def to_dict(self) -> dict:
+        """Convert stats to dictionary.
+        
+        Returns:
+            Dictionary representation of stats with per-mode breakdown
+        """
+        return {
+            'user_id': self.user_id,
+            'wins': self.wins or 0,
+            'losses': self.losses or 0,
+            'draws': self.draws or 0,
+            'games_played': self.games_played or 0,
+            'modes': {
+                mode: {
+                    'wins': getattr(self, f'{mode}_wins') or 0,
+                    'losses': getattr(self, f'{mode}_losses') or 0,
+                    'draws': getattr(self, f'{mode}_draws') or 0,
+                }
+                for mode in self.MODES
+            },
+        }
+    
+    def __repr__(self) -> str:
+        """String representation."""
+        return f'<UserStats {self.user_id} - {self.wins}W {self.losses}L {self.draws}D>'
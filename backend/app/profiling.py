@@ -0,0 +1,139 @@
+"""Opt-in per-request profiling.
+
+When PROFILING_ENABLED is set, a request is profiled with cProfile if it
+carries a valid signed X-Profile-Token header or is picked by
+PROFILING_SAMPLE_RATE. The .pstats output is written to PROFILING_DIR, which
+keeps only the newest PROFILING_MAX_FILES profiles.
+"""
+import cProfile
+import hashlib
+import hmac
+import os
+import random
+import re
+import time
+from typing import List, Optional
+from flask import Flask, current_app, g, request
+
+PROFILE_HEADER = 'X-Profile-Token'
+
+
+def make_profile_token(secret: str, ttl: int = 300) -> str:
+    """Create a signed profiling token.
+    
+    Args:
+        secret: PROFILING_SECRET value
+        ttl: Seconds until the token expires
+        
+    Returns:
+        Token of the form '<expires>.<hmac-sha256 hex>'
+    """
+    expires = str(int(time.time()) + ttl)
+    signature = hmac.new(secret.encode(), expires.encode(), hashlib.sha256).hexdigest()
+    return f'{expires}.{signature}'
+
+
+def verify_profile_token(token: Optional[str], secret: Optional[str]) -> bool:
+    """Check a signed profiling token.
+    
+    Args:
+        token: Header value
+        secret: PROFILING_SECRET value
+        
+    Returns:
+        True if the token is correctly signed and not expired
+    """
+    if not token or not secret or '.' not in token:
+        return False
+    expires, signature = token.split('.', 1)
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    expected = hmac.new(secret.encode(), expires.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature, expected)
+
+
+def has_valid_token() -> bool:
+    """Check the profiling token of the current request."""
+    return verify_profile_token(request.headers.get(PROFILE_HEADER),
+                                current_app.config.get('PROFILING_SECRET'))
+
+
+def profile_dir(app: Flask) -> str:
+    """Directory holding the stored profiles."""
+    return app.config.get('PROFILING_DIR') or os.path.join(app.instance_path, 'profiles')
+
+
+def list_profiles(app: Flask) -> List[dict]:
+    """List stored profiles, newest first.
+    
+    Returns:
+        List of dictionaries with name, size and creation time
+    """
+    directory = profile_dir(app)
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in os.listdir(directory):
+        if not name.endswith('.pstats'):
+            continue
+        stat = os.stat(os.path.join(directory, name))
+        profiles.append({'name': name, 'size': stat.st_size, 'created_at': stat.st_mtime})
+    return sorted(profiles, key=lambda p: p['created_at'], reverse=True)
+
+
+def _prune(app: Flask) -> None:
+    """Delete the oldest profiles beyond PROFILING_MAX_FILES."""
+    directory = profile_dir(app)
+    for profile in list_profiles(app)[app.config.get('PROFILING_MAX_FILES', 50):]:
+        try:
+            os.remove(os.path.join(directory, profile['name']))
+        except OSError:
+            pass
+
+
+def _should_profile(app: Flask) -> bool:
+    if request.path.startswith('/api/admin/profiles'):
+        return False
+    if has_valid_token():
+        return True
+    rate = app.config.get('PROFILING_SAMPLE_RATE', 0.0)
+    return rate > 0 and random.random() < rate
+
+
+def init_profiling(app: Flask) -> None:
+    """Install the profiling hooks when PROFILING_ENABLED is set.
+    
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get('PROFILING_ENABLED'):
+        return
+    
+    @app.before_request
+    def start_profiler():
+        if not _should_profile(app):
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active on this thread
+            return
+        g.profiler = profiler
+    
+    @app.after_request
+    def store_profile(response):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return response
+        profiler.disable()
+        
+        directory = profile_dir(app)
+        os.makedirs(directory, exist_ok=True)
+        endpoint = re.sub(r'[^A-Za-z0-9_.-]', '_', request.endpoint or 'unmatched')
+        name = f'{int(time.time() * 1000)}-{request.method}-{endpoint}-{random.randrange(16 ** 4):04x}.pstats'
+        profiler.dump_stats(os.path.join(directory, name))
+        _prune(app)
+        
+        response.headers['X-Profile-Id'] = name
+        return response
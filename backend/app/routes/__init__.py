@@ -11,8 +11,16 @@ def register_blueprints(app: Flask) -> None:
     from app.routes.auth import auth_bp
     from app.routes.game import game_bp
     from app.routes.lobby import lobby_bp
+    from app.routes.stats import stats_bp
+    from app.routes.metrics import metrics_bp
+    from app.routes.admin import admin_bp
+    from app.routes.ai import ai_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(game_bp)
     app.register_blueprint(lobby_bp)
+    app.register_blueprint(stats_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(admin_bp)
+    app.register_blueprint(ai_bp)
 
@@ -0,0 +1,48 @@
+"""Admin blueprint for profiling output."""
+import os
+from flask import Blueprint, current_app, jsonify, send_from_directory
+from app.profiling import PROFILE_HEADER, has_valid_token, list_profiles, profile_dir
+
+admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
+
+
+@admin_bp.before_request
+def require_profile_token():
+    """Only allow profiling admin requests with a signed token."""
+    if not current_app.config.get('PROFILING_ENABLED'):
+        return jsonify({'error': 'Not found'}), 404
+    if not has_valid_token():
+        return jsonify({'error': f'Valid {PROFILE_HEADER} header required'}), 403
+
+
+@admin_bp.route('/profiles', methods=['GET'])
+def get_profiles():
+    """List stored request profiles.
+    
+    Returns:
+        JSON response with profiles, newest first
+    """
+    try:
+        return jsonify({'profiles': list_profiles(current_app)}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@admin_bp.route('/profiles/<name>', methods=['GET'])
+def download_profile(name: str):
+    """Download a stored profile.
+    
+    Args:
+        name: Profile file name
+        
+    Returns:
+        The .pstats file as an attachment
+    """
+    if not name.endswith('.pstats') or os.path.basename(name) != name:
+        return jsonify({'error': 'Profile not found'}), 404
+    
+    directory = profile_dir(current_app)
+    if not os.path.isfile(os.path.join(directory, name)):
+        return jsonify({'error': 'Profile not found'}), 404
+    
+    return send_from_directory(directory, name, as_attachment=True)
@@ -0,0 +1,70 @@
+"""AI analysis blueprint."""
+import json
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required
+from app.extensions import socketio
+from app.services import analysis, board_spec
+
+ai_bp = Blueprint('ai', __name__, url_prefix='/api/ai')
+
+
+@ai_bp.route('/analyze', methods=['POST'])
+@jwt_required(optional=True)
+def analyze():
+    """Find the best move and score of many positions.
+
+    Request body (one of moves or positions):
+        moves: Columns of a game, player 1 first; every position before a move is analyzed
+        positions: List of boards of the board spec
+        variant, rows, cols, connect: Board spec as for new games (default: standard 6x7)
+        depth: Search depth (default AI_ANALYSIS_DEFAULT_DEPTH, max AI_ANALYSIS_MAX_DEPTH)
+
+    Returns:
+        NDJSON stream with one line per position as its search finishes; each
+        line carries the position's index, and 'played' for move sequences
+    """
+    try:
+        data = request.get_json() or {}
+        moves = data.get('moves')
+        positions = data.get('positions')
+        if (moves is None) == (positions is None):
+            return jsonify({'error': 'Provide either moves or positions'}), 400
+
+        depth = data.get('depth', current_app.config['AI_ANALYSIS_DEFAULT_DEPTH'])
+        max_depth = current_app.config['AI_ANALYSIS_MAX_DEPTH']
+        if not isinstance(depth, int) or isinstance(depth, bool) or not 1 <= depth <= max_depth:
+            return jsonify({'error': f'depth must be between 1 and {max_depth}'}), 400
+
+        try:
+            spec = board_spec.spec_from_request(data)
+            if moves is not None:
+                if not isinstance(moves, list):
+                    return jsonify({'error': 'moves must be a list of columns'}), 400
+                boards = analysis.boards_from_moves(moves, spec)
+            else:
+                if not isinstance(positions, list):
+                    return jsonify({'error': 'positions must be a list of boards'}), 400
+                boards = [analysis.validate_board(board, spec) for board in positions]
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        max_positions = current_app.config['AI_ANALYSIS_MAX_POSITIONS']
+        if not boards or len(boards) > max_positions:
+            return jsonify({'error': f'Provide between 1 and {max_positions} positions'}), 400
+
+        workers = current_app.config.get('AI_ANALYSIS_WORKERS')
+
+        def generate():
+            try:
+                for result in analysis.analyze_boards(boards, depth, workers, sleep=socketio.sleep,
+                                                        spec=spec):
+                    if moves is not None:
+                        result['played'] = moves[result['index']]
+                    yield json.dumps(result) + '\n'
+            except Exception as e:
+                yield json.dumps({'error': str(e)}) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
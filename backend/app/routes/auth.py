@@ -6,6 +6,7 @@ from app.schemas.user_schema import RegisterSchema, LoginSchema, UserSchema
 from app.services.auth_service import register_user, authenticate_user
 from app.models.user import User
 from app.extensions import db
+from app.utils.decorators import read_only
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -165,6 +166,7 @@ def logout():
 
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
+@read_only
 def get_current_user():
     """Get current authenticated user.
     
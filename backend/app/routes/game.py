@@ -1,11 +1,15 @@
 """Game blueprint."""
 import json
-from flask import Blueprint, request, jsonify, session
+import time
+from datetime import datetime, timedelta
+from flask import Blueprint, request, jsonify, session, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.models import Game, Player
-from app.services import game_logic, ai
+from app.services import game_logic, ai, archive, board_spec, engines, events, ponder, presence, stats, rating
 from app.extensions import db
+from app.metrics import AI_PONDER_MOVES, AI_SEARCH_SECONDS
 from app.routes.socketio_handlers import broadcast_game_update
+from app.utils.decorators import read_only
 
 game_bp = Blueprint('game', __name__, url_prefix='/api/game')
 
@@ -14,23 +18,36 @@ game_bp = Blueprint('game', __name__, url_prefix='/api/game')
 def create_local_game():
     """Create a new local (hot-seat) game.
     
+    Request body (optional):
+        variant: Named board variant ('standard', '7x8' or 'connect5'), or
+        rows, cols, connect: Board dimensions and pieces in a row that win (default 6, 7, 4)
+    
     Returns:
         JSON response with game data
     """
     try:
         data = request.json or {}
+        try:
+            spec = board_spec.spec_from_request(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Create empty board
-        board = game_logic.create_board()
+        board = game_logic.create_board(spec)
         
         # Create game
         game = Game(
             game_mode='local',
             status='playing',
             current_player=1,
-            board_state=json.dumps(board)
+            board_state=json.dumps(board),
+            rows=spec.rows,
+            cols=spec.cols,
+            connect=spec.connect
         )
         db.session.add(game)
+        db.session.flush()
+        events.record(game, 'created', board)
         db.session.commit()
         
         # Store game ID in session
@@ -49,12 +66,31 @@ def create_local_game():
 def create_ai_game():
     """Create a new AI game.
     
+    Request body (optional):
+        engine: AI engine name ('minimax' or 'mcts', default AI_ENGINE_DEFAULT)
+        difficulty: 'easy', 'medium', 'hard' or 'expert' (default AI_DIFFICULTY_DEFAULT);
+            moves are played at no more than AI_MAX_DIFFICULTY
+        variant: Named board variant ('standard', '7x8' or 'connect5'), or
+        rows, cols, connect: Board dimensions and pieces in a row that win (default 6, 7, 4)
+    
     Returns:
         JSON response with game data
     """
     try:
+        data = request.get_json(silent=True) or {}
+        engine = data.get('engine') or current_app.config['AI_ENGINE_DEFAULT']
+        if engine not in engines.ENGINES:
+            return jsonify({'error': f"Unknown AI engine '{engine}'"}), 400
+        difficulty = data.get('difficulty') or current_app.config['AI_DIFFICULTY_DEFAULT']
+        if difficulty not in engines.DIFFICULTIES:
+            return jsonify({'error': f"Unknown AI difficulty '{difficulty}'"}), 400
+        try:
+            spec = board_spec.spec_from_request(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Create empty board
-        board = game_logic.create_board()
+        board = game_logic.create_board(spec)
         
         # Get user if authenticated
         identity = get_jwt_identity()
@@ -74,10 +110,16 @@ def create_ai_game():
             status='playing',
             current_player=1,
             board_state=json.dumps(board),
-            owner_id=owner_id
+            owner_id=owner_id,
+            ai_engine=engine,
+            difficulty=difficulty,
+            rows=spec.rows,
+            cols=spec.cols,
+            connect=spec.connect
         )
         db.session.add(game)
         db.session.flush()
+        events.record(game, 'created', board)
         
         # Create players
         player1 = Player(
@@ -120,13 +162,16 @@ def make_move(game_id: int):
         data = request.json
         column = data.get('column')
         
-        if column is None or column < 0 or column > 6:
+        if column is None or column < 0:
             return jsonify({'error': 'Invalid column'}), 400
         
         # Get game
         game = Game.query.get(game_id)
         if not game:
             return jsonify({'error': 'Game not found'}), 404
+        spec = game.spec
+        if column >= spec.cols:
+            return jsonify({'error': 'Invalid column'}), 400
         
         if game.status != 'playing':
             return jsonify({'error': 'Game is not active'}), 400
@@ -154,16 +199,19 @@ def make_move(game_id: int):
                 return jsonify({'error': 'It is not your turn'}), 400
         
         # Load board
-        board = json.loads(game.board_state)
+        board = game.board
         
         # Make player move
         try:
             board, row = game_logic.drop_piece(board, column, game.current_player)
         except ValueError as e:
             return jsonify({'error': str(e)}), 400
+        player_number = game.current_player
+        moves_before = game.moves or ''
+        game.moves = moves_before + str(column)
         
-        # Check for winner
-        winner = game_logic.check_winner(board)
+        # Check for winner, only the lines through the piece just played can have changed
+        winner = board_spec.winner_at(board, row, column, spec.connect)
         if winner:
             game.status = 'finished'
             game.winner = winner
@@ -173,7 +221,13 @@ def make_move(game_id: int):
             # Switch player
             game.current_player = 3 - game.current_player
         
-        game.board_state = json.dumps(board)
+        # board_state is only rewritten with the periodic snapshots of the event log
+        snapshot_interval = current_app.config['GAME_SNAPSHOT_INTERVAL']
+        events.record(game, 'move', board, player_number, column, snapshot_interval)
+        if game.status != 'playing':
+            events.record(game, 'finished', board)
+        stats.record_game_result(game)
+        rating.update_ratings(game)
         
         # Update room status if game finished - terminate room and clear guest
         if game.game_mode == 'online' and game.status in ['finished', 'draw']:
@@ -199,14 +253,32 @@ def make_move(game_id: int):
         
         # If AI game and game is still playing, make AI move
         if game.game_mode == 'ai' and game.status == 'playing' and game.current_player == 2:
-            # Get AI move using strategic AI
-            ai_column = ai.get_ai_move(board, 2)
+            # Get AI move using strategic AI, instrumented on request or by config
+            debug = request.args.get('debug') == '1'
+            search_stats = None
+            if debug or current_app.config.get('AI_SEARCH_STATS'):
+                search_stats = ai.SearchStats()
+            engine = engines.engine_from_config(game.ai_engine or engines.DEFAULT_ENGINE,
+                                                current_app.config,
+                                                game.difficulty or engines.DEFAULT_DIFFICULTY,
+                                                spec)
+            pondering = current_app.config.get('AI_PONDER_ENABLED') and engine.ponderable
+            started = time.perf_counter()
+            ai_column = None
+            if pondering:
+                # Use the reply searched while the player was thinking, if ready
+                ai_column = ponder.take(game_id, moves_before, column, engine)
+                AI_PONDER_MOVES.inc(result='miss' if ai_column is None else 'hit')
+            if ai_column is None:
+                ai_column = engine.choose_move(board, 2, game_id=game_id, stats=search_stats)
+            AI_SEARCH_SECONDS.observe(time.perf_counter() - started)
             
             # Make AI move
             board, ai_row = game_logic.drop_piece(board, ai_column, 2)
+            game.moves += str(ai_column)
             
             # Check for winner
-            winner = game_logic.check_winner(board)
+            winner = board_spec.winner_at(board, ai_row, ai_column, spec.connect)
             if winner:
                 game.status = 'finished'
                 game.winner = winner
@@ -214,6 +286,7 @@ def make_move(game_id: int):
                 game.status = 'draw'
             else:
                 game.current_player = 1
+            stats.record_game_result(game)
             
             # Update room status if game finished (for online games) - terminate room
             if game.game_mode == 'online' and game.status in ['finished', 'draw']:
@@ -223,16 +296,30 @@ def make_move(game_id: int):
                     room.status = 'finished'
                     room.guest_id = None  # Clear guest so room can be reused
             
-            game.board_state = json.dumps(board)
+            events.record(game, 'move', board, 2, ai_column, snapshot_interval)
+            if game.status != 'playing':
+                events.record(game, 'finished', board)
             db.session.commit()
             
             response_data = game.to_dict()
             response_data['ai_move'] = {'column': ai_column, 'row': ai_row}
+            if debug:
+                response_data['ai_debug'] = search_stats.to_dict()
+            
+            if pondering and game.status == 'playing':
+                config = current_app.config
+                ponder.start(game_id, board, game.moves, engine, budget=config['AI_PONDER_BUDGET'],
+                             idle=config['AI_PONDER_IDLE'], max_games=config['AI_PONDER_MAX_GAMES'])
             
             # Broadcast update for AI move
             if game.game_mode == 'online':
                 broadcast_game_update(game_id, response_data)
         
+        # Engines and pondering may keep search state per game until it ends
+        if game.game_mode == 'ai' and game.status != 'playing':
+            engines.release_game(game_id)
+            ponder.release(game_id)
+        
         return jsonify(response_data), 200
         
     except Exception as e:
@@ -240,7 +327,133 @@ def make_move(game_id: int):
         return jsonify({'error': str(e)}), 500
 
 
+def finish_by_forfeit(game: Game, event_type: str, loser: int) -> dict:
+    """End a game in progress with a loss for one player and commit it.
+    
+    Logs the forfeit ('resign' or 'timeout') and the result, updates stats
+    and ratings, closes an online game's room and broadcasts the update.
+    
+    Args:
+        game: Game with status 'playing'
+        event_type: 'resign' or 'timeout'
+        loser: Player number who forfeits
+        
+    Returns:
+        Game state dictionary after the change
+    """
+    board = game.board
+    game.status = 'finished'
+    game.winner = 3 - loser
+    events.record(game, event_type, board, loser)
+    events.record(game, 'finished', board)
+    stats.record_game_result(game)
+    rating.update_ratings(game)
+    
+    room = None
+    if game.game_mode == 'online':
+        from app.models.room import Room
+        room = Room.query.filter_by(game_id=game.id).first()
+        if room:
+            room.status = 'finished'
+            room.guest_id = None  # Clear guest so room can be reused
+    db.session.commit()
+    
+    response_data = game.to_dict()
+    if game.game_mode == 'online':
+        broadcast_game_update(game.id, response_data)
+        if room:
+            from app.routes.socketio_handlers import broadcast_room_update
+            broadcast_room_update(room.code, room.to_dict())
+    if game.game_mode == 'ai':
+        engines.release_game(game.id)
+        ponder.release(game.id)
+    return response_data
+
+
+@game_bp.route('/<int:game_id>/resign', methods=['POST'])
+@jwt_required(optional=True)
+def resign_game(game_id: int):
+    """Resign a game in progress.
+    
+    Online games are resigned by the authenticated player, AI games by the
+    human player, local games by the player to move.
+    
+    Args:
+        game_id: Game ID
+        
+    Returns:
+        JSON response with updated game state
+    """
+    try:
+        game = Game.query.get(game_id)
+        if not game:
+            return jsonify({'error': 'Game not found'}), 404
+        if game.status != 'playing':
+            return jsonify({'error': 'Game is not active'}), 400
+        
+        if game.game_mode == 'online':
+            identity = get_jwt_identity()
+            if not identity:
+                return jsonify({'error': 'Authentication required'}), 401
+            player = next((p for p in game.players if p.user_id == int(identity)), None)
+            if not player:
+                return jsonify({'error': 'You are not a player in this game'}), 403
+            loser = player.player_number
+        elif game.game_mode == 'ai':
+            loser = 1
+        else:
+            loser = game.current_player
+        
+        return jsonify(finish_by_forfeit(game, 'resign', loser)), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@game_bp.route('/<int:game_id>/claim-timeout', methods=['POST'])
+@jwt_required()
+def claim_timeout(game_id: int):
+    """Win an online game whose opponent has gone away.
+    
+    The opponent must be the player to move, have no connection in the game
+    room, and have left the game unchanged for PRESENCE_FORFEIT_GRACE seconds.
+    
+    Args:
+        game_id: Game ID
+        
+    Returns:
+        JSON response with updated game state
+    """
+    try:
+        game = Game.query.get(game_id)
+        if not game:
+            return jsonify({'error': 'Game not found'}), 404
+        if game.game_mode != 'online' or game.status != 'playing':
+            return jsonify({'error': 'Game is not an active online game'}), 400
+        
+        user_id = int(get_jwt_identity())
+        player = next((p for p in game.players if p.user_id == user_id), None)
+        if not player:
+            return jsonify({'error': 'You are not a player in this game'}), 403
+        opponent = next((p for p in game.players if p.player_number != player.player_number), None)
+        if not opponent or game.current_player != opponent.player_number:
+            return jsonify({'error': 'Not waiting for the opponent'}), 409
+        if presence.is_opponent_connected(game.id, opponent.user_id):
+            return jsonify({'error': 'Opponent is connected'}), 409
+        grace = timedelta(seconds=current_app.config['PRESENCE_FORFEIT_GRACE'])
+        if datetime.utcnow() - game.updated_at < grace:
+            return jsonify({'error': 'Opponent still has time to move'}), 409
+        
+        return jsonify(finish_by_forfeit(game, 'timeout', opponent.player_number)), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
 @game_bp.route('/<int:game_id>', methods=['GET'])
+@read_only
 def get_game(game_id: int):
     """Get game state.
     
@@ -253,6 +466,10 @@ def get_game(game_id: int):
     try:
         game = Game.query.get(game_id)
         if not game:
+            # Finished games may have been moved to cold storage
+            archived = archive.get_archived_game(game_id)
+            if archived:
+                return jsonify(archived.to_dict()), 200
             return jsonify({'error': 'Game not found'}), 404
         
         return jsonify(game.to_dict()), 200
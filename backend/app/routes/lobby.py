@@ -5,9 +5,10 @@ import string
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Room, Game, Player, User
-from app.services import game_logic
+from app.services import events, game_logic
 from app.extensions import db
 from app.routes.socketio_handlers import broadcast_room_update
+from app.utils.decorators import read_only
 
 lobby_bp = Blueprint('lobby', __name__, url_prefix='/api/lobby')
 
@@ -302,6 +303,7 @@ def start_game(room_id: int):
         )
         db.session.add(game)
         db.session.flush()
+        events.record(game, 'created', board)
         # #region agent log
         try:
             with open(log_path, 'a') as f:
@@ -367,6 +369,7 @@ def start_game(room_id: int):
 
 @lobby_bp.route('/<int:room_id>', methods=['GET'])
 @jwt_required()
+@read_only
 def get_room(room_id: int):
     """Get room information.
     
@@ -389,6 +392,7 @@ def get_room(room_id: int):
 
 @lobby_bp.route('/code/<room_code>', methods=['GET'])
 @jwt_required()
+@read_only
 def get_room_by_code(room_code: str):
     """Get room information by code.
     
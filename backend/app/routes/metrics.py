@@ -0,0 +1,21 @@
+"""Metrics blueprint."""
+import hmac
+from flask import Blueprint, Response, current_app, jsonify, request
+from app.metrics import registry
+
+metrics_bp = Blueprint('metrics', __name__, url_prefix='/api')
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Expose metrics in the Prometheus text exposition format.
+    
+    Requires "Authorization: Bearer <METRICS_TOKEN>" when METRICS_TOKEN is set.
+    
+    Returns:
+        Plain text response with all registered metrics
+    """
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'error': 'Invalid metrics token'}), 401
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
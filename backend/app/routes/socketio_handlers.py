@@ -1,9 +1,12 @@
 """Socket.IO event handlers for real-time multiplayer."""
-from flask import request
+from flask import current_app, request, session
 from flask_jwt_extended import decode_token
 from flask_socketio import emit, join_room, leave_room
 from app.extensions import socketio, db
+from app.metrics import SOCKET_CONNECTED, SOCKET_RESUMES, count_broadcast
 from app.models import Game, Room
+from app.services import presence, resume, spectators
+from app.utils.decorators import read_only
 
 
 def get_user_from_token(token: str):
@@ -34,12 +37,18 @@ def handle_connect(auth):
         user_id = get_user_from_token(token)
         if user_id:
             request.user_id = user_id
-            emit('connected', {'user_id': user_id})
+            session['user_id'] = user_id  # Kept for the socket's later events
+            SOCKET_CONNECTED.inc()
+            presence.connect(request.sid, user_id)
+            # Heartbeats three times per TTL keep the connection's presence alive
+            emit('connected', {'user_id': user_id,
+                               'heartbeat_interval': current_app.config['PRESENCE_TTL'] / 3})
         else:
             emit('error', {'message': 'Invalid token'})
             return False
     else:
         # Allow anonymous connections for now
+        SOCKET_CONNECTED.inc()
         emit('connected')
     return True
 
@@ -47,10 +56,19 @@ def handle_connect(auth):
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection."""
-    print(f'Client disconnected: {request.sid}')
+    SOCKET_CONNECTED.dec()
+    presence.disconnect(request.sid)
+    current_app.logger.info('Client disconnected: %s', request.sid)
+
+
+@socketio.on('heartbeat')
+def handle_heartbeat(data=None):
+    """Keep the presence of the connection alive."""
+    presence.heartbeat(request.sid)
 
 
 @socketio.on('join_game')
+@read_only
 def handle_join_game(data):
     """Join a game room for real-time updates.
     
@@ -69,9 +87,10 @@ def handle_join_game(data):
         return
     
     # Join the game room
-    room = f'game_{game_id}'
+    room = presence.game_room(game_id)
     join_room(room)
-    emit('joined_game', {'game_id': game_id, 'room': room})
+    presence.join(request.sid, room)
+    emit('joined_game', {'game_id': game_id, 'room': room, 'members': presence.backend.members(room)})
 
 
 @socketio.on('leave_game')
@@ -83,12 +102,98 @@ def handle_leave_game(data):
     """
     game_id = data.get('game_id')
     if game_id:
-        room = f'game_{game_id}'
+        room = presence.game_room(game_id)
         leave_room(room)
+        presence.leave(request.sid, room)
         emit('left_game', {'game_id': game_id})
 
 
+@socketio.on('resume')
+@read_only
+def handle_resume(data):
+    """Rejoin a game after a reconnect and catch up on missed events.
+    
+    Replies with 'resume_events' (the events after last_seq, possibly none)
+    when they are still buffered or logged, else with 'resume_snapshot'
+    holding the full game state.
+    
+    Args:
+        data: Dictionary with 'game_id' and 'last_seq' keys, and 'spectate'
+            to rejoin as a spectator
+    """
+    game_id = data.get('game_id')
+    if not game_id:
+        emit('error', {'message': 'Game ID required'})
+        return
+    try:
+        game_id = int(game_id)
+        last_seq = int(data.get('last_seq', 0))
+    except (TypeError, ValueError):
+        emit('error', {'message': 'game_id and last_seq must be integers'})
+        return
+    
+    # Recently changed games are answered from memory without a query
+    missed = resume.missed(game_id, last_seq)
+    result = 'buffer'
+    game = None
+    if missed is None:
+        game = Game.query.get(game_id)
+        if not game:
+            emit('error', {'message': 'Game not found'})
+            return
+        missed = resume.logged(game_id, last_seq, game.seq or 0)
+        result = 'log' if missed is not None else 'snapshot'
+    
+    room = spectators.room_name(game_id) if data.get('spectate') else presence.game_room(game_id)
+    join_room(room)
+    if not data.get('spectate'):
+        presence.join(request.sid, room)
+    SOCKET_RESUMES.inc(result=result)
+    if missed is not None:
+        seq = missed[-1]['seq'] if missed else last_seq
+        emit('resume_events', {'game_id': game_id, 'room': room, 'seq': seq, 'events': missed})
+    else:
+        emit('resume_snapshot', {'game_id': game_id, 'room': room, 'game': game.to_dict()})
+
+
+@socketio.on('spectate_game')
+@read_only
+def handle_spectate_game(data):
+    """Watch a game: join its spectator room and receive the current state.
+    
+    Args:
+        data: Dictionary with 'game_id' key
+    """
+    game_id = data.get('game_id')
+    if not game_id:
+        emit('error', {'message': 'Game ID required'})
+        return
+    
+    game = Game.query.get(game_id)
+    if not game:
+        emit('error', {'message': 'Game not found'})
+        return
+    
+    room = spectators.room_name(game_id)
+    join_room(room)
+    emit('spectating', {'game_id': game_id, 'room': room, 'game': game.to_dict()})
+
+
+@socketio.on('stop_spectating')
+def handle_stop_spectating(data):
+    """Stop watching a game.
+    
+    Args:
+        data: Dictionary with 'game_id' key
+    """
+    game_id = data.get('game_id')
+    if game_id:
+        leave_room(spectators.room_name(game_id))
+        emit('stopped_spectating', {'game_id': game_id})
+
+
 @socketio.on('join_room')
+@read_only
 def handle_join_room(data):
     """Join a lobby room.
     
@@ -108,8 +213,10 @@ def handle_join_room(data):
     # Join the room
     room_name = f'room_{room_code.upper()}'
     join_room(room_name)
+    presence.join(request.sid, room_name)
     print(f'Client {request.sid} joined socket room: {room_name}')
-    emit('joined_room', {'room_code': room_code, 'room': room.to_dict()})
+    emit('joined_room', {'room_code': room_code, 'room': room.to_dict(),
+                         'members': presence.backend.members(room_name)})
 
 
 @socketio.on('leave_room')
@@ -123,18 +230,25 @@ def handle_leave_room(data):
     if room_code:
         room_name = f'room_{room_code.upper()}'
         leave_room(room_name)
+        presence.leave(request.sid, room_name)
         emit('left_room', {'room_code': room_code})
 
 
 def broadcast_game_update(game_id: int, game_data: dict):
     """Broadcast game state update to all players in a game room.
     
+    Players get the update at once; spectators get the latest state on the
+    next flush of app.services.spectators.
+    
     Args:
         game_id: Game ID
         game_data: Game state dictionary
     """
     room = f'game_{game_id}'
+    count_broadcast('game_update', room)
     socketio.emit('game_update', game_data, room=room)
+    spectators.publish(game_id, game_data, interval=current_app.config['SPECTATOR_FRAME_INTERVAL'],
+                       chunk_size=current_app.config['SPECTATOR_CHUNK_SIZE'])
 
 
 def broadcast_room_update(room_code: str, room_data: dict):
@@ -146,6 +260,7 @@ def broadcast_room_update(room_code: str, room_data: dict):
     """
     room_name = f'room_{room_code.upper()}'
     print(f'Broadcasting room update to room: {room_name}, data: {room_data}')
+    count_broadcast('room_update', room_name)
     socketio.emit('room_update', room_data, room=room_name, namespace='/')
 
 
@@ -157,5 +272,8 @@ def broadcast_game_reset(game_id: int):
     """
     room = f'game_{game_id}'
     print(f'Broadcasting game reset to room: {room}')
+    count_broadcast('game_reset', room)
     socketio.emit('game_reset', {'game_id': game_id}, room=room, namespace='/')
+    spectators.discard(game_id)
+    socketio.emit('game_reset', {'game_id': game_id}, room=spectators.room_name(game_id), namespace='/')
 
@@ -0,0 +1,57 @@
+"""Statistics blueprint."""
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services import stats
+from app.utils.decorators import read_only
+
+stats_bp = Blueprint('stats', __name__, url_prefix='/api')
+
+MAX_PAGE_SIZE = 100
+
+
+@stats_bp.route('/stats/me', methods=['GET'])
+@jwt_required()
+@read_only
+def get_my_stats():
+    """Get statistics of the current user.
+    
+    Returns:
+        JSON response with win/loss/draw totals and per-mode breakdown
+    """
+    try:
+        identity = get_jwt_identity()
+        if not identity:
+            return jsonify({'error': 'User ID not found in token'}), 401
+        
+        return jsonify(stats.get_user_stats(int(identity))), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@stats_bp.route('/leaderboard', methods=['GET'])
+@read_only
+def get_leaderboard():
+    """Get the leaderboard ordered by wins.
+    
+    Query parameters:
+        limit: Page size (1-100, default 20)
+        cursor: next_cursor value of the previous page
+    
+    Returns:
+        JSON response with entries and next_cursor
+    """
+    try:
+        limit = request.args.get('limit', 20, type=int)
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+        
+        try:
+            page = stats.get_leaderboard(limit, request.args.get('cursor'))
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        return jsonify(page), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
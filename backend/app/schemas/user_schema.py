@@ -17,6 +17,8 @@ class UserSchema(ma.SQLAlchemySchema):
     password = fields.String(load_only=True, required=True, validate=validate.Length(min=6))
     created_at = ma.auto_field(dump_only=True)
     is_active = ma.auto_field(dump_only=True)
+    rating = ma.auto_field(dump_only=True)
+    rated_games = ma.auto_field(dump_only=True)
 
 
 class LoginSchema(Schema):
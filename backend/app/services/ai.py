@@ -1,8 +1,157 @@
 """AI opponent for Connect Four with strategic threat detection and minimax algorithm."""
 import random
 import math
-from typing import List, Tuple, Optional
+import time
+from typing import Dict, List, Tuple, Optional
 from app.services.game_logic import get_valid_columns, drop_piece, check_winner, is_draw
+from app.services import canonical, endgame, evaluation
+from app.services.board_spec import STANDARD, BoardSpec, line_table
+from app.utils.cache import LRUCache
+
+
+class SearchStats:
+    """Instrumentation counters for minimax searches.
+    
+    Pass an instance as `stats` to minimax/get_ai_move to collect them; with
+    the default of None the search only pays for `is not None` checks.
+    """
+    
+    def __init__(self):
+        self.searches = 0
+        self.nodes_by_depth: Dict[int, int] = {}  # Keyed by remaining depth (0 = leaf)
+        self.cutoffs = 0
+        self.cutoff_move_index: Dict[int, int] = {}  # Move index that caused each cutoff
+        self.tt_hits = 0
+        self.cache_hits = 0  # Moves answered from the position cache without a search
+        self.time_by_depth: Dict[int, float] = {}  # Seconds spent in searches of each root depth
+    
+    @property
+    def nodes(self) -> int:
+        """Total nodes visited."""
+        return sum(self.nodes_by_depth.values())
+    
+    def visit(self, depth: int) -> None:
+        """Record a node visited with the given remaining depth."""
+        self.nodes_by_depth[depth] = self.nodes_by_depth.get(depth, 0) + 1
+    
+    def cutoff(self, move_index: int) -> None:
+        """Record an alpha-beta cutoff caused by the move at move_index."""
+        self.cutoffs += 1
+        self.cutoff_move_index[move_index] = self.cutoff_move_index.get(move_index, 0) + 1
+    
+    def searched(self, depth: int, seconds: float) -> None:
+        """Record a completed root search."""
+        self.searches += 1
+        self.time_by_depth[depth] = self.time_by_depth.get(depth, 0.0) + seconds
+    
+    def merge(self, other: 'SearchStats') -> None:
+        """Add the counters of another SearchStats into this one."""
+        self.searches += other.searches
+        self.cutoffs += other.cutoffs
+        self.tt_hits += other.tt_hits
+        self.cache_hits += other.cache_hits
+        for depth, nodes in other.nodes_by_depth.items():
+            self.nodes_by_depth[depth] = self.nodes_by_depth.get(depth, 0) + nodes
+        for index, count in other.cutoff_move_index.items():
+            self.cutoff_move_index[index] = self.cutoff_move_index.get(index, 0) + count
+        for depth, seconds in other.time_by_depth.items():
+            self.time_by_depth[depth] = self.time_by_depth.get(depth, 0.0) + seconds
+    
+    def to_dict(self) -> dict:
+        """Convert stats to dictionary.
+        
+        Returns:
+            Dictionary representation of the counters
+        """
+        return {
+            'searches': self.searches,
+            'nodes': self.nodes,
+            'nodes_by_depth': dict(sorted(self.nodes_by_depth.items(), reverse=True)),
+            'cutoffs': self.cutoffs,
+            'cutoff_move_index': dict(sorted(self.cutoff_move_index.items())),
+            'first_move_cutoff_rate': (round(self.cutoff_move_index.get(0, 0) / self.cutoffs, 3)
+                                       if self.cutoffs else None),
+            'tt_hits': self.tt_hits,
+            'cache_hits': self.cache_hits,
+            'time_by_depth_ms': {depth: round(seconds * 1000, 3)
+                                 for depth, seconds in sorted(self.time_by_depth.items())},
+        }
+
+
+# Aggregate of every instrumented search in this process
+search_totals = SearchStats()
+
+
+class SearchTimeout(Exception):
+    """Raised inside minimax when a time-bounded search passes its deadline."""
+
+
+# Default search depth of get_ai_move
+DEFAULT_DEPTH = 4
+
+# Best moves of fixed-depth searches kept by get_ai_move
+MOVE_CACHE_SIZE = 100000
+
+# (board spec, canonical position key, player, search settings)
+#     -> best column in the canonical orientation
+move_cache = LRUCache(MOVE_CACHE_SIZE)
+
+# Transposition table entry flags: the stored score is exact, a lower or an upper bound
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+# Columns of the standard board by center preference, the static move order
+CENTER_ORDER = line_table(STANDARD).center_order
+
+# Killer moves kept per remaining depth
+KILLER_SLOTS = 2
+
+
+class MoveOrdering:
+    """Dynamic move ordering shared by the nodes of a search.
+    
+    Columns are tried in this order: the principal-variation move (the
+    transposition table's best move), the killer moves of the node's depth
+    (the last columns that caused a cutoff at that depth), then the rest by
+    their history score (cutoffs caused, weighted by depth squared), ties
+    broken by center preference. Share one instance across the iterations
+    of an iterative-deepening search so earlier iterations order later ones.
+    """
+    
+    def __init__(self, columns: int = len(CENTER_ORDER)):
+        self.killers: Dict[int, List[int]] = {}  # Keyed by remaining depth
+        self.history = [0] * columns
+    
+    def order(self, valid_columns: List[int], depth: int, first: Optional[int] = None) -> List[int]:
+        """Order the valid columns of a node; valid_columns must be in center order.
+        
+        Args:
+            valid_columns: Playable columns in center preference order
+            depth: Remaining depth of the node
+            first: Optional principal-variation move to try first
+            
+        Returns:
+            Columns in search order
+        """
+        history = self.history
+        ordered = sorted(valid_columns, key=lambda col: -history[col])  # Stable: ties stay centered
+        front = [first] if first is not None and first in ordered else []
+        for col in self.killers.get(depth, ()):
+            if col not in front and col in ordered:
+                front.append(col)
+        if not front:
+            return ordered
+        return front + [col for col in ordered if col not in front]
+    
+    def cutoff(self, col: int, depth: int) -> None:
+        """Record a column that caused a cutoff at a remaining depth."""
+        killers = self.killers.setdefault(depth, [])
+        if col in killers:
+            killers.remove(col)
+        killers.insert(0, col)
+        del killers[KILLER_SLOTS:]
+        self.history[col] += depth * depth
 
 
 def count_consecutive(board: List[List[int]], row: int, col: int, player: int, 
@@ -24,10 +173,11 @@ def count_consecutive(board: List[List[int]], row: int, col: int, player: int,
     
     count = 1  # Count the starting position
     delta_row, delta_col = direction
+    rows, cols = len(board), len(board[0])
     
     # Check in positive direction
     r, c = row + delta_row, col + delta_col
-    while (0 <= r < 6 and 0 <= c < 7 and 
+    while (0 <= r < rows and 0 <= c < cols and 
            board[r][c] == player):
         count += 1
         r += delta_row
@@ -35,7 +185,7 @@ def count_consecutive(board: List[List[int]], row: int, col: int, player: int,
     
     # Check in negative direction
     r, c = row - delta_row, col - delta_col
-    while (0 <= r < 6 and 0 <= c < 7 and 
+    while (0 <= r < rows and 0 <= c < cols and 
            board[r][c] == player):
         count += 1
         r -= delta_row
@@ -62,8 +212,8 @@ def find_threats(board: List[List[int]], player: int) -> List[Tuple[int, int, in
         (1, -1),  # Diagonal top-right to bottom-left
     ]
     
-    for row in range(6):
-        for col in range(7):
+    for row in range(len(board)):
+        for col in range(len(board[0])):
             if board[row][col] == player:
                 for direction in directions:
                     count = count_consecutive(board, row, col, player, direction)
@@ -73,13 +223,15 @@ def find_threats(board: List[List[int]], player: int) -> List[Tuple[int, int, in
     return threats
 
 
-def can_complete_four(board: List[List[int]], col: int, player: int) -> bool:
-    """Check if dropping a piece in a column completes 4-in-a-row.
+def can_complete_four(board: List[List[int]], col: int, player: int,
+                      connect: int = STANDARD.connect) -> bool:
+    """Check if dropping a piece in a column completes 4-in-a-row (or connect-in-a-row).
     
     Args:
         board: Current game board
         col: Column to check
         player: Player number (1 or 2)
+        connect: Pieces in a row needed to win
         
     Returns:
         True if move completes 4-in-a-row, False otherwise
@@ -87,12 +239,13 @@ def can_complete_four(board: List[List[int]], col: int, player: int) -> bool:
     try:
         temp_board = [row[:] for row in board]
         drop_piece(temp_board, col, player)
-        return check_winner(temp_board) == player
+        return check_winner(temp_board, connect) == player
     except ValueError:
         return False
 
 
-def evaluate_move(board: List[List[int]], col: int, player: int) -> int:
+def evaluate_move(board: List[List[int]], col: int, player: int,
+                  connect: int = STANDARD.connect) -> int:
     """Evaluate a potential move and return a score.
     
     Higher score = better move.
@@ -101,6 +254,7 @@ def evaluate_move(board: List[List[int]], col: int, player: int) -> int:
         board: Current game board
         col: Column to evaluate
         player: Player number (1 or 2)
+        connect: Pieces in a row needed to win
         
     Returns:
         Score for the move (higher is better)
@@ -116,13 +270,13 @@ def evaluate_move(board: List[List[int]], col: int, player: int) -> int:
         drop_piece(temp_board, col, player)
         
         # Check if this move wins
-        if check_winner(temp_board) == player:
+        if check_winner(temp_board, connect) == player:
             return 10000  # Highest priority
         
         # Check if this move blocks opponent win
         temp_board2 = [row[:] for row in board]
         drop_piece(temp_board2, col, opponent)
-        if check_winner(temp_board2) == opponent:
+        if check_winner(temp_board2, connect) == opponent:
             return 5000  # Very high priority to block
         
         # Count threats created by this move
@@ -139,11 +293,12 @@ def evaluate_move(board: List[List[int]], col: int, player: int) -> int:
         score += blocked * 50
         
         # Prefer center columns
-        if col == 3:
+        distance = abs(2 * col - (len(board[0]) - 1))  # Doubled distance from the center
+        if distance <= 1:
             score += 5
-        elif col in [2, 4]:
+        elif distance <= 3:
             score += 3
-        elif col in [1, 5]:
+        elif distance <= 5:
             score += 1
         
     except ValueError:
@@ -152,77 +307,42 @@ def evaluate_move(board: List[List[int]], col: int, player: int) -> int:
     return score
 
 
-def evaluate_board(board: List[List[int]], ai_player: int) -> float:
+def evaluate_board(board: List[List[int]], ai_player: int,
+                   window_scores: Tuple[int, ...] = evaluation.WINDOW_SCORES,
+                   spec: BoardSpec = STANDARD) -> float:
     """Evaluate board position from AI's perspective using comprehensive heuristics.
     
     Higher score = better for AI, Lower score = better for opponent.
+    Scoring is done over the precomputed winning windows in
+    app.services.evaluation, see evaluation.evaluate().
     
     Args:
         board: Current game board
         ai_player: AI player number (1 or 2)
+        window_scores: Scores of open windows holding 0-3 pieces
+        spec: Board spec of the board
         
     Returns:
         Evaluation score (positive = good for AI, negative = good for opponent)
     """
-    opponent = 3 - ai_player
-    
-    # Check for terminal states
-    winner = check_winner(board)
-    if winner == ai_player:
-        return 100000  # AI wins - maximum score
-    elif winner == opponent:
-        return -100000  # Opponent wins - minimum score
-    
-    if is_draw(board):
-        return 0  # Draw
-    
-    score = 0.0
-    
-    # Evaluate threats for both players
-    ai_threats = find_threats(board, ai_player)
-    opponent_threats = find_threats(board, opponent)
-    
-    # Count 3-in-a-row threats (very dangerous)
-    ai_three_in_row = len([t for t in ai_threats if t[2] == 3])
-    opponent_three_in_row = len([t for t in opponent_threats if t[2] == 3])
-    score += ai_three_in_row * 1000
-    score -= opponent_three_in_row * 1000
-    
-    # Count 2-in-a-row threats (building patterns)
-    ai_two_in_row = len([t for t in ai_threats if t[2] == 2])
-    opponent_two_in_row = len([t for t in opponent_threats if t[2] == 2])
-    score += ai_two_in_row * 10
-    score -= opponent_two_in_row * 10
-    
-    # Center control bonus
-    center_col = 3
-    for row in range(6):
-        if board[row][center_col] == ai_player:
-            score += 3
-        elif board[row][center_col] == opponent:
-            score -= 3
-    
-    # Prefer pieces in center columns (2, 3, 4)
-    for col in [2, 3, 4]:
-        for row in range(6):
-            if board[row][col] == ai_player:
-                score += 1
-            elif board[row][col] == opponent:
-                score -= 1
-    
-    # Check for potential winning moves (can win in 1 move)
-    valid_cols = get_valid_columns(board)
-    for col in valid_cols:
-        if can_complete_four(board, col, ai_player):
-            score += 5000  # Very high value for winning move
-        elif can_complete_four(board, col, opponent):
-            score -= 5000  # Very high negative value for opponent winning move
-    
-    return score
+    return evaluation.evaluate(board, ai_player, window_scores, spec)
+
+
+def _order_columns(valid_columns: List[int], first: Optional[int] = None) -> List[int]:
+    """Try one column first; valid_columns must already be in center order."""
+    if first is None or first not in valid_columns or valid_columns[0] == first:
+        return valid_columns
+    return [first] + [col for col in valid_columns if col != first]
 
 
 def minimax(board: List[List[int]], depth: int, alpha: float, beta: float,
-            maximizing: bool, ai_player: int) -> Tuple[float, Optional[int]]:
+            maximizing: bool, ai_player: int,
+            stats: Optional[SearchStats] = None,
+            table: Optional[dict] = None,
+            deadline: Optional[float] = None,
+            window_scores: Tuple[int, ...] = evaluation.WINDOW_SCORES,
+            ordering: Optional[MoveOrdering] = None,
+            spec: BoardSpec = STANDARD) -> Tuple[float, Optional[int]]:
     """Minimax algorithm with alpha-beta pruning for optimal move selection.
     
     Args:
@@ -232,15 +352,30 @@ def minimax(board: List[List[int]], depth: int, alpha: float, beta: float,
         beta: Best value that minimizing player can guarantee
         maximizing: True if maximizing (AI's turn), False if minimizing (opponent's turn)
         ai_player: AI player number (1 or 2)
+        stats: Optional instrumentation collecting node and cutoff counts
+        table: Optional transposition table; reuse one dict across searches
+            to share results between them
+        deadline: Optional time.perf_counter() value after which the search stops
+        window_scores: Evaluation weights passed to evaluate_board
+        ordering: Optional killer/history move ordering; without it columns
+            are tried center first
+        spec: Board spec of the board
         
     Returns:
         Tuple of (best_score, best_column) where best_column is None at leaf nodes
+        
+    Raises:
+        SearchTimeout: If the deadline passed before the search finished
     """
+    if stats is not None:
+        stats.visit(depth)
+    if deadline is not None and time.perf_counter() > deadline:
+        raise SearchTimeout()
+    
     opponent = 3 - ai_player
-    valid_columns = get_valid_columns(board)
     
     # Terminal conditions
-    winner = check_winner(board)
+    winner = check_winner(board, spec.connect)
     if winner == ai_player:
         return (100000 + depth, None)  # Prefer faster wins
     elif winner == opponent:
@@ -251,62 +386,92 @@ def minimax(board: List[List[int]], depth: int, alpha: float, beta: float,
     
     # Reached max depth - evaluate position
     if depth == 0:
-        return (evaluate_board(board, ai_player), None)
+        return (evaluate_board(board, ai_player, window_scores, spec), None)
+    
+    # Transposition table: reuse a bound searched at least as deep, else try its best move first
+    key = None
+    hint = None
+    if table is not None:
+        key = (evaluation.to_bitboards(board, 1), ai_player, maximizing)
+        entry = table.get(key)
+        if entry is not None:
+            entry_depth, entry_score, entry_flag, hint = entry
+            if entry_depth >= depth and (entry_flag == TT_EXACT
+                                         or (entry_flag == TT_LOWER and entry_score >= beta)
+                                         or (entry_flag == TT_UPPER and entry_score <= alpha)):
+                if stats is not None:
+                    stats.tt_hits += 1
+                return (entry_score, hint)
+    alpha_orig, beta_orig = alpha, beta
+    
+    top_row = board[0]
+    valid_columns = [col for col in line_table(spec).center_order if top_row[col] == 0]
+    if ordering is not None:
+        sorted_cols = ordering.order(valid_columns, depth, hint)
+    else:
+        sorted_cols = _order_columns(valid_columns, hint)
     
     if maximizing:
         # AI's turn - maximize score
-        max_score = -math.inf
+        best_score = -math.inf
         best_col = None
         
-        # Sort columns by center preference for better pruning
-        center_preference = [3, 2, 4, 1, 5, 0, 6]
-        sorted_cols = [c for c in center_preference if c in valid_columns]
-        sorted_cols.extend([c for c in valid_columns if c not in sorted_cols])
-        
-        for col in sorted_cols:
+        for index, col in enumerate(sorted_cols):
             try:
                 temp_board = [row[:] for row in board]
                 drop_piece(temp_board, col, ai_player)
-                score, _ = minimax(temp_board, depth - 1, alpha, beta, False, ai_player)
+                score, _ = minimax(temp_board, depth - 1, alpha, beta, False, ai_player,
+                                   stats, table, deadline, window_scores, ordering, spec)
                 
-                if score > max_score:
-                    max_score = score
+                if score > best_score:
+                    best_score = score
                     best_col = col
                 
                 alpha = max(alpha, score)
                 if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoff(index)
+                    if ordering is not None:
+                        ordering.cutoff(col, depth)
                     break  # Alpha-beta pruning
             except ValueError:
                 continue
-        
-        return (max_score, best_col)
     else:
         # Opponent's turn - minimize score
-        min_score = math.inf
+        best_score = math.inf
         best_col = None
         
-        # Sort columns by center preference for better pruning
-        center_preference = [3, 2, 4, 1, 5, 0, 6]
-        sorted_cols = [c for c in center_preference if c in valid_columns]
-        sorted_cols.extend([c for c in valid_columns if c not in sorted_cols])
-        
-        for col in sorted_cols:
+        for index, col in enumerate(sorted_cols):
             try:
                 temp_board = [row[:] for row in board]
                 drop_piece(temp_board, col, opponent)
-                score, _ = minimax(temp_board, depth - 1, alpha, beta, True, ai_player)
+                score, _ = minimax(temp_board, depth - 1, alpha, beta, True, ai_player,
+                                   stats, table, deadline, window_scores, ordering, spec)
                 
-                if score < min_score:
-                    min_score = score
+                if score < best_score:
+                    best_score = score
                     best_col = col
                 
                 beta = min(beta, score)
                 if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoff(index)
+                    if ordering is not None:
+                        ordering.cutoff(col, depth)
                     break  # Alpha-beta pruning
             except ValueError:
                 continue
-        
-        return (min_score, best_col)
+    
+    if key is not None:
+        if best_score <= alpha_orig:
+            flag = TT_UPPER
+        elif best_score >= beta_orig:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        table[key] = (depth, best_score, flag, best_col)
+    
+    return (best_score, best_col)
 
 
 def is_unblockable_threat(board: List[List[int]], col: int, player: int) -> bool:
@@ -342,17 +507,126 @@ def is_unblockable_threat(board: List[List[int]], col: int, player: int) -> bool
         return False
 
 
-def get_ai_move(board: List[List[int]], ai_player: int) -> int:
-    """Get AI move using hybrid approach: quick checks + minimax algorithm.
+def search_best_move(board: List[List[int]], ai_player: int, depth: int = DEFAULT_DEPTH,
+                     time_budget: Optional[float] = None,
+                     window_scores: Tuple[int, ...] = evaluation.WINDOW_SCORES,
+                     stats: Optional[SearchStats] = None,
+                     spec: BoardSpec = STANDARD) -> Tuple[float, Optional[int]]:
+    """Search a position to a fixed depth or, with a time budget, by iterative deepening.
+    
+    Both use a transposition table and killer/history move ordering
+    (MoveOrdering). With a time budget, depths 1..depth are searched in turn
+    sharing them, and the move of the deepest completed search is returned.
+    Depth 1 always completes so there is always a move.
+    
+    Args:
+        board: Current game board
+        ai_player: AI player number (1 or 2)
+        depth: Search depth, or the maximum depth with a time budget
+        time_budget: Optional seconds to spend on the search
+        window_scores: Evaluation weights passed to evaluate_board
+        stats: Optional instrumentation collecting node and cutoff counts
+        spec: Board spec of the board
+        
+    Returns:
+        Tuple of (best_score, best_column)
+    """
+    ordering = MoveOrdering(spec.cols)
+    if time_budget is None:
+        started = time.perf_counter() if stats is not None else 0.0
+        result = minimax(board, depth, -math.inf, math.inf, True, ai_player,
+                         stats, {}, None, window_scores, ordering, spec)
+        if stats is not None:
+            stats.searched(depth, time.perf_counter() - started)
+        return result
+    
+    started = time.perf_counter()
+    deadline = started + time_budget
+    table = {}
+    result = (0.0, None)
+    for current_depth in range(1, depth + 1):
+        iteration_started = time.perf_counter()
+        try:
+            result = minimax(board, current_depth, -math.inf, math.inf, True, ai_player, stats,
+                             table, deadline if current_depth > 1 else None, window_scores,
+                             ordering, spec)
+        except SearchTimeout:
+            break
+        if stats is not None:
+            stats.searched(current_depth, time.perf_counter() - iteration_started)
+        if abs(result[0]) >= 100000:
+            break  # Forced win or loss found, deeper searches cannot change it
+    return result
+
+
+def get_ai_move(board: List[List[int]], ai_player: int,
+                stats: Optional[SearchStats] = None, depth: int = DEFAULT_DEPTH,
+                time_budget: Optional[float] = None,
+                window_scores: Tuple[int, ...] = evaluation.WINDOW_SCORES,
+                endgame_cells: int = endgame.DEFAULT_EMPTY_CELLS,
+                cache: Optional[LRUCache] = move_cache,
+                spec: BoardSpec = STANDARD) -> int:
+    """Get AI move, reusing the result of an earlier identical or mirrored position.
+    
+    Moves are cached under the canonical position key and the search
+    settings. Time-bounded searches depend on machine load and are never
+    cached; neither are searches with cache=None.
+    
+    Args:
+        board: Current game board
+        ai_player: AI player number (1 or 2)
+        stats: Optional instrumentation; when given it is also merged into search_totals
+        depth: Search depth, or the maximum depth with a time budget
+        time_budget: Optional seconds for an iterative-deepening search
+        window_scores: Evaluation weights passed to evaluate_board
+        endgame_cells: Empty cells at or below which the position is solved exactly (0 = never)
+        cache: Position-result cache, None to always search
+        spec: Board spec of the board
+        
+    Returns:
+        Column number to play
+    """
+    if cache is None or time_budget is not None:
+        return choose_move(board, ai_player, stats, depth, time_budget, window_scores,
+                           endgame_cells, spec)
+    
+    key, mirrored = canonical.position_key(board)
+    cache_key = (spec, key, ai_player, depth, tuple(window_scores), endgame_cells)
+    col = cache.get(cache_key)
+    if col is None:
+        col = choose_move(board, ai_player, stats, depth, time_budget, window_scores,
+                          endgame_cells, spec)
+        cache.put(cache_key, canonical.map_move(col, mirrored, spec.cols))
+        return col
+    if stats is not None:
+        stats.cache_hits += 1
+        search_totals.cache_hits += 1
+    return canonical.map_move(col, mirrored, spec.cols)
+
+
+def choose_move(board: List[List[int]], ai_player: int,
+                stats: Optional[SearchStats] = None, depth: int = DEFAULT_DEPTH,
+                time_budget: Optional[float] = None,
+                window_scores: Tuple[int, ...] = evaluation.WINDOW_SCORES,
+                endgame_cells: int = endgame.DEFAULT_EMPTY_CELLS,
+                spec: BoardSpec = STANDARD) -> int:
+    """Choose an AI move using hybrid approach: quick checks + minimax algorithm.
     
     Strategy:
     1. Quick win/block checks (fast, immediate)
-    2. Minimax with alpha-beta pruning (depth 4) for optimal play
-    3. Fallback to rule-based if minimax fails
+    2. Exact endgame solve once at most endgame_cells cells are empty
+    3. Minimax with alpha-beta pruning (depth 4 by default) for optimal play
+    4. Fallback to rule-based if minimax fails
     
     Args:
         board: Current game board
         ai_player: AI player number (1 or 2)
+        stats: Optional instrumentation; when given it is also merged into search_totals
+        depth: Search depth, or the maximum depth with a time budget
+        time_budget: Optional seconds for an iterative-deepening search
+        window_scores: Evaluation weights passed to evaluate_board
+        endgame_cells: Empty cells at or below which the position is solved exactly (0 = never)
+        spec: Board spec of the board
         
     Returns:
         Column number to play
@@ -366,20 +640,28 @@ def get_ai_move(board: List[List[int]], ai_player: int) -> int:
     # Quick checks for immediate wins/blocks (fast path)
     # 1. Win immediately if possible
     for col in valid_columns:
-        if can_complete_four(board, col, ai_player):
+        if can_complete_four(board, col, ai_player, spec.connect):
             return col
     
     # 2. Block opponent's immediate win
     for col in valid_columns:
-        if can_complete_four(board, col, opponent):
+        if can_complete_four(board, col, opponent, spec.connect):
             return col
     
+    # Near-full boards are small enough to solve exactly
+    if endgame.empty_cells(board) <= endgame_cells:
+        _, best_col = endgame.solve(board, spec)
+        if best_col in valid_columns:
+            return best_col
+    
     # Use minimax algorithm for optimal play
     # Depth 4 provides strong play while remaining fast
     # With alpha-beta pruning, this evaluates ~49 positions (very fast)
     try:
-        score, best_col = minimax(board, depth=4, alpha=-math.inf, beta=math.inf,
-                                   maximizing=True, ai_player=ai_player)
+        score, best_col = search_best_move(board, ai_player, depth, time_budget,
+                                           window_scores, stats, spec)
+        if stats is not None:
+            search_totals.merge(stats)
         
         if best_col is not None and best_col in valid_columns:
             return best_col
@@ -393,7 +675,7 @@ def get_ai_move(board: List[List[int]], ai_player: int) -> int:
     best_threat_score = -1
     for col in valid_columns:
         if is_unblockable_threat(board, col, ai_player):
-            move_score = evaluate_move(board, col, ai_player)
+            move_score = evaluate_move(board, col, ai_player, spec.connect)
             if move_score > best_threat_score:
                 best_threat_score = move_score
                 best_threat_col = col
@@ -412,7 +694,7 @@ def get_ai_move(board: List[List[int]], ai_player: int) -> int:
                     try:
                         temp_board = [row[:] for row in board]
                         drop_piece(temp_board, col, opponent)
-                        if check_winner(temp_board) != opponent:
+                        if check_winner(temp_board, spec.connect) != opponent:
                             return col
                     except ValueError:
                         continue
@@ -421,7 +703,7 @@ def get_ai_move(board: List[List[int]], ai_player: int) -> int:
     best_move_col = None
     best_move_score = -1
     for col in valid_columns:
-        move_score = evaluate_move(board, col, ai_player)
+        move_score = evaluate_move(board, col, ai_player, spec.connect)
         if move_score > best_move_score:
             best_move_score = move_score
             best_move_col = col
@@ -440,10 +722,48 @@ def get_ai_move(board: List[List[int]], ai_player: int) -> int:
                     return col
     
     # 7. Prefer center columns
-    center_preference = [3, 2, 4, 1, 5, 0, 6]
-    for col in center_preference:
+    for col in line_table(spec).center_order:
         if col in valid_columns:
             return col
     
     # 8. Fallback to random
     return random.choice(valid_columns)
+
+
+def get_weighted_move(board: List[List[int]], ai_player: int, temperature: float,
+                      window_scores: Tuple[int, ...] = evaluation.WINDOW_SCORES,
+                      rng: Optional[random.Random] = None,
+                      spec: BoardSpec = STANDARD) -> int:
+    """Pick a move at random, weighted by the evaluation of the position it leads to.
+    
+    Each column is weighted by exp((score - best score) / temperature), so a
+    low temperature nearly always plays the best-looking move and a high one
+    plays almost uniformly. There is no search and no win/block check, which
+    makes this the cheap and beatable choice for easy games.
+    
+    Args:
+        board: Current game board
+        ai_player: AI player number (1 or 2)
+        temperature: Evaluation points per factor e of weight
+        window_scores: Evaluation weights passed to evaluate_board
+        rng: Optional random generator
+        spec: Board spec of the board
+        
+    Returns:
+        Column number to play
+        
+    Raises:
+        ValueError: If no move is available
+    """
+    valid_columns = get_valid_columns(board)
+    if not valid_columns:
+        raise ValueError('No valid moves available')
+    
+    scores = []
+    for col in valid_columns:
+        temp_board = [row[:] for row in board]
+        drop_piece(temp_board, col, ai_player)
+        scores.append(evaluate_board(temp_board, ai_player, window_scores, spec))
+    best = max(scores)
+    weights = [math.exp((score - best) / temperature) for score in scores]
+    return (rng or random).choices(valid_columns, weights)[0]
@@ -0,0 +1,219 @@
+"""Batch position analysis on a process pool.
+
+Positions are split into chunks of consecutive plies. Each chunk is searched
+in order by one worker process, which keeps a transposition table for its
+whole lifetime, so the subtrees shared by neighbouring plies are reused.
+Results are yielded as chunks finish, not in input order. The heuristic
+evaluations of all positions are computed up front in this process, with
+evaluation.evaluate_batch() when there are enough of them and NumPy is
+installed, and added to the results as they arrive.
+"""
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator, List, Optional, Tuple
+from app.services import ai, evaluation, workers as worker_pool
+from app.services.board_spec import STANDARD, BoardSpec
+from app.services.evaluation import analyze_threats
+from app.services.game_logic import create_board, drop_piece, check_winner, is_draw
+
+# Transposition table entries a worker keeps before starting over
+WORKER_TABLE_SIZE = 500000
+
+# Positions per chunk; smaller chunks stream sooner, larger ones share more of the table
+MAX_CHUNK_SIZE = 8
+
+# Positions from which evaluate_batch beats a loop of evaluate calls
+# (see benchmarks/evaluate_batch.py)
+MIN_BATCH_SIZE = 16
+
+# Transposition table of the current worker process, and the spec of its positions
+_worker_table: dict = {}
+_worker_spec = STANDARD
+
+
+def boards_from_moves(moves: List[int], spec: BoardSpec = STANDARD) -> List[List[List[int]]]:
+    """Build the position before every move of a move sequence.
+
+    Args:
+        moves: Columns played, player 1 first
+        spec: Board spec of the game
+
+    Returns:
+        List of boards, one per move
+
+    Raises:
+        ValueError: If a move is illegal or played after the game ended
+    """
+    board = create_board(spec)
+    boards = []
+    player = 1
+    for ply, col in enumerate(moves):
+        if check_winner(board, spec.connect) or is_draw(board):
+            raise ValueError(f'Move {ply + 1} is played after the game ended')
+        if not isinstance(col, int) or isinstance(col, bool) or not 0 <= col < spec.cols:
+            raise ValueError(f'Move {ply + 1} is not a column between 0 and {spec.cols - 1}')
+        boards.append([row[:] for row in board])
+        try:
+            drop_piece(board, col, player)
+        except ValueError:
+            raise ValueError(f'Move {ply + 1} is played in full column {col}')
+        player = 3 - player
+    return boards
+
+
+def validate_board(board, spec: BoardSpec = STANDARD) -> List[List[int]]:
+    """Check that a board has the shape of a spec and valid cell values.
+
+    Args:
+        board: Board submitted by a client
+        spec: Board spec the board must have
+
+    Returns:
+        The board
+
+    Raises:
+        ValueError: If the board is malformed
+    """
+    if (not isinstance(board, list) or len(board) != spec.rows
+            or any(not isinstance(row, list) or len(row) != spec.cols for row in board)):
+        raise ValueError(f'Board must be {spec.rows} rows of {spec.cols} cells')
+    if any(cell not in (0, 1, 2) or isinstance(cell, bool) for row in board for cell in row):
+        raise ValueError('Board cells must be 0, 1 or 2')
+    return board
+
+
+def player_to_move(board: List[List[int]]) -> int:
+    """Side to move, from the piece counts (player 1 moves first)."""
+    pieces = sum(1 for row in board for cell in row if cell)
+    return 1 if pieces % 2 == 0 else 2
+
+
+def static_evaluations(boards: List[List[List[int]]], spec: BoardSpec = STANDARD) -> List[float]:
+    """Heuristic scores of positions for their side to move.
+
+    Positions are evaluated with one evaluate_batch() call per side to move,
+    or one evaluate() call each without NumPy or below MIN_BATCH_SIZE.
+
+    Args:
+        boards: Positions to evaluate
+        spec: Board spec of the positions
+
+    Returns:
+        One score per position, in input order
+    """
+    players = [player_to_move(board) for board in boards]
+    if evaluation.np is None or len(boards) < MIN_BATCH_SIZE:
+        return [evaluation.evaluate(board, player, spec=spec) for board, player in zip(boards, players)]
+    scores = [0.0] * len(boards)
+    for player in (1, 2):
+        indices = [index for index, mover in enumerate(players) if mover == player]
+        if indices:
+            batch = evaluation.evaluate_batch([boards[index] for index in indices], player, spec=spec)
+            for index, score in zip(indices, batch.tolist()):
+                scores[index] = score
+    return scores
+
+
+def analyze_position(board: List[List[int]], depth: int, table: Optional[dict] = None,
+                     spec: BoardSpec = STANDARD) -> dict:
+    """Search one position for the side to move.
+
+    Args:
+        board: Game board
+        depth: Search depth in plies
+        table: Optional transposition table shared with other searches of the spec
+        spec: Board spec of the board
+
+    Returns:
+        Dictionary with the best move and its score from the mover's perspective,
+        and both players' threats (evaluation.analyze_threats)
+    """
+    player = player_to_move(board)
+    winner = check_winner(board, spec.connect)
+    if winner or is_draw(board):
+        return {'to_move': player, 'best_move': None, 'score': None,
+                'status': 'won' if winner else 'draw', 'winner': winner}
+
+    stats = ai.SearchStats()
+    started = time.perf_counter()
+    score, best_col = ai.minimax(board, depth, -math.inf, math.inf, True, player, stats, table,
+                                 ordering=ai.MoveOrdering(spec.cols), spec=spec)
+    return {
+        'to_move': player,
+        'best_move': best_col,
+        'score': score,
+        'status': 'playing',
+        'nodes': stats.nodes,
+        'tt_hits': stats.tt_hits,
+        'ms': round((time.perf_counter() - started) * 1000, 3),
+        'threats': analyze_threats(board, spec),
+    }
+
+
+def _analyze_chunk(chunk: List[Tuple[int, List[List[int]]]], depth: int,
+                   spec: BoardSpec = STANDARD) -> List[dict]:
+    """Worker entry point: analyze consecutive positions with the worker's table."""
+    global _worker_table, _worker_spec
+    # Table keys are bitboards, which collide between specs
+    if len(_worker_table) > WORKER_TABLE_SIZE or spec != _worker_spec:
+        _worker_table = {}
+        _worker_spec = spec
+    results = []
+    for index, board in chunk:
+        result = analyze_position(board, depth, _worker_table, spec)
+        result['index'] = index
+        results.append(result)
+    return results
+
+
+def chunk_positions(boards: List[List[List[int]]], workers: int) -> List[List[Tuple[int, List[List[int]]]]]:
+    """Split positions into runs of consecutive plies, enough to keep every worker busy."""
+    size = max(1, min(MAX_CHUNK_SIZE, math.ceil(len(boards) / max(1, workers))))
+    indexed = list(enumerate(boards))
+    return [indexed[i:i + size] for i in range(0, len(indexed), size)]
+
+
+def analyze_boards(boards: List[List[List[int]]], depth: int, workers: Optional[int] = None,
+                   sleep: Callable[[float], None] = time.sleep,
+                   poll_interval: float = 0.01, spec: BoardSpec = STANDARD) -> Iterator[dict]:
+    """Analyze positions on the process pool, yielding results as they finish.
+
+    Args:
+        boards: Positions to analyze, all of one spec
+        depth: Search depth in plies
+        workers: Worker processes (default: CPU count)
+        sleep: Function used to wait between polls; pass socketio.sleep so an
+            event-loop server keeps serving other clients meanwhile
+        poll_interval: Seconds between polls of the pending chunks
+        spec: Board spec of the positions
+
+    Yields:
+        One result dictionary per position, with its input index and, for
+        positions still in play, its heuristic score ('evaluation')
+    """
+    static_scores = static_evaluations(boards, spec)
+    workers = workers or os.cpu_count() or 1
+    pool = worker_pool.get_pool(workers)
+    pending = {pool.submit(_analyze_chunk, chunk, depth, spec)
+               for chunk in chunk_positions(boards, workers)}
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=0, return_when=FIRST_COMPLETED)
+            if not done:
+                sleep(poll_interval)
+                continue
+            for future in done:
+                for result in future.result():
+                    if result['status'] == 'playing':
+                        result['evaluation'] = static_scores[result['index']]
+                    yield result
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool for the next request
+        worker_pool.reset_pool()
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
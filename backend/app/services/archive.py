@@ -0,0 +1,124 @@
+"""Archival of finished games into cold storage."""
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import selectinload
+from app.extensions import db
+from app.models import Game, Player, Room, GameArchive
+from app.services.game_logic import pack_board
+
+FINISHED_STATUSES = ('finished', 'draw')
+
+
+def archive_row(game: Game) -> dict:
+    """Build the games_archive row for a finished game.
+    
+    Args:
+        game: Finished game with its players loaded
+        
+    Returns:
+        Column values for GameArchive
+    """
+    row = {
+        'id': game.id,
+        'game_mode': game.game_mode,
+        'status': game.status,
+        'winner': game.winner,
+        'owner_id': game.owner_id,
+        'moves': game.moves or '',
+        'board': pack_board(game.board),
+        'rows': game.spec.rows,
+        'cols': game.spec.cols,
+        'connect': game.spec.connect,
+        'player1_user_id': None,
+        'player1_nickname': None,
+        'player2_user_id': None,
+        'player2_nickname': None,
+        'ai_player': None,
+        'ai_engine': game.ai_engine,
+        'difficulty': game.difficulty,
+        'seq': game.seq or 0,
+        'created_at': game.created_at,
+        'finished_at': game.updated_at,
+        'archived_at': datetime.utcnow(),
+    }
+    for player in game.players:
+        row[f'player{player.player_number}_user_id'] = player.user_id
+        row[f'player{player.player_number}_nickname'] = player.nickname
+        if player.is_ai:
+            row['ai_player'] = player.player_number
+    return row
+
+
+def archive_finished_games(older_than_days: int, batch_size: int = 500,
+                           limit: Optional[int] = None) -> int:
+    """Move finished games older than the cutoff into games_archive.
+    
+    Games are processed in batches: one bulk insert into the archive and bulk
+    deletes of the hot rows per batch, committed together.
+    
+    Args:
+        older_than_days: Only archive games last updated before this many days ago
+        batch_size: Number of games moved per transaction
+        limit: Optional maximum number of games to archive in this run
+        
+    Returns:
+        Number of archived games
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    archived = 0
+    
+    while limit is None or archived < limit:
+        size = batch_size if limit is None else min(batch_size, limit - archived)
+        games = (Game.query
+                 .options(selectinload(Game.players))
+                 .filter(Game.status.in_(FINISHED_STATUSES), Game.updated_at < cutoff)
+                 .order_by(Game.id)
+                 .limit(size)
+                 .all())
+        if not games:
+            break
+        
+        game_ids = [game.id for game in games]
+        rows = [archive_row(game) for game in games]
+        
+        try:
+            db.session.execute(insert(GameArchive), rows)
+            # Rooms still pointing at an archived game are closed
+            db.session.execute(
+                update(Room)
+                .where(Room.game_id.in_(game_ids))
+                .values(game_id=None, status='finished')
+                .execution_options(synchronize_session=False)
+            )
+            db.session.execute(
+                delete(Player)
+                .where(Player.game_id.in_(game_ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.execute(
+                delete(Game)
+                .where(Game.id.in_(game_ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        db.session.expunge_all()
+        archived += len(game_ids)
+    
+    return archived
+
+
+def get_archived_game(game_id: int) -> Optional[GameArchive]:
+    """Look up a game in the archive.
+    
+    Args:
+        game_id: Original game ID
+        
+    Returns:
+        Archived game or None
+    """
+    return db.session.get(GameArchive, game_id)
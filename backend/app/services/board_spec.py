@@ -0,0 +1,162 @@
+"""Board dimensions and win length.
+
+A BoardSpec fixes the rows, the columns and the number of pieces in a row
+that wins. Every game stores one (Game.rows, Game.cols, Game.connect); the
+standard Connect Four board is 6x7, four in a row.
+
+The winning lines of a spec and the lines through each cell are built on
+first use and cached per spec, so checking a win after a move only looks at
+the lines through the cell played. Cells are numbered row-major,
+`index = row * cols + col`, with row 0 at the top.
+"""
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+MIN_SIZE = 4
+MAX_ROWS = 10
+MAX_COLUMNS = 10  # Game.moves stores one digit per move
+MIN_CONNECT = 3
+
+
+class BoardSpec(NamedTuple):
+    """Rows, columns and win length of a board."""
+
+    rows: int = 6
+    cols: int = 7
+    connect: int = 4
+
+    @property
+    def cells(self) -> int:
+        """Number of cells on the board."""
+        return self.rows * self.cols
+
+    def to_dict(self) -> dict:
+        """Convert spec to dictionary."""
+        return {'rows': self.rows, 'cols': self.cols, 'connect': self.connect}
+
+
+STANDARD = BoardSpec()
+
+# Named variants accepted by the game creation endpoints
+VARIANTS = {
+    'standard': STANDARD,
+    '7x8': BoardSpec(7, 8, 4),
+    'connect5': BoardSpec(6, 9, 5),
+}
+
+
+class LineTable(NamedTuple):
+    """Precomputed lines of a spec."""
+
+    lines: Tuple[Tuple[int, ...], ...]  # Flat cell indices of every winning line
+    masks: Tuple[int, ...]  # The same lines as bitmasks over flat cell indices
+    cell_lines: Tuple[Tuple[int, ...], ...]  # Cell index -> indices of the lines through it
+    center_order: Tuple[int, ...]  # Columns center first, left before right on ties
+
+
+def make_spec(rows: int, cols: int, connect: int) -> BoardSpec:
+    """Create a validated spec.
+
+    Args:
+        rows: Number of rows
+        cols: Number of columns
+        connect: Pieces in a row needed to win
+
+    Returns:
+        BoardSpec
+
+    Raises:
+        ValueError: If a dimension is out of range or no line can be won
+    """
+    for name, value, maximum in (('rows', rows, MAX_ROWS), ('cols', cols, MAX_COLUMNS)):
+        if not isinstance(value, int) or isinstance(value, bool) or not MIN_SIZE <= value <= maximum:
+            raise ValueError(f'{name} must be between {MIN_SIZE} and {maximum}')
+    if (not isinstance(connect, int) or isinstance(connect, bool)
+            or not MIN_CONNECT <= connect <= max(rows, cols)):
+        raise ValueError(f'connect must be between {MIN_CONNECT} and {max(rows, cols)}')
+    return BoardSpec(rows, cols, connect)
+
+
+def spec_from_request(data: dict) -> BoardSpec:
+    """Read a spec from a request body.
+
+    Accepts a named `variant` (see VARIANTS) or any of `rows`, `cols` and
+    `connect`, defaulting to the standard board.
+
+    Args:
+        data: JSON request body
+
+    Returns:
+        BoardSpec
+
+    Raises:
+        ValueError: If the variant is unknown or the dimensions are invalid
+    """
+    variant = data.get('variant')
+    if variant is not None:
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown board variant '{variant}'")
+        return VARIANTS[variant]
+    return make_spec(data.get('rows', STANDARD.rows), data.get('cols', STANDARD.cols),
+                     data.get('connect', STANDARD.connect))
+
+
+def spec_of(board: List[List[int]], connect: int = STANDARD.connect) -> BoardSpec:
+    """Spec of a board, whose dimensions it carries."""
+    return BoardSpec(len(board), len(board[0]), connect)
+
+
+@lru_cache(maxsize=None)
+def line_table(spec: BoardSpec) -> LineTable:
+    """Build the line tables of a spec, once per spec.
+
+    Args:
+        spec: Board spec
+
+    Returns:
+        LineTable
+    """
+    rows, cols, connect = spec
+    lines = []
+    for row in range(rows):
+        for col in range(cols):
+            for delta_row, delta_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row = row + delta_row * (connect - 1)
+                end_col = col + delta_col * (connect - 1)
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    lines.append(tuple((row + delta_row * i) * cols + col + delta_col * i
+                                       for i in range(connect)))
+    cell_lines: List[List[int]] = [[] for _ in range(rows * cols)]
+    for index, line in enumerate(lines):
+        for cell in line:
+            cell_lines[cell].append(index)
+    return LineTable(
+        lines=tuple(lines),
+        masks=tuple(sum(1 << cell for cell in line) for line in lines),
+        cell_lines=tuple(tuple(indices) for indices in cell_lines),
+        center_order=tuple(sorted(range(cols), key=lambda col: (abs(2 * col - (cols - 1)), col))),
+    )
+
+
+def winner_at(board: List[List[int]], row: int, col: int,
+              connect: int = STANDARD.connect) -> Optional[int]:
+    """Check the lines through one cell for a win.
+
+    Args:
+        board: Game board
+        row: Row of the cell, usually the last piece played
+        col: Column of the cell
+        connect: Pieces in a row needed to win
+
+    Returns:
+        Player number owning a winning line through the cell, None otherwise
+    """
+    player = board[row][col]
+    if not player:
+        return None
+    cols = len(board[0])
+    table = line_table(spec_of(board, connect))
+    for index in table.cell_lines[row * cols + col]:
+        if all(board[cell // cols][cell % cols] == player for cell in table.lines[index]):
+            return player
+    return None
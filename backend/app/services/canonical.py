@@ -0,0 +1,210 @@
+"""Bitboards and canonical position keys.
+
+Connect Four is symmetric about the center column: a position and its mirror
+image have the same value, and the best move of one is the mirrored best move
+of the other. Keying position stores by the canonical key stores each pair
+once. Look up with position_key() and map stored moves back with map_move().
+
+Keys are built from bitboards where each column takes rows + 1 bits (its
+cells and a sentinel above them, 7 bits on the standard board), `current`
+holds the stones of the side to move and `mask` all stones. `current + mask`
+identifies the position uniquely among boards of the same size. Playing
+column c is `current, mask = current ^ mask, mask | (mask + BOTTOM_MASKS[c])`.
+
+The masks of other board specs come from layout(), built once per spec; the
+functions below default to the standard 6x7 board.
+"""
+from functools import lru_cache
+from typing import Callable, List, NamedTuple, Tuple
+from app.services.board_spec import STANDARD, BoardSpec
+
+
+class BitboardLayout(NamedTuple):
+    """Bitboard masks of one board spec."""
+
+    spec: BoardSpec
+    cells: int
+    column_bits: int
+    bottom_masks: Tuple[int, ...]
+    top_masks: Tuple[int, ...]
+    column_masks: Tuple[int, ...]
+    # Per direction, the shifts whose successive `run &= run >> shift` leave
+    # the lowest bit of every run of `connect` stones
+    alignment_shifts: Tuple[Tuple[int, ...], ...]
+    aligned: Callable[[int], bool]  # alignment() of this layout, for hot loops
+
+
+def _alignment_check(alignment_shifts: Tuple[Tuple[int, ...], ...]) -> Callable[[int], bool]:
+    """Build the alignment check of a layout, unrolled for two shifts per direction."""
+    if any(len(shifts) != 2 for shifts in alignment_shifts):
+        def aligned(stones: int) -> bool:
+            for shifts in alignment_shifts:
+                run = stones
+                for shift in shifts:
+                    run &= run >> shift
+                if run:
+                    return True
+            return False
+        return aligned
+
+    (a1, a2), (b1, b2), (c1, c2), (d1, d2) = alignment_shifts
+
+    def aligned_pairs(stones: int) -> bool:
+        run = stones & (stones >> a1)
+        if run & (run >> a2):
+            return True
+        run = stones & (stones >> b1)
+        if run & (run >> b2):
+            return True
+        run = stones & (stones >> c1)
+        if run & (run >> c2):
+            return True
+        run = stones & (stones >> d1)
+        return bool(run & (run >> d2))
+    return aligned_pairs
+
+
+@lru_cache(maxsize=None)
+def layout(spec: BoardSpec) -> BitboardLayout:
+    """Build the bitboard masks of a spec, once per spec.
+
+    Args:
+        spec: Board spec
+
+    Returns:
+        BitboardLayout
+    """
+    rows, cols, connect = spec
+    column_bits = rows + 1
+    alignment_shifts = []
+    for step in (1, column_bits, column_bits - 1, column_bits + 1):
+        # Double the run length while it fits, then overlap to exactly `connect`
+        shifts = []
+        length = 1
+        while 2 * length <= connect:
+            shifts.append(length * step)
+            length *= 2
+        if length < connect:
+            shifts.append((connect - length) * step)
+        alignment_shifts.append(tuple(shifts))
+    alignment_shifts = tuple(alignment_shifts)
+    return BitboardLayout(
+        spec=spec,
+        cells=rows * cols,
+        column_bits=column_bits,
+        bottom_masks=tuple(1 << (col * column_bits) for col in range(cols)),
+        top_masks=tuple(1 << (rows - 1 + col * column_bits) for col in range(cols)),
+        column_masks=tuple(((1 << rows) - 1) << (col * column_bits) for col in range(cols)),
+        alignment_shifts=alignment_shifts,
+        aligned=_alignment_check(alignment_shifts),
+    )
+
+
+STANDARD_LAYOUT = layout(STANDARD)
+
+ROWS, COLUMNS, _ = STANDARD
+CELLS = STANDARD_LAYOUT.cells
+COLUMN_BITS = STANDARD_LAYOUT.column_bits
+
+BOTTOM_MASKS = list(STANDARD_LAYOUT.bottom_masks)
+TOP_MASKS = list(STANDARD_LAYOUT.top_masks)
+COLUMN_MASKS = list(STANDARD_LAYOUT.column_masks)
+
+
+def to_bitboards(board: List[List[int]]) -> Tuple[int, int, int]:
+    """Convert a board of any size to bitboards of the side to move.
+
+    Args:
+        board: Game board (row 0 at the top)
+
+    Returns:
+        Tuple of (stones of the side to move, all stones, moves played)
+    """
+    rows = len(board)
+    column_bits = rows + 1
+    moves = sum(1 for row in board for cell in row if cell)
+    player = 1 if moves % 2 == 0 else 2
+    current = 0
+    mask = 0
+    for row in range(rows):
+        for col, cell in enumerate(board[row]):
+            if cell:
+                bit = 1 << (col * column_bits + rows - 1 - row)
+                mask |= bit
+                if cell == player:
+                    current |= bit
+    return current, mask, moves
+
+
+def alignment(stones: int, layout: BitboardLayout = STANDARD_LAYOUT) -> bool:
+    """Check if a bitboard contains `connect` in a row."""
+    return layout.aligned(stones)
+
+
+def is_winning_move(current: int, mask: int, col: int,
+                    layout: BitboardLayout = STANDARD_LAYOUT) -> bool:
+    """Check if the side to move wins by playing a (playable) column."""
+    return layout.aligned(current | ((mask + layout.bottom_masks[col]) & layout.column_masks[col]))
+
+
+def mirror(bits: int, layout: BitboardLayout = STANDARD_LAYOUT) -> int:
+    """Mirror a bitboard about the center column."""
+    column_bits = layout.column_bits
+    column_full = (1 << column_bits) - 1
+    last = len(layout.bottom_masks) - 1
+    mirrored = 0
+    for col in range(last + 1):
+        mirrored |= ((bits >> (col * column_bits)) & column_full) << ((last - col) * column_bits)
+    return mirrored
+
+
+def canonical_key(current: int, mask: int,
+                  layout: BitboardLayout = STANDARD_LAYOUT) -> Tuple[int, bool]:
+    """Key shared by a bitboard position and its mirror image.
+
+    Args:
+        current: Stones of the side to move
+        mask: All stones
+        layout: Bitboard layout of the board
+
+    Returns:
+        Tuple of (key, True if the key is that of the mirror image)
+    """
+    key = current + mask
+    mirrored_key = mirror(key, layout)
+    if mirrored_key < key:
+        return mirrored_key, True
+    return key, False
+
+
+def position_key(board: List[List[int]]) -> Tuple[int, bool]:
+    """Canonical key of a board.
+
+    Keys of boards of different sizes can collide; stores holding several
+    sizes must key by the board spec as well.
+
+    Args:
+        board: Game board
+
+    Returns:
+        Tuple of (key shared with the mirrored board, True if the key is the mirror's)
+    """
+    current, mask, _ = to_bitboards(board)
+    return canonical_key(current, mask, layout(BoardSpec(len(board), len(board[0]))))
+
+
+def map_move(col: int, mirrored: bool, columns: int = COLUMNS) -> int:
+    """Map a column between a position and its canonical orientation.
+
+    Mirroring is its own inverse, so the same call maps a move into the
+    canonical orientation before storing and back after lookup.
+
+    Args:
+        col: Column number
+        mirrored: Mirrored flag returned with the position's key
+        columns: Number of columns of the board
+
+    Returns:
+        Column in the other orientation
+    """
+    return columns - 1 - col if mirrored else col
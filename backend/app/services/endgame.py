@@ -0,0 +1,110 @@
+"""Exact solver for near-full boards.
+
+Once few empty cells remain the game tree is small enough to search to the
+end. The solver works on the bitboards of app.services.canonical. Scores
+follow the usual convention: positive when the side to move wins, larger
+for earlier wins, 0 for a draw.
+
+Solved positions are memoized in an LRU cache under their board spec and
+canonical key, so a position and its mirror share an entry.
+"""
+from typing import List, Optional, Tuple
+from app.services.board_spec import STANDARD, BoardSpec, line_table
+from app.services.canonical import (
+    BitboardLayout, canonical_key, is_winning_move, layout, map_move, mirror, to_bitboards,
+)
+from app.utils.cache import LRUCache
+
+# Default number of empty cells at or below which get_ai_move solves exactly
+DEFAULT_EMPTY_CELLS = 16
+
+# Solved root positions kept in the cache
+CACHE_SIZE = 50000
+
+# Column order tried first on the standard board, center out
+MOVE_ORDER = list(line_table(STANDARD).center_order)
+
+# (board spec, canonical position key) -> (score, best column in the canonical orientation)
+cache = LRUCache(CACHE_SIZE)
+
+
+def _negamax(current: int, mask: int, moves: int, alpha: int, beta: int, table: dict,
+             bits: BitboardLayout, move_order: Tuple[int, ...]) -> int:
+    """Alpha-beta negamax returning the exact score within [alpha, beta]."""
+    cells = bits.cells
+    if moves == cells:
+        return 0
+    top_masks = bits.top_masks
+    for col in move_order:
+        if not mask & top_masks[col] and is_winning_move(current, mask, col, bits):
+            return (cells + 1 - moves) // 2
+
+    # Upper bound: the earliest possible win is two plies away, or a stored bound
+    upper = table.get(current + mask, (cells - 1 - moves) // 2)
+    if beta > upper:
+        beta = upper
+        if alpha >= beta:
+            return beta
+
+    bottom_masks = bits.bottom_masks
+    for col in move_order:
+        if not mask & top_masks[col]:
+            score = -_negamax(current ^ mask, mask | (mask + bottom_masks[col]), moves + 1,
+                              -beta, -alpha, table, bits, move_order)
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+    table[current + mask] = alpha
+    return alpha
+
+
+def solve(board: List[List[int]], spec: BoardSpec = STANDARD) -> Tuple[int, Optional[int]]:
+    """Solve a position exactly for the side to move.
+
+    Args:
+        board: Game board without a winner
+        spec: Board spec of the board
+
+    Returns:
+        Tuple of (score, best column); the column is None on a full board
+    """
+    bits = layout(spec)
+    current, mask, moves = to_bitboards(board)
+    key, mirrored = canonical_key(current, mask, bits)
+    cached = cache.get((spec, key))
+    if cached is None:
+        if mirrored:
+            current, mask = mirror(current, bits), mirror(mask, bits)
+        cached = _solve_root(current, mask, moves, bits)
+        cache.put((spec, key), cached)
+    score, col = cached
+    if col is not None:
+        col = map_move(col, mirrored, spec.cols)
+    return score, col
+
+
+def _solve_root(current: int, mask: int, moves: int,
+                bits: BitboardLayout) -> Tuple[int, Optional[int]]:
+    """Score every move of a position and return the best one."""
+    cells = bits.cells
+    move_order = line_table(bits.spec).center_order
+    best_score = None
+    best_col = None
+    table = {}
+    for col in move_order:
+        if mask & bits.top_masks[col]:
+            continue
+        if is_winning_move(current, mask, col, bits):
+            return (cells + 1 - moves) // 2, col
+        score = -_negamax(current ^ mask, mask | (mask + bits.bottom_masks[col]), moves + 1,
+                          -cells, cells, table, bits, move_order)
+        if best_score is None or score > best_score:
+            best_score = score
+            best_col = col
+    return (best_score if best_score is not None else 0), best_col
+
+
+def empty_cells(board: List[List[int]]) -> int:
+    """Number of empty cells on a board."""
+    return sum(1 for row in board for cell in row if not cell)
@@ -0,0 +1,213 @@
+"""AI engines behind a common interface.
+
+A game stores the name of its engine (Game.ai_engine). The move path looks
+the engine up with engine_from_config() and asks it for a move; engines may
+keep per-game state between moves and drop it in release().
+
+Games also store a difficulty (Game.difficulty). Each level overrides the
+engine settings with a cheaper or costlier search, see DIFFICULTY_SETTINGS;
+operators cap the level actually played with AI_MAX_DIFFICULTY.
+
+Engines search the board spec of their game (Game.spec), the standard 6x7
+board unless given another.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple, Type
+from app.services import ai, endgame, evaluation, mcts
+from app.services.board_spec import STANDARD, BoardSpec
+
+DEFAULT_ENGINE = 'minimax'
+
+# Difficulty levels, weakest first
+DIFFICULTIES = ('easy', 'medium', 'hard', 'expert')
+DEFAULT_DIFFICULTY = 'hard'
+
+# Engine name -> difficulty -> settings overriding those from the config.
+# 'hard' is the configured engine as is; easy minimax plays random-weighted
+# moves without search, expert searches deeper within a time budget.
+DIFFICULTY_SETTINGS: Dict[str, Dict[str, dict]] = {
+    'minimax': {
+        'easy': {'temperature': 1000.0},
+        'medium': {'depth': 2, 'endgame_cells': 8},
+        'hard': {},
+        'expert': {'depth': 10, 'time_budget': 1.0},
+    },
+    'mcts': {
+        'easy': {'iterations': 200, 'time_budget': None},
+        'medium': {'iterations': 1000, 'time_budget': None},
+        'hard': {},
+        'expert': {'iterations': 100000, 'time_budget': 1.0},
+    },
+}
+
+
+class Engine(ABC):
+    """Interface of an AI engine."""
+
+    name = ''
+
+    # Whether moves are worth searching in advance on the worker pool (app.services.ponder)
+    ponderable = True
+
+    @abstractmethod
+    def choose_move(self, board: List[List[int]], player: int, game_id: Optional[int] = None,
+                    stats: Optional[ai.SearchStats] = None) -> int:
+        """Choose a column to play.
+
+        Args:
+            board: Current game board
+            player: Player to move (1 or 2)
+            game_id: Game the move is for, so per-game state can be reused
+            stats: Optional minimax instrumentation
+
+        Returns:
+            Column number to play
+        """
+
+    def release(self, game_id: int) -> None:
+        """Drop per-game state once a game is over."""
+
+
+class MinimaxEngine(Engine):
+    """Heuristic alpha-beta search with an exact endgame (app.services.ai).
+
+    With a temperature the engine does not search and plays random moves
+    weighted by their evaluation instead (ai.get_weighted_move).
+    """
+
+    name = 'minimax'
+
+    def __init__(self, depth: int = ai.DEFAULT_DEPTH, time_budget: Optional[float] = None,
+                 window_scores: Tuple[int, ...] = evaluation.WINDOW_SCORES,
+                 endgame_cells: int = endgame.DEFAULT_EMPTY_CELLS, use_cache: bool = True,
+                 temperature: Optional[float] = None, spec: BoardSpec = STANDARD):
+        self.depth = depth
+        self.time_budget = time_budget
+        self.window_scores = tuple(window_scores)
+        self.endgame_cells = endgame_cells
+        self.use_cache = use_cache
+        self.temperature = temperature
+        self.spec = spec
+
+    @property
+    def ponderable(self) -> bool:
+        """Random-weighted moves cost less than sending them to a worker."""
+        return self.temperature is None
+
+    def choose_move(self, board, player, game_id=None, stats=None) -> int:
+        if self.temperature is not None:
+            return ai.get_weighted_move(board, player, self.temperature, self.window_scores,
+                                        spec=self.spec)
+        return ai.get_ai_move(board, player, stats=stats, depth=self.depth,
+                              time_budget=self.time_budget, window_scores=self.window_scores,
+                              endgame_cells=self.endgame_cells,
+                              cache=ai.move_cache if self.use_cache else None, spec=self.spec)
+
+
+class MCTSEngine(Engine):
+    """Monte Carlo Tree Search with random playouts (app.services.mcts)."""
+
+    name = 'mcts'
+
+    def __init__(self, iterations: int = mcts.DEFAULT_ITERATIONS, time_budget: Optional[float] = None,
+                 exploration: float = mcts.DEFAULT_EXPLORATION, workers: int = 1,
+                 reuse_tree: bool = True, spec: BoardSpec = STANDARD):
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.workers = workers
+        self.reuse_tree = reuse_tree
+        self.spec = spec
+
+    @property
+    def ponderable(self) -> bool:
+        """Root-parallel search already occupies the worker pool."""
+        return self.workers == 1
+
+    def choose_move(self, board, player, game_id=None, stats=None) -> int:
+        col, _ = mcts.search(board, self.iterations, self.time_budget, self.exploration,
+                             self.workers, game_id if self.reuse_tree else None, spec=self.spec)
+        return col
+
+    def release(self, game_id: int) -> None:
+        mcts.release(game_id)
+
+
+ENGINES: Dict[str, Type[Engine]] = {
+    MinimaxEngine.name: MinimaxEngine,
+    MCTSEngine.name: MCTSEngine,
+}
+
+
+def get_engine(name: str, **settings) -> Engine:
+    """Create an engine by name.
+
+    Args:
+        name: Engine name, a key of ENGINES
+        **settings: Engine constructor arguments
+
+    Returns:
+        Engine instance
+
+    Raises:
+        ValueError: If the engine name is unknown
+    """
+    try:
+        engine_class = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown AI engine '{name}'")
+    return engine_class(**settings)
+
+
+def cap_difficulty(difficulty: str, maximum: Optional[str]) -> str:
+    """Lower a difficulty to a maximum level.
+
+    Args:
+        difficulty: Requested difficulty
+        maximum: Highest level allowed, None for no cap
+
+    Returns:
+        The lower of the two levels
+    """
+    if maximum is None or DIFFICULTIES.index(difficulty) <= DIFFICULTIES.index(maximum):
+        return difficulty
+    return maximum
+
+
+def engine_from_config(name: str, config, difficulty: str = DEFAULT_DIFFICULTY,
+                       spec: BoardSpec = STANDARD) -> Engine:
+    """Create an engine by name with the settings of the application config.
+
+    Args:
+        name: Engine name
+        config: Flask config mapping
+        difficulty: Difficulty level, lowered to AI_MAX_DIFFICULTY
+        spec: Board spec of the game
+
+    Returns:
+        Engine instance
+
+    Raises:
+        ValueError: If the engine name or difficulty is unknown
+    """
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"Unknown AI difficulty '{difficulty}'")
+    difficulty = cap_difficulty(difficulty, config.get('AI_MAX_DIFFICULTY'))
+
+    if name == MCTSEngine.name:
+        settings = {
+            'iterations': config.get('MCTS_ITERATIONS', mcts.DEFAULT_ITERATIONS),
+            'time_budget': config.get('MCTS_TIME_BUDGET'),
+            'workers': config.get('MCTS_WORKERS', 1),
+        }
+    else:
+        settings = {'endgame_cells': config.get('AI_ENDGAME_EMPTY_CELLS', endgame.DEFAULT_EMPTY_CELLS)}
+    settings.update(DIFFICULTY_SETTINGS.get(name, {}).get(difficulty, {}))
+    settings['spec'] = spec
+    return get_engine(name, **settings)
+
+
+def release_game(game_id: int) -> None:
+    """Drop the per-game state every engine keeps for a finished game."""
+    for engine_class in ENGINES.values():
+        engine_class().release(game_id)
@@ -0,0 +1,477 @@
+"""Heuristic board evaluation over precomputed winning windows.
+
+A 6x7 board has 69 windows of four cells that can hold a win. They are
+precomputed once as flat cell indices and bitmasks, so an evaluation scores
+every window exactly once from its counts of own, opponent and empty cells
+instead of re-counting runs from every occupied cell.
+
+Windows with three pieces of one player and an empty cell make that cell a
+threat. Threats are scored with Allis' zugzwang rules: with rows numbered
+1-6 from the bottom, the first player profits from threats on odd rows and
+the second player from threats on even rows, and a threat above one of the
+opponent's in the same column is dead because the lower one decides the
+column first. Immediate threats (playable now) and double threats (two at
+once, or two stacked in a column) are forced wins within three plies and
+are scored as such.
+
+Other board specs (see board_spec) get their own windows and masks from
+tables(), built on first use. Cells are numbered row-major,
+`index = row * cols + col`, with row 0 at the top.
+"""
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+from app.services.board_spec import STANDARD, BoardSpec, line_table
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+WIN_SCORE = 100000
+IMMEDIATE_WIN_SCORE = 5000
+
+# Score of a forced win found from threats, below WIN_SCORE so real wins come first
+THREAT_WIN_SCORE = 50000
+
+# Score of a live threat on the player's own row parity, and on the other parity
+PARITY_THREAT_SCORE = 400
+OTHER_THREAT_SCORE = 100
+
+# Score of a window holding 0-3 pieces of one player and none of the other
+WINDOW_SCORES = (0, 1, 10, 1000)
+
+# Bonus per piece in the center column and in the columns next to it
+CENTER_COLUMN_BONUS = 3
+CENTER_COLUMNS_BONUS = 1
+
+
+class EvaluationTables(NamedTuple):
+    """Bitmasks of one board spec over flat cell indices."""
+
+    spec: BoardSpec
+    window_masks: Tuple[int, ...]
+    top_row_mask: int
+    bottom_row_mask: int
+    board_mask: int
+    parity_masks: Dict[int, int]  # Player -> rows whose threats profit the player
+    center_column_mask: int
+    center_columns_mask: int
+
+
+@lru_cache(maxsize=None)
+def tables(spec: BoardSpec) -> EvaluationTables:
+    """Build the evaluation bitmasks of a spec, once per spec.
+
+    Allis' parity rules assume an even number of rows; with an odd number
+    no parity is favored and every live threat scores OTHER_THREAT_SCORE.
+    """
+    rows, cols, _ = spec
+    top_row_mask = (1 << cols) - 1
+    board_mask = (1 << (rows * cols)) - 1
+    # Rows 1, 3, 5... counted from the bottom (odd threats) and 2, 4, 6... (even threats)
+    odd_rows_mask = sum(top_row_mask << (row * cols) for row in range(rows) if (rows - row) % 2)
+    if rows % 2 == 0:
+        parity_masks = {1: odd_rows_mask, 2: board_mask & ~odd_rows_mask}
+    else:
+        parity_masks = {1: 0, 2: 0}
+
+    def columns_mask(max_distance: int) -> int:
+        # Columns whose doubled distance from the center is at most max_distance
+        return sum(1 << (row * cols + col) for row in range(rows) for col in range(cols)
+                   if abs(2 * col - (cols - 1)) <= max_distance)
+
+    return EvaluationTables(
+        spec=spec,
+        window_masks=line_table(spec).masks,
+        top_row_mask=top_row_mask,
+        bottom_row_mask=top_row_mask << ((rows - 1) * cols),
+        board_mask=board_mask,
+        parity_masks=parity_masks,
+        center_column_mask=columns_mask(1),
+        center_columns_mask=columns_mask(3),
+    )
+
+
+def count_scores(window_scores: Tuple[int, ...], connect: int) -> Tuple[int, ...]:
+    """Window scores by piece count for a win length.
+
+    window_scores are given for four in a row; for other lengths a window
+    scores as the four-in-a-row window the same number of pieces short of
+    a win.
+    """
+    missing = connect - len(window_scores)
+    if missing == 0:
+        return tuple(window_scores)
+    if missing > 0:
+        return (0,) * missing + tuple(window_scores)
+    return (0,) + tuple(window_scores[1 - connect:])
+
+
+# The standard 6x7 board
+ROWS, COLUMNS, CONNECT = STANDARD
+WINDOWS: List[Tuple[int, ...]] = list(line_table(STANDARD).lines)
+WINDOW_MASKS: List[int] = list(line_table(STANDARD).masks)
+_standard = tables(STANDARD)
+TOP_ROW_MASK = _standard.top_row_mask
+BOTTOM_ROW_START = (ROWS - 1) * COLUMNS
+BOTTOM_ROW_MASK = _standard.bottom_row_mask
+BOARD_MASK = _standard.board_mask
+ODD_ROWS_MASK = _standard.parity_masks[1]
+EVEN_ROWS_MASK = _standard.parity_masks[2]
+PARITY_MASKS = _standard.parity_masks
+CENTER_COLUMN_MASK = _standard.center_column_mask
+CENTER_COLUMNS_MASK = _standard.center_columns_mask
+
+
+def to_bitboards(board: List[List[int]], player: int) -> Tuple[int, int]:
+    """Convert a board to (player, opponent) bitboards over flat cell indices.
+
+    Args:
+        board: Game board
+        player: Player whose pieces go in the first bitboard
+
+    Returns:
+        Tuple of (player bits, opponent bits)
+    """
+    own = 0
+    opponent = 0
+    bit = 1
+    for row in board:
+        for cell in row:
+            if cell == player:
+                own |= bit
+            elif cell:
+                opponent |= bit
+            bit <<= 1
+    return own, opponent
+
+
+def evaluate(board: List[List[int]], player: int,
+             window_scores: Tuple[int, ...] = WINDOW_SCORES,
+             spec: BoardSpec = STANDARD) -> float:
+    """Evaluate a board from a player's perspective.
+
+    Every window is scored once: windows holding pieces of both players are
+    dead, the others score window_scores[count] for the player owning them.
+    Windows one piece short of a win add their empty cell to the player's
+    threats, scored by score_threats(). Center pieces earn a small bonus.
+
+    Args:
+        board: Game board
+        player: Player to evaluate for (1 or 2)
+        window_scores: Scores of windows holding 0-3 pieces of one player
+            (see count_scores() for other win lengths)
+        spec: Board spec of the board
+
+    Returns:
+        Evaluation score (positive = good for player, negative = good for opponent)
+    """
+    spec_tables = tables(spec)
+    connect = spec.connect
+    if len(window_scores) != connect:
+        window_scores = count_scores(window_scores, connect)
+    own, opponent = to_bitboards(board, player)
+    occupied = own | opponent
+
+    score = 0.0
+    own_threats = 0
+    opponent_threats = 0
+    for mask in spec_tables.window_masks:
+        own_count = (own & mask).bit_count()
+        opponent_count = (opponent & mask).bit_count()
+        if own_count and opponent_count:
+            continue
+        if own_count:
+            if own_count == connect:
+                return WIN_SCORE
+            score += window_scores[own_count]
+            if own_count == connect - 1:
+                own_threats |= mask & ~own
+        elif opponent_count:
+            if opponent_count == connect:
+                return -WIN_SCORE
+            score -= window_scores[opponent_count]
+            if opponent_count == connect - 1:
+                opponent_threats |= mask & ~opponent
+
+    top_row_mask = spec_tables.top_row_mask
+    if occupied & top_row_mask == top_row_mask:
+        return 0  # Draw
+
+    center_column_mask = spec_tables.center_column_mask
+    center_columns_mask = spec_tables.center_columns_mask
+    score += CENTER_COLUMN_BONUS * ((own & center_column_mask).bit_count()
+                                    - (opponent & center_column_mask).bit_count())
+    score += CENTER_COLUMNS_BONUS * ((own & center_columns_mask).bit_count()
+                                     - (opponent & center_columns_mask).bit_count())
+
+    threat_score = score_threats(own_threats, opponent_threats, occupied, player, spec)
+    if abs(threat_score) >= THREAT_WIN_SCORE:
+        return threat_score
+    return score + threat_score
+
+
+def _landing_cells(occupied: int, spec_tables: EvaluationTables) -> int:
+    """Bitmask of the empty cells a piece can be dropped into."""
+    return (~occupied & ((occupied >> spec_tables.spec.cols) | spec_tables.bottom_row_mask)
+            & spec_tables.board_mask)
+
+
+def _above(cells: int, spec: BoardSpec) -> int:
+    """Bitmask of the cells above any of the given cells in their columns."""
+    above = cells >> spec.cols
+    shift = spec.cols
+    while shift < spec.cells:
+        above |= above >> shift
+        shift *= 2
+    return above
+
+
+def score_threats(own_threats: int, opponent_threats: int, occupied: int, player: int,
+                  spec: BoardSpec = STANDARD) -> float:
+    """Score the threat cells of both players.
+
+    The side to move follows from the number of pieces. If it has an
+    immediate threat it wins; otherwise the other side wins if it has two
+    immediate threats, or one with another threat directly above it. A
+    single immediate threat of the side not to move scores
+    IMMEDIATE_WIN_SCORE. Other threats count if no opponent threat lies
+    below them in their column, PARITY_THREAT_SCORE on the player's own row
+    parity and OTHER_THREAT_SCORE on the other.
+
+    Args:
+        own_threats: Bitmask of the player's threat cells
+        opponent_threats: Bitmask of the opponent's threat cells
+        occupied: Bitmask of all pieces
+        player: Player the score is for (1 or 2)
+        spec: Board spec
+
+    Returns:
+        Score from the player's perspective; +-THREAT_WIN_SCORE for a forced win
+    """
+    spec_tables = tables(spec)
+    cols = spec.cols
+    landing = _landing_cells(occupied, spec_tables)
+    own_immediate = own_threats & landing
+    opponent_immediate = opponent_threats & landing
+
+    own_to_move = (occupied.bit_count() % 2 == 0) == (player == 1)
+    if own_to_move:
+        if own_immediate:
+            return THREAT_WIN_SCORE
+        if (opponent_immediate.bit_count() > 1
+                or opponent_immediate & (opponent_threats << cols)):
+            return -THREAT_WIN_SCORE
+        score = -IMMEDIATE_WIN_SCORE if opponent_immediate else 0
+    else:
+        if opponent_immediate:
+            return -THREAT_WIN_SCORE
+        if own_immediate.bit_count() > 1 or own_immediate & (own_threats << cols):
+            return THREAT_WIN_SCORE
+        score = IMMEDIATE_WIN_SCORE if own_immediate else 0
+
+    # Zugzwang: the lowest threat of a column decides it, on the owner's parity it is strong
+    own_live = own_threats & ~landing & ~_above(opponent_threats, spec)
+    opponent_live = opponent_threats & ~landing & ~_above(own_threats, spec)
+    own_parity = spec_tables.parity_masks[player]
+    opponent_parity = spec_tables.parity_masks[3 - player]
+    score += (PARITY_THREAT_SCORE * (own_live & own_parity).bit_count()
+              + OTHER_THREAT_SCORE * (own_live & ~own_parity).bit_count())
+    score -= (PARITY_THREAT_SCORE * (opponent_live & opponent_parity).bit_count()
+              + OTHER_THREAT_SCORE * (opponent_live & ~opponent_parity).bit_count())
+    return score
+
+
+def threat_cells(own: int, opponent: int, spec: BoardSpec = STANDARD) -> int:
+    """Bitmask of the empty cells that would complete a line for the owner of `own`."""
+    cells = 0
+    for mask in tables(spec).window_masks:
+        if (own & mask).bit_count() == spec.connect - 1 and not opponent & mask:
+            cells |= mask & ~own
+    return cells
+
+
+def analyze_threats(board: List[List[int]], spec: BoardSpec = STANDARD) -> dict:
+    """Report the threats of both players.
+
+    Args:
+        board: Game board
+        spec: Board spec of the board
+
+    Returns:
+        Dictionary keyed by player number, each with its threat cells (row,
+        column, parity and whether no opponent threat lies below), the
+        numbers of odd and even threats, the columns of immediate threats
+        and whether it has a double threat (two immediate threats, or one
+        with another threat directly above)
+    """
+    spec_tables = tables(spec)
+    cols = spec.cols
+    first, second = to_bitboards(board, 1)
+    occupied = first | second
+    landing = _landing_cells(occupied, spec_tables)
+    odd_rows_mask = sum(((1 << cols) - 1) << (row * cols)
+                        for row in range(spec.rows) if (spec.rows - row) % 2)
+    cells = {1: threat_cells(first, second, spec), 2: threat_cells(second, first, spec)}
+    report = {}
+    for player in (1, 2):
+        threats = cells[player]
+        dead = _above(cells[3 - player], spec)
+        immediate = threats & landing
+        report[player] = {
+            'threats': [{'row': cell // cols, 'col': cell % cols,
+                         'parity': 'odd' if odd_rows_mask >> cell & 1 else 'even',
+                         'live': not dead >> cell & 1}
+                        for cell in range(spec.cells) if threats >> cell & 1],
+            'odd': (threats & odd_rows_mask).bit_count(),
+            'even': (threats & ~odd_rows_mask).bit_count(),
+            'immediate': sorted(cell % cols for cell in range(spec.cells) if immediate >> cell & 1),
+            'double': bool(immediate.bit_count() > 1 or immediate & (threats << cols)),
+        }
+    return report
+
+
+def winning_columns(board: List[List[int]], player: int, spec: BoardSpec = STANDARD) -> List[int]:
+    """Columns where the player completes a line with the next piece.
+
+    Args:
+        board: Game board
+        player: Player number (1 or 2)
+        spec: Board spec of the board
+
+    Returns:
+        Sorted list of winning columns
+    """
+    own, opponent = to_bitboards(board, player)
+    immediate = threat_cells(own, opponent, spec) & _landing_cells(own | opponent, tables(spec))
+    return sorted({cell % spec.cols for cell in range(spec.cells) if immediate >> cell & 1})
+
+
+class BatchTables(NamedTuple):
+    """NumPy arrays of one board spec over flat cell indices, for evaluate_batch."""
+
+    window_index: "np.ndarray"  # (windows, connect) cells of every window
+    slot_cells: "np.ndarray"  # (windows * connect, cells) one-hot cell of every window slot
+    parity: Dict[int, "np.ndarray"]  # Player -> (cells,) rows whose threats profit the player
+    center_weights: "np.ndarray"  # (cells,) center bonus of a piece on each cell
+
+
+@lru_cache(maxsize=None)
+def batch_tables(spec: BoardSpec) -> BatchTables:
+    """Build the evaluate_batch arrays of a spec, once per spec.
+
+    Raises:
+        RuntimeError: If NumPy is not installed
+    """
+    if np is None:
+        raise RuntimeError('evaluate_batch requires NumPy')
+    spec_tables = tables(spec)
+    cells = range(spec.cells)
+    window_index = np.array(line_table(spec).lines, dtype=np.intp)
+    return BatchTables(
+        window_index=window_index,
+        # float32 so the threat projection is a BLAS matrix product
+        slot_cells=np.eye(spec.cells, dtype=np.float32)[window_index.reshape(-1)],
+        parity={player: np.array([bool(mask >> cell & 1) for cell in cells])
+                for player, mask in spec_tables.parity_masks.items()},
+        center_weights=np.array(
+            [CENTER_COLUMN_BONUS * (spec_tables.center_column_mask >> cell & 1)
+             + CENTER_COLUMNS_BONUS * (spec_tables.center_columns_mask >> cell & 1)
+             for cell in cells], dtype=np.float64),
+    )
+
+
+def evaluate_batch(boards, player: int, window_scores: Tuple[int, ...] = WINDOW_SCORES,
+                   spec: BoardSpec = STANDARD):
+    """Evaluate many boards of one spec in one vectorized call.
+
+    Gives the same scores as evaluate() for every board.
+
+    Args:
+        boards: Array-like of shape (N, rows, cols) with cell values 0, 1, 2
+        player: Player to evaluate for (1 or 2)
+        window_scores: Scores of windows holding 0-3 pieces of one player
+            (see count_scores() for other win lengths)
+        spec: Board spec of the boards
+
+    Returns:
+        NumPy array of N scores
+
+    Raises:
+        RuntimeError: If NumPy is not installed
+    """
+    arrays = batch_tables(spec)
+    rows, cols, connect = spec
+    if len(window_scores) != connect:
+        window_scores = count_scores(window_scores, connect)
+
+    flat = np.asarray(boards, dtype=np.int8).reshape(-1, spec.cells)
+    count = flat.shape[0]
+    opponent = 3 - player
+    own_cells = flat == player
+    opponent_cells = flat == opponent
+    empty_cells = flat == 0
+
+    own = own_cells[:, arrays.window_index].sum(axis=2)  # (N, windows)
+    opp = opponent_cells[:, arrays.window_index].sum(axis=2)
+
+    table = np.zeros((connect + 1, connect + 1), dtype=np.float64)
+    for n in range(1, connect):
+        table[n, 0] = window_scores[n]
+        table[0, n] = -window_scores[n]
+    scores = table[own, opp].sum(axis=1)
+
+    scores += (own_cells.astype(np.float64) - opponent_cells) @ arrays.center_weights
+
+    # Threat cells: the empty cell of a window one piece short of a win for one player
+    empty_windows = empty_cells[:, arrays.window_index]  # (N, windows, connect)
+    own_slots = ((own == connect - 1) & (opp == 0))[:, :, None] & empty_windows
+    opp_slots = ((opp == connect - 1) & (own == 0))[:, :, None] & empty_windows
+    own_threats = own_slots.reshape(count, -1).astype(np.float32) @ arrays.slot_cells > 0  # (N, cells)
+    opp_threats = opp_slots.reshape(count, -1).astype(np.float32) @ arrays.slot_cells > 0
+
+    # Landing cells: empty with the bottom edge or a piece directly below
+    landing = empty_cells.copy()
+    landing[:, :(rows - 1) * cols] &= ~empty_cells[:, cols:]
+    own_immediate = own_threats & landing
+    opp_immediate = opp_threats & landing
+    own_stacked = (own_immediate[:, cols:] & own_threats[:, :-cols]).any(axis=1)
+    opp_stacked = (opp_immediate[:, cols:] & opp_threats[:, :-cols]).any(axis=1)
+    own_immediate_count = own_immediate.sum(axis=1)
+    opp_immediate_count = opp_immediate.sum(axis=1)
+
+    own_to_move = ((~empty_cells).sum(axis=1) % 2 == 0) == (player == 1)
+    own_forced = np.where(own_to_move, own_immediate_count > 0,
+                          (opp_immediate_count == 0) & ((own_immediate_count > 1) | own_stacked))
+    opp_forced = ~own_forced & np.where(~own_to_move, opp_immediate_count > 0,
+                                        (opp_immediate_count > 1) | opp_stacked)
+    scores += IMMEDIATE_WIN_SCORE * np.where(own_to_move, -(opp_immediate_count > 0).astype(np.int64),
+                                             own_immediate_count > 0)
+
+    # Live threats: no opponent threat below them in the column
+    def above(threats):
+        shape = threats.reshape(count, rows, cols)
+        at_or_below = np.logical_or.accumulate(shape[:, ::-1], axis=1)[:, ::-1]
+        result = np.zeros_like(shape)
+        result[:, :-1] = at_or_below[:, 1:]
+        return result.reshape(count, -1)
+
+    own_live = own_threats & ~landing & ~above(opp_threats)
+    opp_live = opp_threats & ~landing & ~above(own_threats)
+    own_parity = arrays.parity[player]
+    opp_parity = arrays.parity[opponent]
+    scores += (PARITY_THREAT_SCORE * (own_live & own_parity).sum(axis=1)
+               + OTHER_THREAT_SCORE * (own_live & ~own_parity).sum(axis=1))
+    scores -= (PARITY_THREAT_SCORE * (opp_live & opp_parity).sum(axis=1)
+               + OTHER_THREAT_SCORE * (opp_live & ~opp_parity).sum(axis=1))
+    scores[own_forced] = THREAT_WIN_SCORE
+    scores[opp_forced] = -THREAT_WIN_SCORE
+
+    # Terminal states override the heuristic, a win before a full board
+    full = ~empty_cells[:, :cols].any(axis=1)
+    scores[full] = 0
+    own_won = (own == connect).any(axis=1)
+    opp_won = (opp == connect).any(axis=1)
+    scores[opp_won] = -WIN_SCORE
+    scores[own_won] = WIN_SCORE
+    return scores
@@ -0,0 +1,284 @@
+"""Append-only game event log with periodic snapshots.
+
+Every change of a game appends one small row to game_events: 'created'
+with the game's settings, 'move' with the player and column, 'resign' and
+'timeout' with the player who lost, and 'finished' with the result. Events
+of a game are numbered by `seq`, and Game.seq holds the last one. Every
+`interval` events, and when a game ends, a compact snapshot of the state
+(packed board and move string) is written as well, and the games row's
+board_state is brought up to date at the same time; in between, moves only
+append to Game.moves and Game.board replays them.
+
+load_state() rebuilds a game from its latest snapshot and the events after
+it. project_games() rewrites games rows from the log in bulk. It walks the
+games in batches by id, so memory holds one batch of states and events.
+"""
+import json
+from typing import Iterator, List, Optional
+from sqlalchemy import and_, bindparam, func, or_, select, update
+from app.extensions import db
+from app.models import Game, GameEvent, GameSnapshot
+from app.services import resume
+from app.services.board_spec import STANDARD, BoardSpec, winner_at
+from app.services.game_logic import create_board, drop_piece, is_draw, pack_board, unpack_board
+
+# Events between two snapshots of a game
+DEFAULT_SNAPSHOT_INTERVAL = 16
+
+# Games rebuilt per transaction by project_games
+PROJECT_BATCH_SIZE = 1000
+
+_COMPACT_JSON = (',', ':')
+
+
+class GameState:
+    """Play state of a game rebuilt from its log."""
+
+    __slots__ = ('game_id', 'seq', 'spec', 'board', 'moves', 'current_player', 'status', 'winner')
+
+    def __init__(self, game_id: int, spec: BoardSpec = STANDARD):
+        self.game_id = game_id
+        self.seq = 0
+        self.spec = spec
+        self.board = create_board(spec)
+        self.moves = ''
+        self.current_player = 1
+        self.status = 'playing'
+        self.winner = None
+
+    @classmethod
+    def from_snapshot(cls, snapshot: GameSnapshot) -> 'GameState':
+        """State stored in a snapshot."""
+        state = cls(snapshot.game_id, BoardSpec(snapshot.rows, snapshot.cols, snapshot.connect))
+        state.seq = snapshot.seq
+        state.board = unpack_board(snapshot.board, snapshot.cols)
+        state.moves = snapshot.moves
+        state.current_player = snapshot.current_player
+        state.status = snapshot.status
+        state.winner = snapshot.winner
+        return state
+
+    def apply(self, seq: int, event_type: str, player: Optional[int] = None,
+              column: Optional[int] = None, data: Optional[str] = None) -> None:
+        """Apply the next event of the game.
+
+        Args:
+            seq: Sequence number of the event
+            event_type: One of GameEvent.TYPES
+            player: Player of 'move', 'resign' and 'timeout' events
+            column: Column of 'move' events
+            data: JSON details of 'created' and 'finished' events
+
+        Raises:
+            ValueError: If the event does not follow the state or cannot be applied
+        """
+        if seq != self.seq + 1:
+            raise ValueError(f'Game {self.game_id}: event {seq} does not follow event {self.seq}')
+        if event_type == 'created':
+            details = json.loads(data) if data else {}
+            self.spec = BoardSpec(details.get('rows', STANDARD.rows), details.get('cols', STANDARD.cols),
+                                  details.get('connect', STANDARD.connect))
+            self.board = create_board(self.spec)
+            self.status = details.get('status', 'playing')
+        elif event_type == 'move':
+            _, row = drop_piece(self.board, column, player)
+            self.moves += str(column)
+            winner = winner_at(self.board, row, column, self.spec.connect)
+            if winner:
+                self.status = 'finished'
+                self.winner = winner
+            elif is_draw(self.board):
+                self.status = 'draw'
+            else:
+                self.current_player = 3 - player
+        elif event_type in ('resign', 'timeout'):
+            self.status = 'finished'
+            self.winner = 3 - player
+        elif event_type == 'finished':
+            details = json.loads(data) if data else {}
+            self.status = details.get('status', self.status)
+            self.winner = details.get('winner', self.winner)
+        else:
+            raise ValueError(f"Game {self.game_id}: unknown event type '{event_type}'")
+        self.seq = seq
+
+    def to_row(self) -> dict:
+        """Column values of the games row."""
+        return {
+            'board_state': json.dumps(self.board),
+            'board_moves': len(self.moves),
+            'moves': self.moves,
+            'current_player': self.current_player,
+            'status': self.status,
+            'winner': self.winner,
+            'rows': self.spec.rows,
+            'cols': self.spec.cols,
+            'connect': self.spec.connect,
+            'seq': self.seq,
+        }
+
+
+def _details(game: Game, event_type: str) -> Optional[dict]:
+    """Details logged with 'created' and 'finished' events."""
+    if event_type == 'created':
+        return {
+            'game_mode': game.game_mode,
+            'status': game.status,
+            'owner_id': game.owner_id,
+            'ai_engine': game.ai_engine if game.game_mode == 'ai' else None,
+            'difficulty': game.difficulty if game.game_mode == 'ai' else None,
+            **game.spec.to_dict(),
+        }
+    if event_type == 'finished':
+        return {'status': game.status, 'winner': game.winner}
+    return None
+
+
+def record(game: Game, event_type: str, board: List[List[int]], player: Optional[int] = None,
+           column: Optional[int] = None,
+           interval: int = DEFAULT_SNAPSHOT_INTERVAL) -> GameEvent:
+    """Append an event for a change already applied to a game row.
+
+    Adds the event, and a snapshot when one is due, to the session; the
+    caller commits them together with the game row. With a snapshot the
+    row's board_state is checkpointed as well. Once committed, the event
+    also reaches the resume buffer of app.services.resume.
+
+    Args:
+        game: Game after the change, with its id assigned (flushed)
+        event_type: One of GameEvent.TYPES
+        board: Game board after the change
+        player: Player of 'move', 'resign' and 'timeout' events
+        column: Column of 'move' events
+        interval: Events between two snapshots; games also snapshot when they end
+
+    Returns:
+        The appended event
+    """
+    game.seq = (game.seq or 0) + 1
+    details = _details(game, event_type)
+    event = GameEvent(game_id=game.id, seq=game.seq, type=event_type, player=player,
+                      column=column,
+                      data=json.dumps(details, separators=_COMPACT_JSON) if details else None)
+    db.session.add(event)
+    resume.stage(event, details)
+
+    # Games older than the log (no 'created' event) start from a snapshot of their first event
+    due = event_type != 'created' and (game.seq == 1 or game.seq % interval == 0)
+    if due or event_type == 'finished':
+        game.checkpoint_board(board)
+        spec = game.spec
+        db.session.add(GameSnapshot(
+            game_id=game.id, seq=game.seq, status=game.status,
+            current_player=game.current_player, winner=game.winner, moves=game.moves or '',
+            board=pack_board(board), rows=spec.rows, cols=spec.cols, connect=spec.connect,
+        ))
+    return event
+
+
+def _latest_snapshots(game_ids: List[int]):
+    """Subquery of the latest snapshot seq of each game."""
+    return (select(GameSnapshot.game_id, func.max(GameSnapshot.seq).label('seq'))
+            .where(GameSnapshot.game_id.in_(game_ids))
+            .group_by(GameSnapshot.game_id)
+            .subquery())
+
+
+def _replay(game_ids: List[int], chunk_size: int) -> Iterator[GameState]:
+    """Rebuild games from their latest snapshots and the events after them."""
+    latest = _latest_snapshots(game_ids)
+    snapshots = {
+        snapshot.game_id: snapshot
+        for snapshot in db.session.execute(
+            select(GameSnapshot).join(latest, and_(GameSnapshot.game_id == latest.c.game_id,
+                                                   GameSnapshot.seq == latest.c.seq))
+        ).scalars()
+    }
+    stmt = (select(GameEvent.game_id, GameEvent.seq, GameEvent.type, GameEvent.player,
+                   GameEvent.column, GameEvent.data)
+            .outerjoin(latest, latest.c.game_id == GameEvent.game_id)
+            .where(GameEvent.game_id.in_(game_ids),
+                   or_(latest.c.seq.is_(None), GameEvent.seq > latest.c.seq))
+            .order_by(GameEvent.game_id, GameEvent.seq)
+            .execution_options(yield_per=chunk_size))
+
+    state = None
+    for game_id, seq, event_type, player, column, data in db.session.execute(stmt):
+        if state is None or state.game_id != game_id:
+            if state is not None:
+                yield state
+                snapshots.pop(state.game_id, None)
+            snapshot = snapshots.get(game_id)
+            state = GameState.from_snapshot(snapshot) if snapshot else GameState(game_id)
+        state.apply(seq, event_type, player, column, data)
+    if state is not None:
+        yield state
+        snapshots.pop(state.game_id, None)
+    # Games whose latest snapshot has no events after it
+    for game_id in sorted(snapshots):
+        yield GameState.from_snapshot(snapshots[game_id])
+
+
+def load_state(game_id: int) -> Optional[GameState]:
+    """Rebuild a game from its latest snapshot and the events after it.
+
+    Args:
+        game_id: Game ID
+
+    Returns:
+        GameState, or None if nothing is logged for the game
+    """
+    return next(_replay([game_id], PROJECT_BATCH_SIZE), None)
+
+
+def project_games(batch_size: int = PROJECT_BATCH_SIZE, game_id: Optional[int] = None) -> dict:
+    """Rewrite games rows from the event log.
+
+    Games are rebuilt batch_size at a time in id order and written back with
+    one executemany UPDATE per batch, committed per batch. Only the play
+    state columns are written; updated_at is kept. Games without a row
+    (archived) are skipped.
+
+    Args:
+        batch_size: Games rebuilt and written per transaction
+        game_id: Only rebuild this game
+
+    Returns:
+        Dictionary with the numbers of games replayed and rows updated
+    """
+    table = Game.__table__
+    stmt = (update(table)
+            .where(table.c.id == bindparam('game_id'))
+            .values(updated_at=table.c.updated_at))
+    replayed = 0
+    updated = 0
+    last_id = 0
+
+    while True:
+        if game_id is not None:
+            game_ids = [game_id] if last_id < game_id else []
+        else:
+            game_ids = db.session.execute(
+                select(GameEvent.game_id).where(GameEvent.game_id > last_id)
+                .group_by(GameEvent.game_id).order_by(GameEvent.game_id).limit(batch_size)
+            ).scalars().all()
+        if not game_ids:
+            break
+
+        existing = set(db.session.execute(select(table.c.id).where(table.c.id.in_(game_ids))).scalars())
+        rows = []
+        for state in _replay(game_ids, batch_size * 64):
+            replayed += 1
+            if state.game_id in existing:
+                rows.append(dict(state.to_row(), game_id=state.game_id))
+        try:
+            if rows:
+                db.session.execute(stmt, rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        updated += len(rows)
+        last_id = game_ids[-1]
+
+    return {'games': replayed, 'updated': updated}
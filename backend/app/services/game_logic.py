@@ -1,14 +1,18 @@
 """Core game logic for Connect Four."""
 from typing import List, Tuple, Optional
+from app.services.board_spec import STANDARD, BoardSpec, line_table, spec_of
 
 
-def create_board() -> List[List[int]]:
-    """Create an empty 6x7 game board.
+def create_board(spec: BoardSpec = STANDARD) -> List[List[int]]:
+    """Create an empty game board.
+    
+    Args:
+        spec: Board dimensions (default: standard 6x7)
     
     Returns:
-        6x7 matrix initialized with zeros
+        rows x cols matrix initialized with zeros
     """
-    return [[0 for _ in range(7)] for _ in range(6)]
+    return [[0 for _ in range(spec.cols)] for _ in range(spec.rows)]
 
 
 def drop_piece(board: List[List[int]], column: int, player: int) -> Tuple[List[List[int]], int]:
@@ -16,7 +20,7 @@ def drop_piece(board: List[List[int]], column: int, player: int) -> Tuple[List[L
     
     Args:
         board: Current game board
-        column: Column number (0-6)
+        column: Column number (0 to columns - 1)
         player: Player number (1 or 2)
         
     Returns:
@@ -25,11 +29,11 @@ def drop_piece(board: List[List[int]], column: int, player: int) -> Tuple[List[L
     Raises:
         ValueError: If column is full or invalid
     """
-    if column < 0 or column > 6:
+    if column < 0 or column >= len(board[0]):
         raise ValueError('Invalid column number')
     
     # Find the lowest empty row in the column
-    for row in range(5, -1, -1):
+    for row in range(len(board) - 1, -1, -1):
         if board[row][column] == 0:
             board[row][column] = player
             return board, row
@@ -46,54 +50,31 @@ def get_valid_columns(board: List[List[int]]) -> List[int]:
     Returns:
         List of valid column numbers
     """
-    valid_columns = []
-    for col in range(7):
-        if board[0][col] == 0:  # Top row is empty
-            valid_columns.append(col)
-    return valid_columns
+    return [col for col, cell in enumerate(board[0]) if cell == 0]  # Top row is empty
 
 
-def check_winner(board: List[List[int]]) -> Optional[int]:
+def check_winner(board: List[List[int]], connect: int = STANDARD.connect) -> Optional[int]:
     """Check if there's a winner.
     
+    Scans the precomputed lines of the board's spec; after a move,
+    winner_at() checks only the lines through the cell played.
+    
     Args:
         board: Current game board
+        connect: Pieces in a row needed to win
         
     Returns:
         Player number (1 or 2) if winner found, None otherwise
     """
-    # Check horizontal
-    for row in range(6):
-        for col in range(4):  # 0-3 for 4-in-a-row
-            if board[row][col] != 0:
-                if (board[row][col] == board[row][col + 1] == 
-                    board[row][col + 2] == board[row][col + 3]):
-                    return board[row][col]
-    
-    # Check vertical
-    for row in range(3):  # 0-2 for 4-in-a-row
-        for col in range(7):
-            if board[row][col] != 0:
-                if (board[row][col] == board[row + 1][col] == 
-                    board[row + 2][col] == board[row + 3][col]):
-                    return board[row][col]
-    
-    # Check diagonal (top-left to bottom-right)
-    for row in range(3):
-        for col in range(4):
-            if board[row][col] != 0:
-                if (board[row][col] == board[row + 1][col + 1] == 
-                    board[row + 2][col + 2] == board[row + 3][col + 3]):
-                    return board[row][col]
-    
-    # Check diagonal (bottom-left to top-right)
-    for row in range(3, 6):
-        for col in range(4):
-            if board[row][col] != 0:
-                if (board[row][col] == board[row - 1][col + 1] == 
-                    board[row - 2][col + 2] == board[row - 3][col + 3]):
-                    return board[row][col]
-    
+    flat = sum(board, [])
+    for line in line_table(spec_of(board, connect)).lines:
+        player = flat[line[0]]
+        if player:
+            for cell in line:
+                if flat[cell] != player:
+                    break
+            else:
+                return player
     return None
 
 
@@ -106,7 +87,33 @@ def is_draw(board: List[List[int]]) -> bool:
     Returns:
         True if board is full, False otherwise
     """
-    return all(board[0][col] != 0 for col in range(7))
+    return all(cell != 0 for cell in board[0])
+
+
+def pack_board(board: List[List[int]]) -> str:
+    """Pack a board into a compact string with one digit per cell.
+    
+    Args:
+        board: Game board
+        
+    Returns:
+        Row-major string of cell values
+    """
+    return ''.join(str(cell) for row in board for cell in row)
+
+
+def unpack_board(packed: str, columns: int = STANDARD.cols) -> List[List[int]]:
+    """Unpack a board packed by pack_board.
+    
+    Args:
+        packed: Row-major string of cell values
+        columns: Number of columns in the board
+        
+    Returns:
+        Game board matrix
+    """
+    return [[int(cell) for cell in packed[row:row + columns]]
+            for row in range(0, len(packed), columns)]
 
 
 def evaluate_position(board: List[List[int]], player: int) -> int:
@@ -0,0 +1,241 @@
+"""Monte Carlo Tree Search (UCT) engine.
+
+Each iteration walks down the tree by the UCT rule, expands one untried
+move and finishes the game with random moves on the bitboards of
+app.services.canonical. The move visited most at the root is played.
+
+Trees are kept per game between moves: after choosing a move the engine
+stores the subtree below it, and the next search for that game starts from
+the grandchild matching the opponent's reply. Stored trees are evicted in
+least recently used order. With several workers the search runs root-parallel
+instead: independent trees in worker processes whose root visit counts are
+summed; those trees are not kept.
+"""
+import math
+import random
+import time
+from concurrent.futures import wait
+from typing import Dict, List, Optional, Tuple
+from app.services import workers as worker_pool
+from app.services.board_spec import STANDARD, BoardSpec
+from app.services.canonical import (
+    STANDARD_LAYOUT, BitboardLayout, is_winning_move, layout, to_bitboards,
+)
+from app.utils.cache import LRUCache
+
+DEFAULT_ITERATIONS = 4000
+
+# UCT exploration constant (sqrt 2 for results in [0, 1])
+DEFAULT_EXPLORATION = math.sqrt(2)
+
+# Games whose search trees are kept between moves
+TREE_CACHE_SIZE = 64
+
+# game_id -> (subtree root, current, mask, layout) of the position after the engine's move
+trees = LRUCache(TREE_CACHE_SIZE)
+
+
+class Node:
+    """Search tree node reached by `move`.
+
+    `wins` is counted for the player who played `move`.
+    """
+
+    __slots__ = ('move', 'parent', 'children', 'untried', 'visits', 'wins', 'terminal')
+
+    def __init__(self, move: Optional[int], parent: Optional['Node'], mask: int,
+                 terminal: Optional[float] = None, bits: BitboardLayout = STANDARD_LAYOUT):
+        self.move = move
+        self.parent = parent
+        self.children: List['Node'] = []
+        self.untried = [] if terminal is not None else [c for c, top in enumerate(bits.top_masks)
+                                                         if not mask & top]
+        self.visits = 0
+        self.wins = 0.0
+        # Result for the player who played `move` when the game ended with it
+        self.terminal = terminal
+
+    def select_child(self, exploration: float) -> 'Node':
+        """Child with the highest UCT value."""
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+
+def playout(current: int, mask: int, moves: int, rng: random.Random,
+            bits: BitboardLayout = STANDARD_LAYOUT) -> float:
+    """Finish a game with uniformly random moves.
+
+    Returns:
+        1.0 if the side to move at the start wins, 0.0 if it loses, 0.5 for a draw
+    """
+    cells = bits.cells
+    top_masks = bits.top_masks
+    bottom_masks = bits.bottom_masks
+    aligned = bits.aligned
+    mover = 0
+    playable = [c for c, top in enumerate(top_masks) if not mask & top]
+    while moves < cells:
+        col = rng.choice(playable)
+        mask_after = mask | (mask + bottom_masks[col])
+        if aligned(current | (mask_after ^ mask)):
+            return 1.0 if mover == 0 else 0.0
+        current, mask = current ^ mask, mask_after
+        moves += 1
+        mover ^= 1
+        if mask & top_masks[col]:
+            playable.remove(col)
+    return 0.5
+
+
+def run_iterations(root: Node, current: int, mask: int, moves: int, iterations: int,
+                   deadline: Optional[float], exploration: float, rng: random.Random,
+                   bits: BitboardLayout = STANDARD_LAYOUT) -> int:
+    """Grow a tree by iterations until the count or the deadline is reached.
+
+    At least one iteration is run, so the root of a position with a legal
+    move always has a child to choose.
+
+    Returns:
+        Number of iterations run
+    """
+    bottom_masks = bits.bottom_masks
+    iterations = max(1, iterations)
+    done = 0
+    while done < iterations and (not done or deadline is None or time.perf_counter() < deadline):
+        node = root
+        node_current, node_mask, node_moves = current, mask, moves
+
+        # Selection
+        while not node.untried and node.children and node.terminal is None:
+            node = node.select_child(exploration)
+            node_current = node_current ^ node_mask
+            node_mask = node_mask | (node_mask + bottom_masks[node.move])
+            node_moves += 1
+
+        # Expansion
+        if node.untried and node.terminal is None:
+            col = node.untried.pop(rng.randrange(len(node.untried)))
+            terminal = None
+            if is_winning_move(node_current, node_mask, col, bits):
+                terminal = 1.0
+            elif node_moves + 1 == bits.cells:
+                terminal = 0.5
+            node_current = node_current ^ node_mask
+            node_mask = node_mask | (node_mask + bottom_masks[col])
+            node_moves += 1
+            child = Node(col, node, node_mask, terminal, bits)
+            node.children.append(child)
+            node = child
+
+        # Simulation, as the result for the player who moved into `node`
+        if node.terminal is not None:
+            result = node.terminal
+        else:
+            result = 1.0 - playout(node_current, node_mask, node_moves, rng, bits)
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            node.wins += result
+            result = 1.0 - result
+            node = node.parent
+        done += 1
+    return done
+
+
+def _reuse_tree(game_id, current: int, mask: int, bits: BitboardLayout) -> Optional[Node]:
+    """Find the stored subtree of a game matching the current position."""
+    stored = trees.get(game_id)
+    if stored is None:
+        return None
+    node, stored_current, stored_mask, stored_bits = stored
+    if stored_bits != bits:
+        return None
+    for child in node.children:
+        if (stored_mask | (stored_mask + bits.bottom_masks[child.move]) == mask
+                and stored_current ^ stored_mask == current):
+            child.parent = None
+            return child
+    return None
+
+
+def _search_worker(current: int, mask: int, moves: int, iterations: int,
+                   time_budget: Optional[float], exploration: float, seed: int,
+                   spec: BoardSpec = STANDARD) -> Dict[int, int]:
+    """Worker entry point of root-parallel search: root visit counts of one fresh tree."""
+    bits = layout(spec)
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    root = Node(None, None, mask, bits=bits)
+    run_iterations(root, current, mask, moves, iterations, deadline, exploration,
+                   random.Random(seed), bits)
+    return {child.move: child.visits for child in root.children}
+
+
+def search(board: List[List[int]], iterations: int = DEFAULT_ITERATIONS,
+           time_budget: Optional[float] = None, exploration: float = DEFAULT_EXPLORATION,
+           workers: int = 1, game_id=None, seed: Optional[int] = None,
+           spec: BoardSpec = STANDARD) -> Tuple[int, dict]:
+    """Choose a move for the side to move.
+
+    Args:
+        board: Current game board
+        iterations: Iterations per search (per worker in root-parallel mode)
+        time_budget: Optional seconds per search; stops before the iteration count
+        exploration: UCT exploration constant
+        workers: Processes for root-parallel search; 1 searches in this process
+        game_id: Key of the tree kept between moves (in-process search only)
+        seed: Optional random seed
+        spec: Board spec of the board
+
+    Returns:
+        Tuple of (column, search info with iterations and root visit counts)
+
+    Raises:
+        ValueError: If no move is available
+    """
+    bits = layout(spec)
+    current, mask, moves = to_bitboards(board)
+    playable = [c for c, top in enumerate(bits.top_masks) if not mask & top]
+    if not playable:
+        raise ValueError('No valid moves available')
+    for col in playable:
+        if is_winning_move(current, mask, col, bits):
+            return col, {'iterations': 0, 'visits': {}, 'reused': 0}
+
+    rng = random.Random(seed)
+    if workers > 1:
+        pool = worker_pool.get_pool(workers)
+        futures = [pool.submit(_search_worker, current, mask, moves, iterations, time_budget,
+                               exploration, rng.getrandbits(32), spec)
+                   for _ in range(workers)]
+        wait(futures)
+        visits: Dict[int, int] = {}
+        for future in futures:
+            for col, count in future.result().items():
+                visits[col] = visits.get(col, 0) + count
+        best = max(visits, key=visits.get)
+        return best, {'iterations': sum(visits.values()), 'visits': visits, 'reused': 0}
+
+    root = _reuse_tree(game_id, current, mask, bits) if game_id is not None else None
+    reused = root.visits if root is not None else 0
+    if root is None:
+        root = Node(None, None, mask, bits=bits)
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    done = run_iterations(root, current, mask, moves, iterations, deadline, exploration, rng, bits)
+
+    best_child = max(root.children, key=lambda child: child.visits)
+    if game_id is not None:
+        best_child.parent = None  # Let the rest of the tree go
+        trees.put(game_id, (best_child, current ^ mask,
+                            mask | (mask + bits.bottom_masks[best_child.move]), bits))
+    return best_child.move, {
+        'iterations': done,
+        'visits': {child.move: child.visits for child in root.children},
+        'reused': reused,
+    }
+
+
+def release(game_id) -> None:
+    """Drop the stored tree of a game."""
+    trees.pop(game_id)
@@ -0,0 +1,161 @@
+"""Pondering: AI replies searched while the human player thinks.
+
+After the AI moves, start() submits one search per possible human reply to
+the shared worker pool. When the human's move arrives, take() returns the
+reply if its search has already finished, or None so the caller searches
+as usual; the request never waits on a pondering search.
+
+Each game gets a budget: searches that have not started within `budget`
+seconds are skipped, and results nobody asked for within `idle` seconds are
+dropped. A new move, the end of the game or release() cancels what is left.
+"""
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+from app.services import workers as worker_pool
+from app.services.board_spec import line_table, spec_of
+from app.services.engines import Engine
+from app.services.game_logic import drop_piece
+
+DEFAULT_BUDGET = 10.0
+DEFAULT_IDLE = 120.0
+DEFAULT_MAX_GAMES = 32
+
+
+class _Ponder:
+    """Searches started for one game position."""
+
+    __slots__ = ('moves', 'engine', 'futures', 'started')
+
+    def __init__(self, moves: str, engine: Engine, futures: Dict[int, Future]):
+        self.moves = moves
+        self.engine = engine
+        self.futures = futures
+        self.started = time.monotonic()
+
+    def cancel(self) -> None:
+        """Cancel searches that have not started; running ones finish unused."""
+        for future in self.futures.values():
+            future.cancel()
+
+
+# game_id -> searches of the position after the AI's last move
+_games: Dict[int, _Ponder] = {}
+_lock = threading.Lock()
+
+
+def _ponder_worker(engine: Engine, board: List[List[int]], player: int, deadline: float) -> Optional[int]:
+    """Worker entry point: the engine's reply, or None once the budget has run out."""
+    if time.time() > deadline:
+        return None
+    return engine.choose_move(board, player)
+
+
+def _same_engine(first: Engine, second: Engine) -> bool:
+    """Check if two engines search with the same settings."""
+    return type(first) is type(second) and vars(first) == vars(second)
+
+
+def start(game_id: int, board: List[List[int]], moves: str, engine: Engine, player: int = 2,
+          budget: float = DEFAULT_BUDGET, idle: float = DEFAULT_IDLE,
+          max_games: int = DEFAULT_MAX_GAMES) -> int:
+    """Start searching the AI's replies to every human move of a position.
+
+    Args:
+        game_id: Game ID
+        board: Board after the AI's move, human to move
+        moves: Move string of that board (Game.moves), to match the human's move against
+        engine: Engine that will choose the AI's replies
+        player: AI player number
+        budget: Seconds after which searches still queued are skipped
+        idle: Seconds after which unused results of any game are dropped
+        max_games: Games pondered at once; further games are not pondered
+
+    Returns:
+        Number of searches submitted
+    """
+    release(game_id)
+    expire(idle)
+    if not engine.ponderable or len(_games) >= max_games:
+        return 0
+
+    deadline = time.time() + budget
+    opponent = 3 - player
+    pool = worker_pool.get_pool()
+    futures = {}
+    try:
+        # Human replies pondered center out, the likeliest first under a tight budget
+        for col in line_table(spec_of(board)).center_order:
+            if board[0][col]:
+                continue
+            reply_board = [row[:] for row in board]
+            drop_piece(reply_board, col, opponent)
+            futures[col] = pool.submit(_ponder_worker, engine, reply_board, player, deadline)
+    except BrokenProcessPool:
+        worker_pool.reset_pool()
+        for future in futures.values():
+            future.cancel()
+        return 0
+    with _lock:
+        _games[game_id] = _Ponder(moves, engine, futures)
+    return len(futures)
+
+
+def take(game_id: int, moves: str, column: int, engine: Engine) -> Optional[int]:
+    """Return the pondered reply to a human move and drop the game's other searches.
+
+    Only a finished search is used. One still queued or running is
+    cancelled (a running one finishes unused) rather than waited for, so a
+    slow worker pool cannot hold up the request.
+
+    Args:
+        game_id: Game ID
+        moves: Move string before the human's move
+        column: Column the human played
+        engine: Engine the caller would search with
+
+    Returns:
+        AI column to play, or None if the reply has to be searched
+    """
+    with _lock:
+        pondered = _games.pop(game_id, None)
+    if pondered is None:
+        return None
+    future = pondered.futures.pop(column, None)
+    pondered.cancel()
+    if future is None or pondered.moves != moves or not _same_engine(pondered.engine, engine):
+        if future is not None:
+            future.cancel()
+        return None
+    if not future.done():
+        future.cancel()
+        return None
+    try:
+        return future.result()
+    except Exception:
+        # Skipped for the budget, cancelled, or the worker failed: search as if nothing was pondered
+        return None
+
+
+def release(game_id: int) -> None:
+    """Drop the searches of a game, e.g. once it is over."""
+    with _lock:
+        pondered = _games.pop(game_id, None)
+    if pondered is not None:
+        pondered.cancel()
+
+
+def expire(idle: float = DEFAULT_IDLE) -> None:
+    """Drop the searches of games that have not moved for `idle` seconds."""
+    now = time.monotonic()
+    with _lock:
+        stale = [game_id for game_id, pondered in _games.items() if now - pondered.started > idle]
+        for game_id in stale:
+            _games.pop(game_id).cancel()
+
+
+def pondering() -> int:
+    """Number of games with searches in progress or results waiting."""
+    return len(_games)
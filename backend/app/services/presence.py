@@ -0,0 +1,291 @@
+"""Presence of users in games and lobby rooms.
+
+The registry maps users to their connected sids and each Socket.IO room to
+the users in it. A user is in a room while at least one of their sids is,
+so a second tab closing does not count as leaving. Sids that have not sent a
+heartbeat for `ttl` seconds are expired by a background sweep, which also
+covers sids whose disconnect was never seen (a worker that died).
+
+State lives in a PresenceBackend. LocalPresenceBackend keeps it in process
+memory; deployments running several workers register a shared backend under
+a name with register_backend() and select it with PRESENCE_BACKEND.
+Changes are broadcast to the room as 'presence' events.
+"""
+import inspect
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional, Set, Type
+from flask import Flask
+from app.extensions import socketio
+from app.metrics import count_broadcast
+
+DEFAULT_TTL = 60.0
+DEFAULT_SWEEP_INTERVAL = 15.0
+
+
+class Departure(NamedTuple):
+    """What a sid took with it when it went away."""
+
+    user_id: int
+    rooms: List[str]  # Rooms the user is no longer in
+    offline: bool  # The user has no sid left
+
+
+class PresenceBackend(ABC):
+    """Storage of the presence registry.
+
+    Users are only tracked for sids registered with connect(); the other
+    methods ignore unknown sids.
+    """
+
+    @abstractmethod
+    def connect(self, sid: str, user_id: int, now: float) -> bool:
+        """Register a sid of a user; True if the user came online."""
+
+    @abstractmethod
+    def heartbeat(self, sid: str, now: float) -> bool:
+        """Mark a sid as alive; False if the sid is not registered."""
+
+    @abstractmethod
+    def join(self, sid: str, room: str) -> bool:
+        """Add a sid to a room; True if its user was not in the room yet."""
+
+    @abstractmethod
+    def leave(self, sid: str, room: str) -> bool:
+        """Remove a sid from a room; True if its user has left the room."""
+
+    @abstractmethod
+    def disconnect(self, sid: str) -> Optional[Departure]:
+        """Forget a sid; None if it was not registered."""
+
+    @abstractmethod
+    def expired(self, now: float, ttl: float) -> List[str]:
+        """Sids without a heartbeat for more than ttl seconds."""
+
+    @abstractmethod
+    def user_of(self, sid: str) -> Optional[int]:
+        """User of a registered sid."""
+
+    @abstractmethod
+    def is_online(self, user_id: int) -> bool:
+        """Check if a user has a registered sid."""
+
+    @abstractmethod
+    def is_present(self, room: str, user_id: int) -> bool:
+        """Check if a user has a sid in a room."""
+
+    @abstractmethod
+    def members(self, room: str) -> List[int]:
+        """Users in a room."""
+
+
+class LocalPresenceBackend(PresenceBackend):
+    """Presence registry in process memory, for a single worker and tests."""
+
+    name = 'local'
+
+    def __init__(self):
+        self._users: Dict[str, int] = {}  # sid -> user_id
+        self._seen: Dict[str, float] = {}  # sid -> last heartbeat
+        self._sids: Dict[int, Set[str]] = {}  # user_id -> sids
+        self._sid_rooms: Dict[str, Set[str]] = {}  # sid -> rooms
+        self._rooms: Dict[str, Dict[int, int]] = {}  # room -> user_id -> sids in the room
+
+    def connect(self, sid: str, user_id: int, now: float) -> bool:
+        self._users[sid] = user_id
+        self._seen[sid] = now
+        self._sid_rooms.setdefault(sid, set())
+        sids = self._sids.setdefault(user_id, set())
+        sids.add(sid)
+        return len(sids) == 1
+
+    def heartbeat(self, sid: str, now: float) -> bool:
+        if sid not in self._users:
+            return False
+        self._seen[sid] = now
+        return True
+
+    def join(self, sid: str, room: str) -> bool:
+        user_id = self._users.get(sid)
+        rooms = self._sid_rooms.get(sid)
+        if user_id is None or room in rooms:
+            return False
+        rooms.add(room)
+        members = self._rooms.setdefault(room, {})
+        members[user_id] = members.get(user_id, 0) + 1
+        return members[user_id] == 1
+
+    def leave(self, sid: str, room: str) -> bool:
+        user_id = self._users.get(sid)
+        rooms = self._sid_rooms.get(sid)
+        if user_id is None or room not in rooms:
+            return False
+        rooms.discard(room)
+        members = self._rooms[room]
+        members[user_id] -= 1
+        if members[user_id]:
+            return False
+        del members[user_id]
+        if not members:
+            del self._rooms[room]
+        return True
+
+    def disconnect(self, sid: str) -> Optional[Departure]:
+        user_id = self._users.get(sid)
+        if user_id is None:
+            return None
+        left = [room for room in list(self._sid_rooms[sid]) if self.leave(sid, room)]
+        del self._users[sid]
+        del self._seen[sid]
+        del self._sid_rooms[sid]
+        sids = self._sids[user_id]
+        sids.discard(sid)
+        if not sids:
+            del self._sids[user_id]
+        return Departure(user_id, left, not sids)
+
+    def expired(self, now: float, ttl: float) -> List[str]:
+        return [sid for sid, seen in self._seen.items() if now - seen > ttl]
+
+    def user_of(self, sid: str) -> Optional[int]:
+        return self._users.get(sid)
+
+    def is_online(self, user_id: int) -> bool:
+        return user_id in self._sids
+
+    def is_present(self, room: str, user_id: int) -> bool:
+        return user_id in self._rooms.get(room, ())
+
+    def members(self, room: str) -> List[int]:
+        return list(self._rooms.get(room, ()))
+
+
+BACKENDS: Dict[str, Type[PresenceBackend]] = {
+    LocalPresenceBackend.name: LocalPresenceBackend,
+}
+
+backend: PresenceBackend = LocalPresenceBackend()
+_ttl = DEFAULT_TTL
+_sweep_interval = DEFAULT_SWEEP_INTERVAL
+_sweeper = None
+
+
+def register_backend(name: str, backend_class: Type[PresenceBackend]) -> None:
+    """Make a presence backend selectable by name with PRESENCE_BACKEND.
+
+    Raises:
+        TypeError: If backend_class is not a concrete PresenceBackend subclass
+    """
+    if not (isinstance(backend_class, type) and issubclass(backend_class, PresenceBackend)):
+        raise TypeError(f'{backend_class!r} is not a PresenceBackend subclass')
+    if inspect.isabstract(backend_class):
+        raise TypeError(f'{backend_class.__name__} does not implement '
+                        f'{", ".join(sorted(backend_class.__abstractmethods__))}')
+    BACKENDS[name] = backend_class
+
+
+def game_room(game_id: int) -> str:
+    """Socket.IO room of a game's players."""
+    return f'game_{game_id}'
+
+
+def _announce(room: str, user_id: int, present: bool) -> None:
+    """Broadcast a user entering or leaving a room to the room."""
+    count_broadcast('presence', room)
+    socketio.emit('presence', {'room': room, 'user_id': user_id, 'present': present,
+                               'members': backend.members(room)}, room=room, namespace='/')
+
+
+def connect(sid: str, user_id: int) -> None:
+    """Register the sid of an authenticated connection."""
+    global _sweeper
+    backend.connect(sid, user_id, time.time())
+    if _sweeper is None:
+        _sweeper = socketio.start_background_task(_sweep)
+
+
+def heartbeat(sid: str) -> bool:
+    """Keep a sid alive; False if it is not registered (expired or anonymous)."""
+    return backend.heartbeat(sid, time.time())
+
+
+def join(sid: str, room: str) -> None:
+    """Record a sid joining a room and announce its user if new to the room."""
+    if backend.join(sid, room):
+        _announce(room, backend.user_of(sid), True)
+
+
+def leave(sid: str, room: str) -> None:
+    """Record a sid leaving a room and announce its user if gone from the room."""
+    user_id = backend.user_of(sid)
+    if backend.leave(sid, room):
+        _announce(room, user_id, False)
+
+
+def disconnect(sid: str) -> Optional[Departure]:
+    """Forget a sid and announce its user in every room they left.
+
+    Returns:
+        Departure, or None if the sid was not registered
+    """
+    departure = backend.disconnect(sid)
+    if departure is not None:
+        for room in departure.rooms:
+            _announce(room, departure.user_id, False)
+    return departure
+
+
+def is_opponent_connected(game_id: int, opponent_id: int) -> bool:
+    """Check if a game's opponent has a sid in the game room.
+
+    Args:
+        game_id: Game ID
+        opponent_id: User ID of the opponent
+
+    Returns:
+        True while at least one sid of the opponent is in the game room
+    """
+    return backend.is_present(game_room(game_id), opponent_id)
+
+
+def expire(now: Optional[float] = None) -> int:
+    """Disconnect sids whose heartbeats stopped.
+
+    Returns:
+        Number of sids expired
+    """
+    now = time.time() if now is None else now
+    sids = backend.expired(now, _ttl)
+    for sid in sids:
+        if disconnect(sid) is not None:
+            # Close the socket if it is ours; its disconnect handler finds nothing left
+            socketio.server.disconnect(sid, namespace='/')
+    return len(sids)
+
+
+def _sweep() -> None:
+    """Background task expiring silent sids every sweep interval."""
+    while True:
+        socketio.sleep(_sweep_interval)
+        expire()
+
+
+def init_presence(app: Flask) -> None:
+    """Select the presence backend and heartbeat settings from the app config.
+
+    Args:
+        app: Flask application instance
+
+    Raises:
+        ValueError: If PRESENCE_BACKEND names no registered backend
+    """
+    global backend, _ttl, _sweep_interval
+    name = app.config.get('PRESENCE_BACKEND', LocalPresenceBackend.name)
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown presence backend '{name}'")
+    if type(backend) is not backend_class:
+        backend = backend_class()
+    _ttl = app.config.get('PRESENCE_TTL', DEFAULT_TTL)
+    _sweep_interval = app.config.get('PRESENCE_SWEEP_INTERVAL', DEFAULT_SWEEP_INTERVAL)
@@ -0,0 +1,217 @@
+"""Elo rating system for online games."""
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import and_, select, union_all, update
+from sqlalchemy.orm import aliased
+from app.extensions import db
+from app.models import Game, GameArchive, Player, User
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+DEFAULT_RATING = 1200.0
+K_FACTOR = 32.0
+
+# Users written back per UPDATE batch by recompute_ratings
+WRITE_BATCH_SIZE = 1000
+
+
+def expected_score(rating: float, opponent_rating: float) -> float:
+    """Expected score of a player against an opponent.
+    
+    Args:
+        rating: Player rating
+        opponent_rating: Opponent rating
+        
+    Returns:
+        Expected score between 0 and 1
+    """
+    return 1.0 / (1.0 + 10.0 ** ((opponent_rating - rating) / 400.0))
+
+
+def elo_update(rating1: float, rating2: float, score1: float,
+               k: float = K_FACTOR) -> Tuple[float, float]:
+    """Compute new ratings of two players after a game.
+    
+    Args:
+        rating1: Rating of player 1
+        rating2: Rating of player 2
+        score1: Result for player 1 (1 win, 0.5 draw, 0 loss)
+        k: K-factor
+        
+    Returns:
+        Tuple of (new rating 1, new rating 2)
+    """
+    delta = k * (score1 - expected_score(rating1, rating2))
+    return rating1 + delta, rating2 - delta
+
+
+def game_score(status: str, winner: Optional[int]) -> float:
+    """Result of a finished game for player 1."""
+    if status == 'draw':
+        return 0.5
+    return 1.0 if winner == 1 else 0.0
+
+
+def update_ratings(game: Game) -> None:
+    """Update both players' ratings after an online game finished.
+    
+    Must be called inside the transaction that finishes the game.
+    
+    Args:
+        game: Game whose status just became 'finished' or 'draw'
+    """
+    if game.game_mode != 'online' or game.status not in ('finished', 'draw'):
+        return
+    
+    user_ids = {p.player_number: p.user_id for p in game.players}
+    if not user_ids.get(1) or not user_ids.get(2) or user_ids[1] == user_ids[2]:
+        return
+    
+    ratings = dict(db.session.execute(
+        select(User.id, User.rating).where(User.id.in_((user_ids[1], user_ids[2])))
+    ).all())
+    if len(ratings) != 2:
+        return
+    
+    rating1 = ratings[user_ids[1]]
+    new_rating1, _ = elo_update(rating1, ratings[user_ids[2]], game_score(game.status, game.winner))
+    delta = new_rating1 - rating1
+    # Applied relative to the stored ratings so concurrent games of a player are not lost
+    for user_id, change in ((user_ids[1], delta), (user_ids[2], -delta)):
+        db.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(rating=User.rating + change, rated_games=User.rated_games + 1)
+        )
+
+
+def iter_rated_games(chunk_size: int) -> Iterator[List[tuple]]:
+    """Stream all rated games in chronological order.
+    
+    Live and archived online games are merged by finish time and fetched
+    with a server-side cursor, chunk_size rows at a time.
+    
+    Args:
+        chunk_size: Rows per yielded chunk
+        
+    Yields:
+        Lists of (player1_user_id, player2_user_id, score1) tuples
+    """
+    player1 = aliased(Player)
+    player2 = aliased(Player)
+    live = (select(Game.updated_at.label('finished_at'), Game.id.label('game_id'),
+                   player1.user_id.label('user1'), player2.user_id.label('user2'),
+                   Game.status, Game.winner)
+            .join(player1, and_(player1.game_id == Game.id, player1.player_number == 1))
+            .join(player2, and_(player2.game_id == Game.id, player2.player_number == 2))
+            .where(Game.game_mode == 'online', Game.status.in_(('finished', 'draw')),
+                   player1.user_id.is_not(None), player2.user_id.is_not(None)))
+    archived = (select(GameArchive.finished_at, GameArchive.id.label('game_id'),
+                       GameArchive.player1_user_id.label('user1'),
+                       GameArchive.player2_user_id.label('user2'),
+                       GameArchive.status, GameArchive.winner)
+                .where(GameArchive.game_mode == 'online',
+                       GameArchive.player1_user_id.is_not(None),
+                       GameArchive.player2_user_id.is_not(None)))
+    history = union_all(live, archived).subquery()
+    stmt = (select(history.c.user1, history.c.user2, history.c.status, history.c.winner)
+            .order_by(history.c.finished_at, history.c.game_id)
+            .execution_options(yield_per=chunk_size))
+    
+    result = db.session.execute(stmt)
+    for partition in result.partitions(chunk_size):
+        yield [(user1, user2, game_score(status, winner))
+               for user1, user2, status, winner in partition if user1 != user2]
+
+
+def _replay_chunk_python(ratings: list, counts: list, a: List[int], b: List[int],
+                         scores: List[float], k: float) -> None:
+    """Apply a chunk of results one game at a time."""
+    for i, j, score in zip(a, b, scores):
+        ratings[i], ratings[j] = elo_update(ratings[i], ratings[j], score, k)
+        counts[i] += 1
+        counts[j] += 1
+
+
+def _replay_chunk_numpy(ratings, counts, a: List[int], b: List[int],
+                        scores: List[float], k: float) -> None:
+    """Apply a chunk of results in vectorized layers.
+    
+    Each game is assigned the first layer after the previous games of both
+    its players, so no player appears twice within a layer and every player
+    still sees their games in chronological order. A layer is then a single
+    vectorized Elo update, which gives the same ratings as a sequential replay.
+    """
+    layer_of = np.empty(len(a), dtype=np.int64)
+    last_layer: Dict[int, int] = {}
+    for index, (i, j) in enumerate(zip(a, b)):
+        layer = max(last_layer.get(i, -1), last_layer.get(j, -1)) + 1
+        layer_of[index] = layer
+        last_layer[i] = layer
+        last_layer[j] = layer
+    
+    order = np.argsort(layer_of, kind='stable')
+    a = np.asarray(a, dtype=np.int64)[order]
+    b = np.asarray(b, dtype=np.int64)[order]
+    scores = np.asarray(scores, dtype=np.float64)[order]
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(layer_of))))
+    
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        ia = a[start:end]
+        ib = b[start:end]
+        delta = k * (scores[start:end] - 1.0 / (1.0 + 10.0 ** ((ratings[ib] - ratings[ia]) / 400.0)))
+        ratings[ia] += delta
+        ratings[ib] -= delta
+    
+    np.add.at(counts, a, 1)
+    np.add.at(counts, b, 1)
+
+
+def recompute_ratings(chunk_size: int = 10000, k: float = K_FACTOR,
+                      use_numpy: bool = True) -> dict:
+    """Recompute all ratings by replaying the full game history.
+    
+    Memory is bounded by one rating slot per user plus one chunk of games.
+    
+    Args:
+        chunk_size: Games fetched and replayed per chunk
+        k: K-factor
+        use_numpy: Use the vectorized replay when NumPy is installed
+        
+    Returns:
+        Dictionary with the number of replayed games and rated users
+    """
+    user_ids = db.session.execute(select(User.id).order_by(User.id)).scalars().all()
+    index = {user_id: i for i, user_id in enumerate(user_ids)}
+    
+    vectorized = use_numpy and np is not None
+    if vectorized:
+        ratings = np.full(len(user_ids), DEFAULT_RATING, dtype=np.float64)
+        counts = np.zeros(len(user_ids), dtype=np.int64)
+        replay = _replay_chunk_numpy
+    else:
+        ratings = [DEFAULT_RATING] * len(user_ids)
+        counts = [0] * len(user_ids)
+        replay = _replay_chunk_python
+    
+    games = 0
+    for chunk in iter_rated_games(chunk_size):
+        chunk = [row for row in chunk if row[0] in index and row[1] in index]
+        if not chunk:
+            continue
+        replay(ratings, counts,
+               [index[row[0]] for row in chunk],
+               [index[row[1]] for row in chunk],
+               [row[2] for row in chunk], k)
+        games += len(chunk)
+    
+    for start in range(0, len(user_ids), WRITE_BATCH_SIZE):
+        db.session.execute(update(User), [
+            {'id': user_ids[i], 'rating': float(ratings[i]), 'rated_games': int(counts[i])}
+            for i in range(start, min(start + WRITE_BATCH_SIZE, len(user_ids)))
+        ])
+    db.session.commit()
+    
+    return {'games': games, 'users': len(user_ids), 'vectorized': vectorized}
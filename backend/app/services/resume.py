@@ -0,0 +1,132 @@
+"""Catch-up of reconnecting clients from recent game events.
+
+Every game update carries the game's `seq` (the last logged event), and a
+client that reconnects sends `resume` with the last seq it has seen. The
+server keeps the latest `size` events of each recently changed game in an
+in-process ring buffer, so most resumes are answered with the few events the
+client missed and no database access. A game missing from the buffer (after
+a restart, or evicted) is caught up from the game_events table when the gap
+is small, and with the full game state otherwise.
+
+Events enter the buffer when the transaction that logged them commits:
+app.services.events.record() stages them on the session, and the session
+hooks installed by init_resume() move them into the buffer on commit or drop
+them on rollback.
+"""
+import json
+from collections import deque
+from typing import Deque, List, Optional
+from flask import Flask
+from sqlalchemy import event, select
+from app.extensions import db
+from app.models import GameEvent
+from app.utils.cache import LRUCache
+
+# Events kept per game
+DEFAULT_BUFFER_SIZE = 64
+
+# Games whose recent events are kept
+DEFAULT_MAX_GAMES = 4096
+
+# Session info key of events logged in the current transaction
+_STAGED = 'resume_events'
+
+# game_id -> deque of the game's latest event messages, oldest first
+buffers = LRUCache(DEFAULT_MAX_GAMES)
+_buffer_size = DEFAULT_BUFFER_SIZE
+
+
+def message(game_event: GameEvent, details: Optional[dict] = None) -> dict:
+    """Compact message of an event sent to resuming clients."""
+    entry = {'seq': game_event.seq, 'type': game_event.type}
+    if game_event.player is not None:
+        entry['player'] = game_event.player
+    if game_event.column is not None:
+        entry['column'] = game_event.column
+    if details:
+        entry['data'] = details
+    return entry
+
+
+def stage(game_event: GameEvent, details: Optional[dict] = None) -> None:
+    """Hold an event logged in the current transaction until it commits."""
+    db.session.info.setdefault(_STAGED, []).append((game_event.game_id, message(game_event, details)))
+
+
+def remember(game_id: int, entry: dict) -> None:
+    """Append an event message to a game's buffer.
+
+    A message that does not follow the buffered ones (events committed by
+    another process) restarts the buffer.
+    """
+    events: Optional[Deque[dict]] = buffers.get(game_id)
+    if events is None or (events and events[-1]['seq'] + 1 != entry['seq']):
+        events = deque(maxlen=_buffer_size)
+        buffers.put(game_id, events)
+    events.append(entry)
+
+
+def missed(game_id: int, last_seq: int) -> Optional[List[dict]]:
+    """Buffered events of a game after `last_seq`.
+
+    Args:
+        game_id: Game ID
+        last_seq: Last event seen by the client
+
+    Returns:
+        Events after last_seq in order (empty when the client is up to
+        date), or None if the buffer does not cover them
+    """
+    events = buffers.get(game_id)
+    if not events or last_seq < events[0]['seq'] - 1 or last_seq > events[-1]['seq']:
+        return None
+    return [entry for entry in events if entry['seq'] > last_seq]
+
+
+def logged(game_id: int, last_seq: int, current_seq: int) -> Optional[List[dict]]:
+    """Events of a game after `last_seq` read from the event log.
+
+    Args:
+        game_id: Game ID
+        last_seq: Last event seen by the client
+        current_seq: Game.seq of the game
+
+    Returns:
+        Events after last_seq in order, or None if more than the buffer size
+        are missing (or last_seq is ahead of the game)
+    """
+    if last_seq > current_seq or current_seq - last_seq > _buffer_size:
+        return None
+    if last_seq == current_seq:
+        return []
+    rows = db.session.execute(
+        select(GameEvent).where(GameEvent.game_id == game_id, GameEvent.seq > last_seq)
+        .order_by(GameEvent.seq)
+    ).scalars().all()
+    if len(rows) != current_seq - last_seq:
+        return None
+    return [message(row, json.loads(row.data) if row.data else None) for row in rows]
+
+
+def _after_commit(session) -> None:
+    for game_id, entry in session.info.pop(_STAGED, ()):
+        remember(game_id, entry)
+
+
+def _after_rollback(session) -> None:
+    session.info.pop(_STAGED, None)
+
+
+def init_resume(app: Flask, db) -> None:
+    """Size the buffers from the app config and install the session hooks.
+
+    Args:
+        app: Flask application instance
+        db: Flask-SQLAlchemy extension
+    """
+    global _buffer_size
+    _buffer_size = app.config.get('RESUME_BUFFER_SIZE', DEFAULT_BUFFER_SIZE)
+    buffers.maxsize = app.config.get('RESUME_MAX_GAMES', DEFAULT_MAX_GAMES)
+    if not event.contains(db.session, 'after_commit', _after_commit):
+        event.listen(db.session, 'after_commit', _after_commit)
+        event.listen(db.session, 'after_rollback', _after_rollback)
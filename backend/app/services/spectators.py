@@ -0,0 +1,126 @@
+"""Spectator fan-out of game updates.
+
+Players of a game sit in the `game_<id>` room and get every update as it
+happens. Spectators sit in a separate `spectate_<id>` room served at a lower
+priority: publish() only keeps the latest frame of each game, and a
+background task sends pending frames every `interval` seconds. Updates that
+arrive in between replace the pending frame, so a spectator skips states
+rather than falling behind.
+
+A frame is a compact subset of Game.to_dict(). The spectators of a game are
+sent it in chunks of `chunk_size` sids, one emit per chunk addressed to the
+sids' own rooms (the server encodes the packet once per emit and reuses it
+for every recipient), and the task yields to other green threads between
+chunks so a game with thousands of watchers does not hold up the players'
+updates.
+"""
+import threading
+from typing import Dict, Optional
+from app.extensions import socketio
+from app.metrics import SOCKET_EMITS, SOCKET_RECIPIENTS, SPECTATOR_FRAMES
+
+# Seconds between two flushes of pending frames
+DEFAULT_INTERVAL = 0.25
+
+# Spectators sent a frame before yielding to other green threads
+DEFAULT_CHUNK_SIZE = 500
+
+# Fields of Game.to_dict() sent to spectators
+FRAME_FIELDS = ('id', 'seq', 'status', 'current_player', 'winner', 'board_state', 'ai_move')
+
+# game_id -> latest frame not sent yet
+_pending: Dict[int, dict] = {}
+_lock = threading.Lock()
+_task = None
+
+
+def room_name(game_id: int) -> str:
+    """Socket.IO room of a game's spectators."""
+    return f'spectate_{game_id}'
+
+
+def count(game_id: int, namespace: str = '/') -> int:
+    """Number of spectators of a game connected to this server."""
+    rooms = socketio.server.manager.rooms.get(namespace, {})
+    members = rooms.get(room_name(game_id))
+    return len(members) if members else 0
+
+
+def publish(game_id: int, game_data: dict, interval: float = DEFAULT_INTERVAL,
+            chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """Queue the latest state of a game for its spectators.
+
+    Returns at once; the frame is sent by the background task, replacing any
+    frame of the game still pending.
+
+    Args:
+        game_id: Game ID
+        game_data: Game state dictionary (Game.to_dict())
+        interval: Seconds between flushes, used when the task is started
+        chunk_size: Spectators sent a frame between yields, used when the task is started
+    """
+    global _task
+    if not count(game_id):
+        return
+    frame = {field: game_data[field] for field in FRAME_FIELDS if field in game_data}
+    with _lock:
+        if _pending.pop(game_id, None) is not None:
+            SPECTATOR_FRAMES.inc(result='coalesced')
+        _pending[game_id] = frame
+        if _task is None:
+            _task = socketio.start_background_task(_run, interval, chunk_size)
+
+
+def flush(chunk_size: int = DEFAULT_CHUNK_SIZE, namespace: str = '/') -> int:
+    """Send the pending frame of every game to its spectators.
+
+    Args:
+        chunk_size: Spectators sent a frame before yielding to other green threads
+        namespace: Socket.IO namespace of the spectator rooms
+
+    Returns:
+        Number of spectators reached
+    """
+    global _pending
+    with _lock:
+        frames, _pending = _pending, {}
+    server = socketio.server
+    reached = 0
+    for game_id, frame in frames.items():
+        recipients = list(server.manager.get_participants(namespace, room_name(game_id)))
+        if not recipients:
+            continue
+        frame['spectators'] = len(recipients)
+        sids = [sid for sid, _ in recipients]
+        for start in range(0, len(sids), chunk_size):
+            if start:
+                socketio.sleep(0)
+            # Every sid is in a room of its own, so a list of sids addresses exactly them
+            server.emit('spectator_update', frame, to=sids[start:start + chunk_size],
+                        namespace=namespace)
+        SPECTATOR_FRAMES.inc(result='sent')
+        SOCKET_EMITS.inc(event='spectator_update')
+        SOCKET_RECIPIENTS.inc(len(recipients), event='spectator_update')
+        reached += len(recipients)
+    return reached
+
+
+def _run(interval: float, chunk_size: int) -> None:
+    """Background task flushing pending frames until none are left."""
+    global _task
+    while True:
+        socketio.sleep(interval)
+        with _lock:
+            if not _pending:
+                _task = None
+                return
+        flush(chunk_size)
+
+
+def discard(game_id: Optional[int] = None) -> None:
+    """Drop the pending frame of a game, or of every game."""
+    with _lock:
+        if game_id is None:
+            _pending.clear()
+        else:
+            _pending.pop(game_id, None)
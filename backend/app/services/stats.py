@@ -0,0 +1,187 @@
+"""Player statistics and leaderboard."""
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, event, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models import Game, User, UserStats
+
+# Number of top leaderboard entries kept in memory
+LEADERBOARD_CACHE_SIZE = 100
+
+# Dialects whose INSERT supports ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+# Cached top entries read from the primary, None until first use
+_leaderboard_cache: Optional[List[dict]] = None
+
+
+def record_game_result(game: Game) -> None:
+    """Add a finished game to the stats of its human players.
+    
+    Must be called inside the transaction that finishes the game so the
+    stats and the result are committed together.
+    
+    Args:
+        game: Game whose status just became 'finished' or 'draw'
+    """
+    if game.status not in ('finished', 'draw') or game.game_mode not in UserStats.MODES:
+        return
+    
+    for player in game.players:
+        if player.user_id is None or player.is_ai:
+            continue
+        if game.status == 'draw':
+            outcome = 'draws'
+        elif game.winner == player.player_number:
+            outcome = 'wins'
+        else:
+            outcome = 'losses'
+        _increment(player.user_id, ['games_played', outcome, f'{game.game_mode}_{outcome}'])
+    
+    db.session.info['leaderboard_stale'] = True
+
+
+def _increment(user_id: int, columns: List[str]) -> None:
+    """Increment stats counters of a user, creating the row on first result.
+    
+    A single INSERT ... ON CONFLICT DO UPDATE where the database supports
+    it, so two results of a new user committed at once cannot both try to
+    create the row. Other databases UPDATE, INSERT when no row was updated,
+    and UPDATE again if a concurrent transaction created the row first.
+    
+    Args:
+        user_id: User ID
+        columns: Names of the counters to increment by one
+    """
+    dialect = db.session.get_bind(mapper=UserStats.__mapper__).dialect.name
+    table = UserStats.__table__
+    now = datetime.utcnow()
+    insert = _UPSERT_INSERTS.get(dialect)
+    if insert is None:
+        _increment_portable(user_id, columns, now)
+        return
+    stmt = insert(table).values(user_id=user_id, updated_at=now, **{
+        name: 1 if name in columns else 0 for name in UserStats.COUNTERS
+    })
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={**{name: table.c[name] + 1 for name in columns}, 'updated_at': now},
+    )
+    db.session.execute(stmt)
+
+
+def _increment_portable(user_id: int, columns: List[str], now: datetime) -> None:
+    """_increment() for databases without ON CONFLICT DO UPDATE."""
+    table = UserStats.__table__
+    stmt = update(table).where(table.c.user_id == user_id).values(
+        updated_at=now, **{name: table.c[name] + 1 for name in columns}
+    )
+    if db.session.execute(stmt).rowcount:
+        return
+    try:
+        # A savepoint, so losing the race does not roll back the finishing move
+        with db.session.begin_nested():
+            db.session.execute(table.insert().values(user_id=user_id, updated_at=now, **{
+                name: 1 if name in columns else 0 for name in UserStats.COUNTERS
+            }))
+    except IntegrityError:
+        db.session.execute(stmt)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _refresh_leaderboard(session):
+    global _leaderboard_cache
+    if session.info.pop('leaderboard_stale', False):
+        # Rebuilt from the primary: a reader refilling it could hit a lagging replica
+        with Session(db.engine) as primary:
+            _leaderboard_cache = _query_leaderboard(LEADERBOARD_CACHE_SIZE, session=primary)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_stale_flag(session):
+    session.info.pop('leaderboard_stale', None)
+
+
+def get_user_stats(user_id: int) -> dict:
+    """Get the stats of a user, all zeros if they have no finished games.
+    
+    Args:
+        user_id: User ID
+        
+    Returns:
+        Stats dictionary
+    """
+    stats = db.session.get(UserStats, user_id)
+    if stats is None:
+        stats = UserStats(user_id=user_id)
+    return stats.to_dict()
+
+
+def encode_cursor(entry: dict) -> str:
+    """Encode the keyset pagination cursor of a leaderboard entry."""
+    return f"{entry['wins']}:{entry['user_id']}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """Decode a leaderboard cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    wins, user_id = cursor.split(':')
+    return int(wins), int(user_id)
+
+
+def _query_leaderboard(limit: int, after: Optional[Tuple[int, int]] = None,
+                       session: Optional[Session] = None) -> List[dict]:
+    """Read a leaderboard page ordered by (wins DESC, user_id DESC)."""
+    query = select(UserStats, User.username).join(User, User.id == UserStats.user_id)
+    if after is not None:
+        wins, user_id = after
+        query = query.where(or_(
+            UserStats.wins < wins,
+            and_(UserStats.wins == wins, UserStats.user_id < user_id),
+        ))
+    query = query.order_by(UserStats.wins.desc(), UserStats.user_id.desc()).limit(limit)
+    rows = (session or db.session).execute(query).all()
+    
+    entries = []
+    for stats, username in rows:
+        entry = stats.to_dict()
+        entry['username'] = username
+        entries.append(entry)
+    return entries
+
+
+def get_leaderboard(limit: int = 20, cursor: Optional[str] = None) -> dict:
+    """Get a leaderboard page.
+    
+    The first LEADERBOARD_CACHE_SIZE entries are served from memory, read
+    from the primary and rebuilt whenever a result is committed; deeper pages
+    use keyset pagination on the ranking index.
+    
+    Args:
+        limit: Page size
+        cursor: Cursor returned with the previous page
+        
+    Returns:
+        Dictionary with 'entries' and 'next_cursor' (None on the last page)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    global _leaderboard_cache
+    
+    if cursor is None and limit <= LEADERBOARD_CACHE_SIZE:
+        if _leaderboard_cache is None:
+            with Session(db.engine) as primary:
+                _leaderboard_cache = _query_leaderboard(LEADERBOARD_CACHE_SIZE, session=primary)
+        entries = _leaderboard_cache[:limit]
+    else:
+        entries = _query_leaderboard(limit, decode_cursor(cursor) if cursor else None)
+    
+    next_cursor = encode_cursor(entries[-1]) if len(entries) == limit else None
+    return {'entries': entries, 'next_cursor': next_cursor}
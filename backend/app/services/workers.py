@@ -0,0 +1,46 @@
+"""Shared process pool for CPU-bound AI work.
+
+Batch analysis and root-parallel MCTS submit to the same pool, so together
+they never run more worker processes than configured.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+def get_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use.
+
+    The pool is sized by the first caller; later callers share it whatever
+    size they ask for. Workers use the platform's default start method. They
+    never touch the database or sockets they may inherit from the server;
+    spawned workers would instead re-import the server's main module.
+
+    Args:
+        workers: Number of worker processes if the pool is created (default: CPU count)
+
+    Returns:
+        Process pool executor
+    """
+    global _pool, _pool_workers
+    if _pool is None:
+        _pool_workers = workers or os.cpu_count() or 1
+        _pool = ProcessPoolExecutor(max_workers=_pool_workers)
+    return _pool
+
+
+def pool_size() -> int:
+    """Worker processes of the shared pool, 0 before it is created."""
+    return _pool_workers
+
+
+def reset_pool() -> None:
+    """Shut down the shared process pool; the next caller creates a new one."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+    _pool_workers = 0
@@ -2,6 +2,7 @@
 from functools import wraps
 from flask import jsonify
 from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from app.database import use_replica_for_request
 
 
 def jwt_required_optional(fn):
@@ -15,3 +16,16 @@ def jwt_required_optional(fn):
         return fn(*args, **kwargs)
     return wrapper
 
+
+
+def read_only(fn):
+    """Decorator that routes the view's database reads to the read replica.
+    
+    Must be applied below any JWT decorator so the caller's identity is known
+    when checking read-your-writes stickiness.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        use_replica_for_request()
+        return fn(*args, **kwargs)
+    return wrapper
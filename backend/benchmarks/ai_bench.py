@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Benchmark the AI on a fixed corpus of positions.
+
+Times get_ai_move, minimax and evaluate_board on every position in
+benchmarks/positions.py and reports nodes searched, nodes per second and
+p50/p95/p99 latencies. Results can be saved as JSON and compared against a
+saved baseline; the compare mode exits with status 1 on a regression.
+
+Usage:
+    python benchmarks/ai_bench.py --output baseline.json
+    python benchmarks/ai_bench.py --compare baseline.json --threshold 0.15
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.services import ai
+from positions import POSITIONS, board_from_moves, player_to_move
+
+# Metrics compared by --compare: (section, key, True if higher is better)
+COMPARED_METRICS = [
+    ('get_ai_move', 'p50_ms', False),
+    ('get_ai_move', 'p95_ms', False),
+    ('minimax', 'p50_ms', False),
+    ('minimax', 'p95_ms', False),
+    ('evaluate_board', 'p50_us', False),
+    ('minimax', 'nodes_per_second', True),
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[float], scale: float, unit: str) -> Dict[str, float]:
+    """Summarize latency samples given in seconds."""
+    return {
+        f'p50_{unit}': round(percentile(samples, 50) * scale, 3),
+        f'p95_{unit}': round(percentile(samples, 95) * scale, 3),
+        f'p99_{unit}': round(percentile(samples, 99) * scale, 3),
+        f'mean_{unit}': round(sum(samples) / len(samples) * scale, 3),
+    }
+
+
+def search_stats(board, depth: int, ai_player: int) -> ai.SearchStats:
+    """Collect instrumentation of one minimax search."""
+    stats = ai.SearchStats()
+    ai.minimax(board, depth, -math.inf, math.inf, True, ai_player, stats)
+    return stats
+
+
+def time_call(fn, repeats: int) -> List[float]:
+    """Time repeated calls of fn, returning one sample per call in seconds."""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def run(repeats: int, eval_repeats: int, depth: int, category: str = None) -> dict:
+    """Run the benchmark over the corpus."""
+    totals = {'get_ai_move': [], 'minimax': [], 'evaluate_board': []}
+    total_nodes = 0
+    total_minimax_time = 0.0
+    positions = {}
+    
+    for position in POSITIONS:
+        if category and position['category'] != category:
+            continue
+        board = board_from_moves(position['moves'])
+        player = player_to_move(position['moves'])
+        
+        move_samples = time_call(lambda: ai.get_ai_move([row[:] for row in board], player, cache=None), repeats)
+        search_samples = time_call(
+            lambda: ai.minimax([row[:] for row in board], depth, -math.inf, math.inf, True, player),
+            repeats,
+        )
+        eval_samples = time_call(lambda: ai.evaluate_board(board, player), eval_repeats)
+        stats = search_stats([row[:] for row in board], depth, player)
+        nodes = stats.nodes
+        
+        search_median = percentile(search_samples, 50)
+        positions[position['name']] = {
+            'category': position['category'],
+            'moves': position['moves'],
+            'get_ai_move': summarize(move_samples, 1000, 'ms'),
+            'minimax': dict(summarize(search_samples, 1000, 'ms'), nodes=nodes,
+                            nodes_per_second=round(nodes / search_median) if search_median else 0,
+                            cutoffs=stats.cutoffs,
+                            first_move_cutoff_rate=stats.to_dict()['first_move_cutoff_rate']),
+            'evaluate_board': summarize(eval_samples, 1e6, 'us'),
+        }
+        totals['get_ai_move'].extend(move_samples)
+        totals['minimax'].extend(search_samples)
+        totals['evaluate_board'].extend(eval_samples)
+        total_nodes += nodes
+        total_minimax_time += search_median
+    
+    return {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeats': repeats,
+            'eval_repeats': eval_repeats,
+            'depth': depth,
+            'category': category,
+        },
+        'summary': {
+            'get_ai_move': summarize(totals['get_ai_move'], 1000, 'ms'),
+            'minimax': dict(summarize(totals['minimax'], 1000, 'ms'), nodes=total_nodes,
+                            nodes_per_second=round(total_nodes / total_minimax_time)
+                            if total_minimax_time else 0),
+            'evaluate_board': summarize(totals['evaluate_board'], 1e6, 'us'),
+        },
+        'positions': positions,
+    }
+
+
+def print_report(results: dict) -> None:
+    """Print a per-position table and the summary."""
+    print(f"{'position':<14} {'category':<10} {'move p50ms':>11} {'move p95ms':>11} "
+          f"{'search p50ms':>13} {'nodes':>8} {'nodes/s':>9} {'eval p50us':>11}")
+    for name, result in results['positions'].items():
+        print(f"{name:<14} {result['category']:<10} "
+              f"{result['get_ai_move']['p50_ms']:>11} {result['get_ai_move']['p95_ms']:>11} "
+              f"{result['minimax']['p50_ms']:>13} {result['minimax']['nodes']:>8} "
+              f"{result['minimax']['nodes_per_second']:>9} {result['evaluate_board']['p50_us']:>11}")
+    print()
+    for section, summary in results['summary'].items():
+        print(f'{section}: ' + ', '.join(f'{key}={value}' for key, value in summary.items()))
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Compare summary metrics against a baseline.
+    
+    Returns:
+        List of regression descriptions (empty when within threshold)
+    """
+    regressions = []
+    for key in ('depth', 'category'):
+        if baseline['meta'].get(key) != results['meta'].get(key):
+            print(f"\nWARNING: baseline {key}={baseline['meta'].get(key)!r} differs from "
+                  f"current {key}={results['meta'].get(key)!r}")
+    print(f"\n{'metric':<32} {'baseline':>12} {'current':>12} {'change':>9}")
+    for section, key, higher_is_better in COMPARED_METRICS:
+        old = baseline['summary'][section][key]
+        new = results['summary'][section][key]
+        change = (new - old) / old if old else 0.0
+        regressed = change < -threshold if higher_is_better else change > threshold
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{section + '.' + key:<32} {old:>12} {new:>12} {change:>+8.1%}{flag}")
+        if regressed:
+            regressions.append(f'{section}.{key}: {old} -> {new} ({change:+.1%})')
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=5, help='Timed runs per position')
+    parser.add_argument('--eval-repeats', type=int, default=200,
+                        help='Timed evaluate_board calls per position')
+    parser.add_argument('--depth', type=int, default=4, help='Depth of the timed minimax search')
+    parser.add_argument('--category', choices=['opening', 'midgame', 'tactical', 'near_full'],
+                        help='Only run positions of one category')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Allowed relative slowdown before failing (default 0.15)')
+    args = parser.parse_args()
+    
+    results = run(args.repeats, args.eval_repeats, args.depth, args.category)
+    print_report(results)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'\nResults written to {args.output}')
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f'\n{len(regressions)} metric(s) regressed past {args.threshold:.0%}:')
+            for regression in regressions:
+                print(f'  {regression}')
+            return 1
+        print(f'\nNo regressions past {args.threshold:.0%}')
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
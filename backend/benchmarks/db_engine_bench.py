@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Benchmark concurrent move throughput under different engine settings.
+
+Every worker thread plays moves on its own game the way make_move does:
+load the game row, drop a piece, append the move and commit.
+
+Usage:
+    python benchmarks/db_engine_bench.py --threads 8 --moves 200
+    python benchmarks/db_engine_bench.py --url postgresql://localhost/bingo_bench
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import install_sqlite_pragmas, pool_options
+from app.extensions import db
+from app.models import Game
+from app.services import game_logic
+
+SQLITE_VARIANTS = {
+    'rollback-journal': {'journal_mode': 'DELETE', 'synchronous': 'FULL'},
+    'rollback-journal+busy_timeout': {'journal_mode': 'DELETE', 'synchronous': 'FULL',
+                                      'busy_timeout': 5000},
+    'wal': {'journal_mode': 'WAL', 'synchronous': 'FULL', 'busy_timeout': 5000},
+    'wal+synchronous=normal': {'journal_mode': 'WAL', 'synchronous': 'NORMAL',
+                               'busy_timeout': 5000},
+    'wal+synchronous=normal+mmap': {'journal_mode': 'WAL', 'synchronous': 'NORMAL',
+                                    'busy_timeout': 5000, 'mmap_size': 256 * 1024 * 1024},
+}
+
+POOL_VARIANTS = {
+    'pool=5': pool_options(pool_size=5, max_overflow=0),
+    'pool=10+overflow=20': pool_options(pool_size=10, max_overflow=20),
+    'pool=10+overflow=20+pre_ping': pool_options(pool_size=10, max_overflow=20, pool_pre_ping=True),
+}
+
+
+def play_moves(Session, game_id: int, moves: int, errors: list) -> int:
+    """Play moves on one game, restarting the board when it fills up."""
+    done = 0
+    for _ in range(moves):
+        session = Session()
+        try:
+            game = session.get(Game, game_id)
+            board = game.board
+            valid = game_logic.get_valid_columns(board)
+            if not valid:
+                board = game_logic.create_board()
+                game.moves = ''
+                game.checkpoint_board(board)
+                valid = game_logic.get_valid_columns(board)
+            column = random.choice(valid)
+            game_logic.drop_piece(board, column, game.current_player)
+            game.moves = (game.moves or '') + str(column)
+            game.current_player = 3 - game.current_player
+            session.commit()
+            done += 1
+        except Exception as e:
+            session.rollback()
+            errors.append(type(e).__name__)
+        finally:
+            session.close()
+    return done
+
+
+def run_variant(url: str, options: dict, pragmas: dict, threads: int, moves: int) -> dict:
+    """Run one benchmark variant and return its measurements."""
+    engine = create_engine(url, **options)
+    install_sqlite_pragmas(engine, pragmas)
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    session = Session()
+    games = [Game(game_mode='local', status='playing', current_player=1,
+                  board_state=json.dumps(game_logic.create_board()))
+             for _ in range(threads)]
+    session.add_all(games)
+    session.commit()
+    game_ids = [game.id for game in games]
+    session.close()
+
+    errors = []
+    completed = [0] * threads
+
+    def worker(index):
+        completed[index] = play_moves(Session, game_ids[index], moves, errors)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    db.metadata.drop_all(engine)
+    engine.dispose()
+
+    total = sum(completed)
+    return {
+        'moves': total,
+        'errors': len(errors),
+        'seconds': round(elapsed, 3),
+        'moves_per_second': round(total / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent players')
+    parser.add_argument('--moves', type=int, default=200, help='Moves per player')
+    parser.add_argument('--url', help='Database URL (default: temporary SQLite file)')
+    args = parser.parse_args()
+
+    results = {}
+    if args.url and not args.url.startswith('sqlite'):
+        for name, options in POOL_VARIANTS.items():
+            results[name] = run_variant(args.url, options, {}, args.threads, args.moves)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            url = args.url or f'sqlite:///{os.path.join(tmp_dir, "bench.db")}'
+            options = pool_options(pool_size=args.threads, max_overflow=0)
+            for name, pragmas in SQLITE_VARIANTS.items():
+                results[name] = run_variant(url, options, pragmas, args.threads, args.moves)
+
+    print(f"{'variant':<32} {'moves/s':>10} {'moves':>8} {'errors':>8} {'seconds':>9}")
+    for name, result in results.items():
+        print(f"{name:<32} {result['moves_per_second']:>10} {result['moves']:>8} "
+              f"{result['errors']:>8} {result['seconds']:>9}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Compare evaluate_batch against a loop of evaluate calls.
+
+Plays random games to collect positions, then times evaluating all of them
+with one evaluate() call per board and with evaluate_batch() (one call per
+side to move, as analysis.static_evaluations does) at several batch sizes.
+Both must give the same scores; the script exits with status 1 if they do not.
+
+Usage:
+    python benchmarks/evaluate_batch.py
+    python benchmarks/evaluate_batch.py --batch-size 8 --batch-size 1000 --output batch.json
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services import evaluation, game_logic
+
+
+def random_positions(count: int, seed: int) -> List[List[List[int]]]:
+    """Positions of random games, all with player 1 to move."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = game_logic.create_board()
+        player = 1
+        while not game_logic.check_winner(board) and not game_logic.is_draw(board):
+            if player == 1:
+                positions.append([row[:] for row in board])
+            column = rng.choice(game_logic.get_valid_columns(board))
+            game_logic.drop_piece(board, column, player)
+            player = 3 - player
+    return positions[:count]
+
+
+def best_time(fn, repeats: int) -> float:
+    """Fastest of repeated calls of fn in seconds."""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return min(samples)
+
+
+def run(batch_sizes: List[int], repeats: int, seed: int) -> dict:
+    """Time both ways of evaluating each batch size."""
+    positions = random_positions(max(batch_sizes), seed)
+    results = {}
+    mismatches = 0
+    for size in batch_sizes:
+        boards = positions[:size]
+        expected = [evaluation.evaluate(board, 1) for board in boards]
+        if evaluation.evaluate_batch(boards, 1).tolist() != expected:
+            mismatches += 1
+        loop = best_time(lambda: [evaluation.evaluate(board, 1) for board in boards], repeats)
+        batch = best_time(lambda: evaluation.evaluate_batch(boards, 1), repeats)
+        results[size] = {
+            'loop_us_per_board': round(loop / size * 1e6, 3),
+            'batch_us_per_board': round(batch / size * 1e6, 3),
+            'speedup': round(loop / batch, 2) if batch else None,
+        }
+    return {'seed': seed, 'repeats': repeats, 'sizes': results, 'mismatches': mismatches}
+
+
+def print_report(results: dict) -> None:
+    """Print one line per batch size."""
+    print(f"{'boards':>8} {'loop us/board':>14} {'batch us/board':>15} {'speedup':>8}")
+    for size, result in results['sizes'].items():
+        print(f"{size:>8} {result['loop_us_per_board']:>14} {result['batch_us_per_board']:>15} "
+              f"{result['speedup']:>8}")
+    if results['mismatches']:
+        print(f"SCORE MISMATCH in {results['mismatches']} batch size(s)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--batch-size', type=int, action='append',
+                        help='Boards per batch, repeatable (default: 1, 8, 64, 1000)')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed runs per batch size')
+    parser.add_argument('--seed', type=int, default=1, help='Seed of the random games')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    if evaluation.np is None:
+        print('evaluate_batch requires NumPy')
+        return 1
+    results = run(args.batch_size or [1, 8, 64, 1000], args.repeats, args.seed)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'\nResults written to {args.output}')
+    return 1 if results['mismatches'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""Load-test a local Bingo server with concurrent online and AI games.
+
+Each game slot registers its own users and plays games back to back until
+the run ends. Online games go through /api/lobby (create, join, start),
+connect both players over Socket.IO and play over REST; the opponent's
+game_update broadcast is timed against the move request to measure
+delivery lag. AI games are created with /api/game/ai. Slots are started
+gradually over the ramp period up to --games concurrent games.
+
+Usage:
+    python benchmarks/loadtest.py --url http://127.0.0.1:12366 --games 50 --ramp 30 --duration 120
+    python benchmarks/loadtest.py --games 20 --mode ai --strategy scripted
+
+Requires the dev extra (python-socketio asyncio client and aiohttp).
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+import socketio
+
+LOCAL_HOSTS = {'localhost', '127.0.0.1', '::1'}
+
+# Column order used by the scripted strategy, falling back to the next open column
+SCRIPTED_ORDER = [3, 2, 4, 3, 1, 5, 2, 4, 0, 6]
+
+
+def percentile(samples: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(pct / 100.0 * len(ordered))) - 1]
+
+
+class Recorder:
+    """Collects latencies, counts and errors of a run."""
+
+    def __init__(self):
+        self.move_rtt: List[float] = []
+        self.broadcast_lag: List[float] = []
+        self.operations: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.games_finished: Dict[str, int] = defaultdict(int)
+        self.moves = 0
+        self.active_games = 0
+        self.peak_games = 0
+
+    def operation(self, name: str, ok: bool = True) -> None:
+        self.operations[name] += 1
+        if not ok:
+            self.errors[name] += 1
+
+    def report(self, elapsed: float) -> dict:
+        """Summarize the run."""
+        def latency(samples):
+            return {f'p{p}_ms': round(percentile(samples, p) * 1000, 2) if samples else None
+                    for p in (50, 95, 99)}
+
+        total_ops = sum(self.operations.values())
+        total_errors = sum(self.errors.values())
+        return {
+            'seconds': round(elapsed, 1),
+            'peak_concurrent_games': self.peak_games,
+            'games_finished': dict(self.games_finished),
+            'games_per_second': round(sum(self.games_finished.values()) / elapsed, 2),
+            'moves': self.moves,
+            'moves_per_second': round(self.moves / elapsed, 1),
+            'move_rtt': latency(self.move_rtt),
+            'broadcast_lag': latency(self.broadcast_lag),
+            'operations': dict(self.operations),
+            'errors': dict(self.errors),
+            'error_rate': round(total_errors / total_ops, 4) if total_ops else 0.0,
+        }
+
+
+def pick_column(board: List[List[int]], strategy: str, ply: int) -> int:
+    """Choose a column to play."""
+    valid = [col for col in range(len(board[0])) if board[0][col] == 0]
+    if strategy == 'scripted':
+        preferred = SCRIPTED_ORDER[ply % len(SCRIPTED_ORDER)]
+        return preferred if preferred in valid else valid[0]
+    return random.choice(valid)
+
+
+class LoadTest:
+    """Runs game slots against one server."""
+
+    def __init__(self, args):
+        self.args = args
+        self.url = args.url.rstrip('/')
+        self.run_id = uuid.uuid4().hex[:6]
+        self.recorder = Recorder()
+        self.stop_at = 0.0
+        self.user_counter = 0
+
+    async def request(self, http: aiohttp.ClientSession, name: str, method: str, path: str,
+                      token: Optional[str] = None, payload: Optional[dict] = None) -> Optional[dict]:
+        """Send an API request, recording its outcome. Returns the JSON body or None."""
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        try:
+            async with http.request(method, self.url + path, json=payload or {}, headers=headers) as response:
+                body = await response.json(content_type=None)
+                ok = response.status < 400
+                self.recorder.operation(name, ok)
+                return body if ok else None
+        except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError):
+            self.recorder.operation(name, False)
+            return None
+
+    async def register(self, http: aiohttp.ClientSession) -> Optional[str]:
+        """Register a fresh user and return its access token."""
+        self.user_counter += 1
+        username = f'lt{self.run_id}{self.user_counter}'
+        body = await self.request(http, 'register', 'POST', '/api/auth/register', payload={
+            'username': username, 'email': f'{username}@loadtest.local', 'password': 'loadtest'})
+        return body['access_token'] if body else None
+
+    async def connect_socket(self, token: str, game_id: int, on_update) -> Optional[socketio.AsyncClient]:
+        """Connect a Socket.IO client and join the game room."""
+        sio = socketio.AsyncClient(reconnection=False)
+        joined = asyncio.Event()
+        sio.on('joined_game', lambda data: joined.set())
+        sio.on('game_update', on_update)
+        try:
+            await sio.connect(self.url, auth={'token': token}, transports=self.args.transports)
+            await sio.emit('join_game', {'game_id': game_id})
+            await asyncio.wait_for(joined.wait(), timeout=10)
+            self.recorder.operation('socket_join')
+            return sio
+        except (socketio.exceptions.ConnectionError, asyncio.TimeoutError):
+            self.recorder.operation('socket_join', False)
+            if sio.connected:
+                await sio.disconnect()
+            return None
+
+    async def play_moves(self, http, game: dict, tokens: Dict[int, Optional[str]],
+                         pending: Optional[Dict[int, float]] = None) -> None:
+        """Play a game until it ends. tokens maps player number to token (None = AI/anonymous)."""
+        board = game['board_state']
+        ply = sum(1 for row in board for cell in row if cell)
+        while game['status'] == 'playing' and time.monotonic() < self.stop_at:
+            player = game['current_player']
+            column = pick_column(board, self.args.strategy, ply)
+            ply += 1
+            if pending is not None:
+                pending[ply] = time.perf_counter()
+            started = time.perf_counter()
+            body = await self.request(http, 'move', 'POST', f"/api/game/{game['id']}/move",
+                                      token=tokens.get(player), payload={'column': column})
+            if body is None:
+                return
+            self.recorder.move_rtt.append(time.perf_counter() - started)
+            self.recorder.moves += 2 if 'ai_move' in body else 1
+            if 'ai_move' in body:
+                ply += 1
+            game = body
+            board = game['board_state']
+            if self.args.move_delay:
+                await asyncio.sleep(self.args.move_delay)
+        if game['status'] != 'playing':
+            self.recorder.games_finished[game['game_mode']] += 1
+
+    async def online_game(self, http: aiohttp.ClientSession) -> None:
+        """Play one online game between two fresh users."""
+        host_token = await self.register(http)
+        guest_token = await self.register(http)
+        if not host_token or not guest_token:
+            return
+        room = await self.request(http, 'lobby_create', 'POST', '/api/lobby/create', token=host_token)
+        if not room:
+            return
+        if not await self.request(http, 'lobby_join', 'POST', f"/api/lobby/join/{room['code']}",
+                                  token=guest_token):
+            return
+        game = await self.request(http, 'lobby_start', 'POST', f"/api/lobby/start/{room['id']}",
+                                  token=host_token)
+        if not game:
+            return
+
+        # Move number -> send time, resolved by the opponent's game_update
+        pending: Dict[int, float] = {}
+
+        def on_update(data):
+            ply = sum(1 for row in data.get('board_state') or [] for cell in row if cell)
+            sent = pending.pop(ply, None)
+            if sent is not None:
+                self.recorder.broadcast_lag.append(time.perf_counter() - sent)
+
+        # Only the guest's socket measures lag so each broadcast is counted once
+        host_socket = await self.connect_socket(host_token, game['id'], lambda data: None)
+        guest_socket = await self.connect_socket(guest_token, game['id'], on_update)
+        try:
+            if host_socket and guest_socket:
+                await self.play_moves(http, game, {1: host_token, 2: guest_token}, pending)
+        finally:
+            for sio in (host_socket, guest_socket):
+                if sio is not None and sio.connected:
+                    await sio.disconnect()
+
+    async def ai_game(self, http: aiohttp.ClientSession) -> None:
+        """Play one anonymous game against the AI."""
+        game = await self.request(http, 'ai_create', 'POST', '/api/game/ai')
+        if game:
+            await self.play_moves(http, game, {1: None})
+
+    async def slot(self, http: aiohttp.ClientSession) -> None:
+        """Play games back to back until the run ends."""
+        while time.monotonic() < self.stop_at:
+            self.recorder.active_games += 1
+            self.recorder.peak_games = max(self.recorder.peak_games, self.recorder.active_games)
+            try:
+                if self.args.mode == 'online' or (self.args.mode == 'mixed'
+                                                  and random.random() >= self.args.ai_ratio):
+                    await self.online_game(http)
+                else:
+                    await self.ai_game(http)
+            except Exception as e:
+                self.recorder.operation(f'unexpected_{type(e).__name__}', False)
+            finally:
+                self.recorder.active_games -= 1
+
+    async def run(self) -> dict:
+        """Ramp up the game slots and wait for the run to finish."""
+        timeout = aiohttp.ClientTimeout(total=self.args.request_timeout)
+        connector = aiohttp.TCPConnector(limit=self.args.games * 2)
+        started = time.monotonic()
+        self.stop_at = started + self.args.duration
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as http:
+            slots = []
+            interval = self.args.ramp / self.args.games if self.args.games else 0
+            for _ in range(self.args.games):
+                if time.monotonic() >= self.stop_at:
+                    break
+                slots.append(asyncio.create_task(self.slot(http)))
+                if interval:
+                    await asyncio.sleep(interval)
+            await asyncio.gather(*slots)
+        return self.recorder.report(time.monotonic() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:12366', help='Local server URL')
+    parser.add_argument('--games', type=int, default=10, help='Concurrent games to ramp up to')
+    parser.add_argument('--ramp', type=float, default=10.0, help='Seconds to reach --games')
+    parser.add_argument('--duration', type=float, default=60.0, help='Total run time in seconds')
+    parser.add_argument('--mode', choices=['online', 'ai', 'mixed'], default='mixed')
+    parser.add_argument('--ai-ratio', type=float, default=0.5, help='Share of AI games in mixed mode')
+    parser.add_argument('--strategy', choices=['random', 'scripted'], default='random')
+    parser.add_argument('--move-delay', type=float, default=0.0, help='Think time between moves')
+    parser.add_argument('--transports', nargs='+', default=['websocket'],
+                        choices=['polling', 'websocket'], help='Socket.IO transports')
+    parser.add_argument('--request-timeout', type=float, default=30.0)
+    parser.add_argument('--output', help='Write the report to this JSON file')
+    args = parser.parse_args()
+
+    host = urlparse(args.url).hostname
+    if host not in LOCAL_HOSTS:
+        parser.error(f'refusing to load-test non-local host {host!r}; use localhost or 127.0.0.1')
+
+    report = asyncio.run(LoadTest(args).run())
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Compare minimax move ordering schemes at equal depth.
+
+Searches every position in benchmarks/positions.py once per ordering scheme
+and reports nodes searched, cutoffs on the first move tried and search time,
+each relative to the static center-first order. Every scheme must find the
+same root score; the script exits with status 1 if one does not.
+
+Schemes:
+    static          center-first order, no transposition table
+    pv              transposition table, its best move tried first
+    killer-history  killer moves and history table (ai.MoveOrdering)
+    all             both, as search_best_move searches
+
+Usage:
+    python benchmarks/move_ordering.py
+    python benchmarks/move_ordering.py --depth 4 --depth 6 --depth 8 --output ordering.json
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.services import ai
+from positions import POSITIONS, board_from_moves, player_to_move
+
+# Scheme name -> (use a transposition table, use killer/history ordering)
+SCHEMES = {
+    'static': (False, False),
+    'pv': (True, False),
+    'killer-history': (False, True),
+    'all': (True, True),
+}
+
+
+def search(board, player: int, depth: int, use_table: bool, use_ordering: bool) -> dict:
+    """Run one search and return its score, node count, cutoff rate and time."""
+    stats = ai.SearchStats()
+    started = time.perf_counter()
+    score, _ = ai.minimax(board, depth, -math.inf, math.inf, True, player, stats,
+                          {} if use_table else None,
+                          ordering=ai.MoveOrdering() if use_ordering else None)
+    return {
+        'score': score,
+        'nodes': stats.nodes,
+        'cutoffs': stats.cutoffs,
+        'first_move_cutoffs': stats.cutoff_move_index.get(0, 0),
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def run(depths: List[int], category: str = None) -> dict:
+    """Search the corpus with every scheme at every depth."""
+    results = {}
+    mismatches = []
+    for depth in depths:
+        totals: Dict[str, dict] = {name: {'nodes': 0, 'cutoffs': 0, 'first_move_cutoffs': 0,
+                                          'seconds': 0.0} for name in SCHEMES}
+        for position in POSITIONS:
+            if category and position['category'] != category:
+                continue
+            board = board_from_moves(position['moves'])
+            player = player_to_move(position['moves'])
+            scores = {}
+            for name, (use_table, use_ordering) in SCHEMES.items():
+                result = search([row[:] for row in board], player, depth, use_table, use_ordering)
+                scores[name] = result.pop('score')
+                for key, value in result.items():
+                    totals[name][key] += value
+            if len(set(scores.values())) > 1:
+                mismatches.append(f"{position['name']} at depth {depth}: {scores}")
+
+        static = totals['static']
+        results[depth] = {
+            name: {
+                'nodes': total['nodes'],
+                'nodes_vs_static': round(total['nodes'] / static['nodes'], 3),
+                'first_move_cutoff_rate': (round(total['first_move_cutoffs'] / total['cutoffs'], 3)
+                                           if total['cutoffs'] else None),
+                'ms': round(total['seconds'] * 1000, 1),
+                'time_vs_static': round(total['seconds'] / static['seconds'], 3),
+            }
+            for name, total in totals.items()
+        }
+    return {'category': category, 'depths': results, 'mismatches': mismatches}
+
+
+def print_report(results: dict) -> None:
+    """Print one table per depth."""
+    for depth, schemes in results['depths'].items():
+        print(f'depth {depth}')
+        print(f"  {'scheme':<16} {'nodes':>9} {'vs static':>10} {'1st cutoff':>11} "
+              f"{'ms':>9} {'vs static':>10}")
+        for name, result in schemes.items():
+            print(f"  {name:<16} {result['nodes']:>9} {result['nodes_vs_static']:>10} "
+                  f"{str(result['first_move_cutoff_rate']):>11} {result['ms']:>9} "
+                  f"{result['time_vs_static']:>10}")
+    for mismatch in results['mismatches']:
+        print(f'SCORE MISMATCH {mismatch}')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--depth', type=int, action='append',
+                        help='Search depth, repeatable (default: 4 and 6)')
+    parser.add_argument('--category', choices=['opening', 'midgame', 'tactical', 'near_full'],
+                        help='Only run positions of one category')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    results = run(args.depth or [4, 6], args.category)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'\nResults written to {args.output}')
+    return 1 if results['mismatches'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Measure what a move writes to the games row.
+
+Plays random games through the same calls as make_move (events.record with
+its periodic snapshots) on a temporary SQLite database, once rewriting
+board_state on every move as make_move used to, and once leaving it to the
+snapshots as it does now. Reports moves per second and the bytes of
+parameters sent with UPDATE games statements per move.
+
+Usage:
+    python benchmarks/move_writes.py
+    python benchmarks/move_writes.py --games 200 --variant 7x8
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models import Game
+from app.services import board_spec, events, game_logic
+
+
+def play(games: int, spec, rewrite_board: bool, seed: int) -> dict:
+    """Play random games move by move, one commit per move."""
+    rng = random.Random(seed)
+    written = {'statements': 0, 'bytes': 0}
+
+    def count_update(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('UPDATE games '):
+            written['statements'] += 1
+            written['bytes'] += sum(len(str(value)) for value in parameters)
+
+    event.listen(db.engine, 'before_cursor_execute', count_update)
+    moves = 0
+    started = time.perf_counter()
+    for _ in range(games):
+        board = game_logic.create_board(spec)
+        game = Game(game_mode='local', status='playing', current_player=1,
+                    rows=spec.rows, cols=spec.cols, connect=spec.connect)
+        game.checkpoint_board(board)
+        db.session.add(game)
+        db.session.flush()
+        events.record(game, 'created', board)
+        db.session.commit()
+        while game.status == 'playing':
+            game = db.session.get(Game, game.id)
+            board = game.board
+            column = rng.choice(game_logic.get_valid_columns(board))
+            _, row = game_logic.drop_piece(board, column, game.current_player)
+            player = game.current_player
+            game.moves = (game.moves or '') + str(column)
+            if board_spec.winner_at(board, row, column, spec.connect):
+                game.status, game.winner = 'finished', player
+            elif game_logic.is_draw(board):
+                game.status = 'draw'
+            else:
+                game.current_player = 3 - player
+            if rewrite_board:
+                game.checkpoint_board(board)
+            events.record(game, 'move', board, player, column)
+            if game.status != 'playing':
+                events.record(game, 'finished', board)
+            db.session.commit()
+            moves += 1
+    elapsed = time.perf_counter() - started
+    event.remove(db.engine, 'before_cursor_execute', count_update)
+    return {
+        'moves': moves,
+        'moves_per_second': round(moves / elapsed, 1),
+        'update_bytes_per_move': round(written['bytes'] / moves, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=100, help='Random games per variant')
+    parser.add_argument('--variant', choices=sorted(board_spec.VARIANTS), default='standard',
+                        help='Board variant')
+    parser.add_argument('--seed', type=int, default=1, help='Seed of the random games')
+    args = parser.parse_args()
+    spec = board_spec.VARIANTS[args.variant]
+
+    print(f"{'board_state written':<24} {'moves/s':>10} {'UPDATE bytes/move':>18}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = create_app('testing', {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.join(tmp_dir, "moves.db")}'})
+        with app.app_context():
+            db.create_all(bind_key=None)
+            for name, rewrite_board in (('every move', True), ('with snapshots', False)):
+                result = play(args.games, spec, rewrite_board, args.seed)
+                print(f"{name:<24} {result['moves_per_second']:>10} {result['update_bytes_per_move']:>18}")
+            db.session.remove()
+            db.engine.dispose()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
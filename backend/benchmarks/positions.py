@@ -0,0 +1,58 @@
+"""Fixed corpus of benchmark positions.
+
+Each position is a move string: the columns played so far, player 1 first.
+The side to move is the AI player being benchmarked.
+"""
+from typing import List
+from app.services import game_logic
+
+POSITIONS = [
+    # Opening
+    {'name': 'empty', 'category': 'opening', 'moves': ''},
+    {'name': 'center', 'category': 'opening', 'moves': '3'},
+    {'name': 'center-stack', 'category': 'opening', 'moves': '33'},
+    {'name': 'opening-1', 'category': 'opening', 'moves': '4612'},
+    {'name': 'opening-2', 'category': 'opening', 'moves': '36665'},
+    {'name': 'opening-3', 'category': 'opening', 'moves': '544054'},
+    # Midgame
+    {'name': 'midgame-1', 'category': 'midgame', 'moves': '110143651464'},
+    {'name': 'midgame-2', 'category': 'midgame', 'moves': '13266156510624'},
+    {'name': 'midgame-3', 'category': 'midgame', 'moves': '121655513206100'},
+    {'name': 'midgame-4', 'category': 'midgame', 'moves': '210230324511460'},
+    {'name': 'midgame-5', 'category': 'midgame', 'moves': '532542333604120'},
+    {'name': 'midgame-6', 'category': 'midgame', 'moves': '131111135230432552'},
+    # Tactical: an immediate win or forced block is on the board
+    {'name': 'tactical-1', 'category': 'tactical', 'moves': '633332010'},
+    {'name': 'tactical-2', 'category': 'tactical', 'moves': '1432500623215423'},
+    {'name': 'tactical-3', 'category': 'tactical', 'moves': '4464251466661613'},
+    {'name': 'tactical-4', 'category': 'tactical', 'moves': '1350064024041004412154'},
+    {'name': 'tactical-5', 'category': 'tactical', 'moves': '11011151045233024535532656'},
+    {'name': 'tactical-6', 'category': 'tactical', 'moves': '1404246510445120460505136532'},
+    # Near-full
+    {'name': 'near-full-1', 'category': 'near_full', 'moves': '32320423443255444200600552105135'},
+    {'name': 'near-full-2', 'category': 'near_full', 'moves': '654422615326501115625112246645033'},
+    {'name': 'near-full-3', 'category': 'near_full', 'moves': '661430604665116502545245144050013'},
+    {'name': 'near-full-4', 'category': 'near_full', 'moves': '1525606055516632156104610001442233'},
+    {'name': 'near-full-5', 'category': 'near_full', 'moves': '4150532126623426341133166104305546'},
+    {'name': 'near-full-6', 'category': 'near_full', 'moves': '635360212401512205203044165105246636'},
+]
+
+
+def board_from_moves(moves: str) -> List[List[int]]:
+    """Replay a move string on an empty board.
+    
+    Args:
+        moves: Played columns, one digit per move, player 1 first
+        
+    Returns:
+        Resulting game board
+    """
+    board = game_logic.create_board()
+    for ply, column in enumerate(moves):
+        game_logic.drop_piece(board, int(column), 1 + ply % 2)
+    return board
+
+
+def player_to_move(moves: str) -> int:
+    """Player number whose turn it is after the given moves."""
+    return 1 + len(moves) % 2
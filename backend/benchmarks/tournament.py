@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""Play a self-play tournament between AI engine variants.
+
+Every pair of variants plays a round-robin over a set of opening positions,
+each opening once with either variant moving first. Games run in a process
+pool and call game_logic and ai directly, without the Flask app. The report
+gives win/draw/loss per pairing with a 95% confidence interval of the score,
+an Elo difference estimate, average move time per variant and games per second.
+
+A variant is NAME:KEY=VALUE,... with the keys
+    engine      minimax (default) or mcts
+    time        seconds per move (minimax: iterative deepening)
+  minimax:
+    depth       search depth (with time, the maximum depth; default 4)
+    weights     evaluation scores of open windows holding 0/1/2/3 pieces,
+                slash-separated (default 0/1/10/1000)
+    endgame     empty cells at or below which moves are solved exactly
+                (default 16, 0 disables)
+    temperature random moves weighted by evaluation instead of searching
+                (the easy difficulty uses 1000)
+  mcts:
+    iterations  playouts per move (default 4000)
+    exploration UCT exploration constant (default 1.414)
+
+Position caches and MCTS tree reuse are off so move times stay comparable.
+--board plays every game on a board variant of app.services.board_spec
+(standard, 7x8 or connect5).
+
+Usage:
+    python benchmarks/tournament.py --variant d2:depth=2 --variant d4:depth=4
+    python benchmarks/tournament.py --variant d4:depth=4 --variant mcts:engine=mcts,iterations=4000
+    python benchmarks/tournament.py --board connect5 --variant d2:depth=2 --variant d4:depth=4
+    python benchmarks/tournament.py --variant base:depth=4 --variant twos:depth=4,weights=0/1/25/1000 \\
+        --opening-plies 3 --openings 100 --workers 8 --output tournament.json
+"""
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services import engines, evaluation, game_logic
+from app.services.board_spec import STANDARD, VARIANTS, BoardSpec
+
+DEFAULT_VARIANTS = ['depth2:depth=2', 'depth4:depth=4']
+
+# z value of a two-sided 95% confidence interval
+Z_95 = 1.96
+
+
+def parse_variant(spec: str) -> dict:
+    """Parse a NAME:KEY=VALUE,... variant specification.
+
+    Raises:
+        ValueError: If the specification is malformed
+    """
+    name, _, options = spec.partition(':')
+    if not name:
+        raise ValueError(f'variant {spec!r} has no name')
+    variant = {'name': name, 'engine': engines.DEFAULT_ENGINE, 'settings': {}}
+    settings = variant['settings']
+    for option in filter(None, options.split(',')):
+        key, _, value = option.partition('=')
+        if key == 'engine':
+            if value not in engines.ENGINES:
+                raise ValueError(f'unknown engine {value!r} in variant {name!r}')
+            variant['engine'] = value
+        elif key == 'depth':
+            settings['depth'] = int(value)
+            if settings['depth'] < 1:
+                raise ValueError(f'depth of {name!r} must be at least 1')
+        elif key == 'time':
+            settings['time_budget'] = float(value)
+        elif key == 'endgame':
+            settings['endgame_cells'] = int(value)
+        elif key == 'weights':
+            weights = [int(w) for w in value.split('/')]
+            if len(weights) != len(evaluation.WINDOW_SCORES):
+                raise ValueError(f'weights of {name!r} need {len(evaluation.WINDOW_SCORES)} values')
+            settings['window_scores'] = weights
+        elif key == 'temperature':
+            settings['temperature'] = float(value)
+        elif key == 'iterations':
+            settings['iterations'] = int(value)
+        elif key == 'exploration':
+            settings['exploration'] = float(value)
+        else:
+            raise ValueError(f'unknown option {key!r} in variant {name!r}')
+
+    # Engine-specific options must match the engine; caches would skew move times
+    if variant['engine'] == engines.MinimaxEngine.name:
+        invalid = {'iterations', 'exploration'} & set(settings)
+        settings['use_cache'] = False
+    else:
+        invalid = {'depth', 'endgame_cells', 'window_scores', 'temperature'} & set(settings)
+        settings['reuse_tree'] = False
+    if invalid:
+        raise ValueError(f"options {sorted(invalid)} do not apply to the {variant['engine']} engine")
+    return variant
+
+
+def make_openings(plies: int, limit: Optional[int], seed: int,
+                  spec: BoardSpec = STANDARD) -> List[str]:
+    """All move strings of the given length that do not end the game, optionally sampled."""
+    openings = []
+    for moves in itertools.product(range(spec.cols), repeat=plies):
+        board = game_logic.create_board(spec)
+        try:
+            for ply, column in enumerate(moves):
+                game_logic.drop_piece(board, column, 1 + ply % 2)
+        except ValueError:
+            continue
+        if not game_logic.check_winner(board, spec.connect):
+            openings.append(''.join(str(column) for column in moves))
+    if limit is not None and limit < len(openings):
+        openings = sorted(random.Random(seed).sample(openings, limit))
+    return openings
+
+
+def play_game(task: Tuple[dict, dict, str, BoardSpec]) -> dict:
+    """Play one game; the first variant moves first after the opening.
+
+    Returns:
+        Result with the winning variant name (None for a draw) and move times
+    """
+    first, second, opening, spec = task
+    board = game_logic.create_board(spec)
+    for ply, column in enumerate(opening):
+        game_logic.drop_piece(board, int(column), 1 + ply % 2)
+
+    variants = {1: first, 2: second}
+    players = {number: engines.get_engine(variant['engine'], spec=spec, **variant['settings'])
+               for number, variant in variants.items()}
+    move_times = {first['name']: [0.0, 0], second['name']: [0.0, 0]}
+    player = 1 + len(opening) % 2
+    winner = None
+    plies = len(opening)
+    while True:
+        winner = game_logic.check_winner(board, spec.connect)
+        if winner or game_logic.is_draw(board):
+            break
+        variant = variants[player]
+        started = time.perf_counter()
+        column = players[player].choose_move(board, player)
+        elapsed = time.perf_counter() - started
+        move_times[variant['name']][0] += elapsed
+        move_times[variant['name']][1] += 1
+        game_logic.drop_piece(board, column, player)
+        plies += 1
+        player = 3 - player
+
+    return {
+        'first': first['name'],
+        'second': second['name'],
+        'opening': opening,
+        'winner': variants[winner]['name'] if winner else None,
+        'plies': plies,
+        'move_times': move_times,
+    }
+
+
+def score_summary(wins: int, draws: int, losses: int) -> dict:
+    """Score with a normal-approximation 95% confidence interval and Elo estimate."""
+    games = wins + draws + losses
+    if not games:
+        return {'games': 0}
+    score = (wins + 0.5 * draws) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = Z_95 * math.sqrt(variance / games)
+    low, high = max(0.0, score - margin), min(1.0, score + margin)
+
+    def elo(value):
+        if value <= 0 or value >= 1:
+            return None  # Unbounded
+        return round(-400 * math.log10(1 / value - 1), 1)
+
+    return {
+        'games': games,
+        'wins': wins,
+        'draws': draws,
+        'losses': losses,
+        'score': round(score, 4),
+        'score_ci95': [round(low, 4), round(high, 4)],
+        'elo': elo(score),
+        'elo_ci95': [elo(low), elo(high)],
+    }
+
+
+def summarize(variants: List[dict], results: List[dict], elapsed: float,
+              spec: BoardSpec = STANDARD) -> dict:
+    """Aggregate game results per pairing and per variant."""
+    names = [variant['name'] for variant in variants]
+    pairings: Dict[Tuple[str, str], List[int]] = {pair: [0, 0, 0]
+                                                   for pair in itertools.combinations(names, 2)}
+    totals = {name: [0, 0, 0] for name in names}
+    move_times = {name: [0.0, 0] for name in names}
+    plies = 0
+    for result in results:
+        plies += result['plies']
+        for name, (seconds, moves) in result['move_times'].items():
+            move_times[name][0] += seconds
+            move_times[name][1] += moves
+        pair = (result['first'], result['second'])
+        if pair not in pairings:
+            pair = pair[::-1]
+        for index, name in enumerate(pair):
+            outcome = 1 if result['winner'] is None else (0 if result['winner'] == name else 2)
+            totals[name][outcome] += 1
+            if index == 0:
+                pairings[pair][outcome] += 1
+
+    return {
+        'board': spec.to_dict(),
+        'variants': variants,
+        'games': len(results),
+        'seconds': round(elapsed, 2),
+        'games_per_second': round(len(results) / elapsed, 2) if elapsed else None,
+        'average_plies': round(plies / len(results), 1) if results else None,
+        'pairings': {f'{a} vs {b}': score_summary(*counts) for (a, b), counts in pairings.items()},
+        'totals': {name: dict(score_summary(*totals[name]),
+                              avg_move_ms=(round(move_times[name][0] / move_times[name][1] * 1000, 3)
+                                           if move_times[name][1] else None))
+                   for name in names},
+    }
+
+
+def print_report(report: dict) -> None:
+    """Print the tournament summary as tables."""
+    print(f"{report['games']} games in {report['seconds']}s "
+          f"({report['games_per_second']} games/s, {report['average_plies']} plies/game)\n")
+    print(f"{'pairing':<32} {'W':>5} {'D':>5} {'L':>5} {'score':>7} {'95% CI':>17} {'elo':>8}")
+    for pairing, summary in report['pairings'].items():
+        low, high = summary['score_ci95']
+        print(f"{pairing:<32} {summary['wins']:>5} {summary['draws']:>5} {summary['losses']:>5} "
+              f"{summary['score']:>7} {f'{low:.3f}-{high:.3f}':>17} {str(summary['elo']):>8}")
+    print(f"\n{'variant':<16} {'W':>5} {'D':>5} {'L':>5} {'score':>7} {'avg move ms':>12}")
+    for name, summary in report['totals'].items():
+        print(f"{name:<16} {summary['wins']:>5} {summary['draws']:>5} {summary['losses']:>5} "
+              f"{summary['score']:>7} {summary['avg_move_ms']:>12}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--variant', action='append', dest='variants',
+                        help='Engine variant NAME:KEY=VALUE,... (repeatable, at least two)')
+    parser.add_argument('--board', choices=sorted(VARIANTS), default='standard',
+                        help='Board variant to play on (default standard)')
+    parser.add_argument('--opening-plies', type=int, default=2,
+                        help='Length of the opening move sequences (default 2)')
+    parser.add_argument('--openings', type=int, help='Sample this many openings')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the opening sample')
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--output', help='Write the report to this JSON file')
+    args = parser.parse_args()
+
+    try:
+        variants = [parse_variant(spec) for spec in args.variants or DEFAULT_VARIANTS]
+    except ValueError as e:
+        parser.error(str(e))
+    if len(variants) < 2 or len({variant['name'] for variant in variants}) != len(variants):
+        parser.error('need at least two variants with distinct names')
+
+    spec = VARIANTS[args.board]
+    openings = make_openings(args.opening_plies, args.openings, args.seed, spec)
+    tasks = [(first, second, opening, spec)
+             for a, b in itertools.combinations(variants, 2)
+             for opening in openings
+             for first, second in ((a, b), (b, a))]
+
+    started = time.perf_counter()
+    results = []
+    with multiprocessing.Pool(processes=args.workers) as pool:
+        for done, result in enumerate(pool.imap_unordered(play_game, tasks, chunksize=4), 1):
+            results.append(result)
+            print(f'\r{done}/{len(tasks)} games', end='', file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+
+    report = summarize(variants, results, time.perf_counter() - started, spec)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nResults written to {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Shared fixtures: an app on a temporary SQLite database."""
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app, database
+from app.database import REPLICA_BIND_KEY
+from app.extensions import db
+from app.models import User
+
+
+def make_app(tmp_path, **overrides):
+    """Create the testing app on a SQLite file in tmp_path with the tables created."""
+    config = {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "primary.db"}',
+    }
+    config.update(overrides)
+    app = create_app('testing', config)
+    with app.app_context():
+        # Only the primary: a replica bind of an earlier app stays in db.metadatas
+        db.create_all(bind_key=None)
+    return app
+
+
+def close_app(app) -> None:
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = make_app(tmp_path)
+    yield app
+    close_app(app)
+
+
+@pytest.fixture
+def replicated_app(tmp_path):
+    """App whose read-only views read a replica file that never gets the primary's writes."""
+    database._sticky_until.clear()
+    app = make_app(tmp_path, SQLALCHEMY_BINDS={REPLICA_BIND_KEY: f'sqlite:///{tmp_path / "replica.db"}'},
+                   DB_REPLICA_STICKY_SECONDS=60)
+    with app.app_context():
+        db.metadata.create_all(db.engines[REPLICA_BIND_KEY])
+    yield app
+    database._sticky_until.clear()
+    close_app(app)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def auth_header(app, user_id: int) -> dict:
+    """Authorization header with an access token for a user id."""
+    with app.app_context():
+        token = create_access_token(identity=str(user_id))
+    return {'Authorization': f'Bearer {token}'}
+
+
+def make_user(app, username: str) -> int:
+    """Create a user on the primary and return its id."""
+    with app.app_context():
+        user = User(username=username, email=f'{username}@example.com')
+        user.set_password('secret')
+        db.session.add(user)
+        db.session.commit()
+        return user.id
@@ -0,0 +1,64 @@
+"""Batch position analysis."""
+import json
+import random
+import pytest
+from app.services import analysis, evaluation
+from app.services.board_spec import STANDARD, VARIANTS, BoardSpec
+from app.services.game_logic import check_winner, create_board, drop_piece, get_valid_columns
+
+SPECS = [STANDARD, VARIANTS['7x8'], VARIANTS['connect5'], BoardSpec(5, 6, 3)]
+
+
+def random_game(spec: BoardSpec, seed: int):
+    rng = random.Random(seed)
+    board = create_board(spec)
+    moves = []
+    while get_valid_columns(board) and not check_winner(board, spec.connect):
+        column = rng.choice(get_valid_columns(board))
+        drop_piece(board, column, 1 + len(moves) % 2)
+        moves.append(column)
+    return moves
+
+
+def random_positions(spec: BoardSpec, count: int):
+    boards = []
+    seed = 0
+    while len(boards) < count:
+        boards.extend(analysis.boards_from_moves(random_game(spec, seed), spec))
+        seed += 1
+    return boards[:count]
+
+
+@pytest.mark.parametrize('spec', SPECS)
+@pytest.mark.parametrize('count', [3, 60])
+def test_static_evaluations_match_evaluate(spec, count):
+    boards = random_positions(spec, count)
+
+    expected = [evaluation.evaluate(board, analysis.player_to_move(board), spec=spec)
+                for board in boards]
+    assert analysis.static_evaluations(boards, spec) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('spec', SPECS)
+def test_evaluate_batch_matches_evaluate_for_both_players(spec):
+    pytest.importorskip('numpy')
+    boards = random_positions(spec, 80)
+    for player in (1, 2):
+        expected = [evaluation.evaluate(board, player, spec=spec) for board in boards]
+        assert evaluation.evaluate_batch(boards, player, spec=spec).tolist() == pytest.approx(expected)
+
+
+def test_positions_must_have_the_shape_of_the_spec():
+    spec = VARIANTS['7x8']
+    analysis.validate_board(create_board(spec), spec)
+    with pytest.raises(ValueError, match='7 rows of 8 cells'):
+        analysis.validate_board(create_board(STANDARD), spec)
+
+
+def test_analyze_route_accepts_a_board_variant(client):
+    response = client.post('/api/ai/analyze', json={'moves': [7, 0, 7], 'variant': '7x8', 'depth': 2})
+    lines = response.get_data(as_text=True).splitlines()
+    results = sorted((json.loads(line) for line in lines), key=lambda result: result['index'])
+
+    assert [result['played'] for result in results] == [7, 0, 7]
+    assert all(result['status'] == 'playing' and 'evaluation' in result for result in results)
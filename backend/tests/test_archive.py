@@ -0,0 +1,21 @@
+"""Archived games keep the shape of live games."""
+from app.extensions import db
+from app.services.archive import archive_finished_games
+
+
+def test_archived_game_has_the_live_keys(app, client):
+    game_id = client.post('/api/game/local', json={'variant': '7x8'}).get_json()['id']
+    for column in (0, 1, 0, 1, 0, 1, 0):
+        response = client.post(f'/api/game/{game_id}/move', json={'column': column})
+    live = response.get_json()
+    assert live['status'] == 'finished'
+
+    with app.app_context():
+        assert archive_finished_games(older_than_days=0) == 1
+        db.session.remove()
+    archived = client.get(f'/api/game/{game_id}').get_json()
+
+    assert archived.pop('archived') is True
+    assert set(archived) == set(live)
+    for key in ('seq', 'ai_engine', 'difficulty', 'board_spec', 'board_state', 'winner'):
+        assert archived[key] == live[key]
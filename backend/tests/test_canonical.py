@@ -0,0 +1,70 @@
+"""Mirror-reduced position keys and the AI move cache."""
+import random
+import pytest
+from app.services import ai, canonical
+from app.services.board_spec import STANDARD, VARIANTS
+from app.services.game_logic import create_board, drop_piece, get_valid_columns
+from app.utils.cache import LRUCache
+
+
+def random_board(spec, moves: int, seed: int):
+    rng = random.Random(seed)
+    board = create_board(spec)
+    for ply in range(moves):
+        drop_piece(board, rng.choice(get_valid_columns(board)), 1 + ply % 2)
+    return board
+
+
+@pytest.mark.parametrize('spec', list(VARIANTS.values()))
+def test_a_board_and_its_mirror_share_a_key(spec):
+    for seed in range(20):
+        board = random_board(spec, moves=seed % 12, seed=seed)
+        mirrored = [row[::-1] for row in board]
+        key, flipped = canonical.position_key(board)
+        mirrored_key, mirrored_flipped = canonical.position_key(mirrored)
+
+        assert key == mirrored_key
+        # Exactly one orientation is canonical unless the board is symmetric
+        assert flipped != mirrored_flipped or board == mirrored
+
+
+def test_mirror_is_an_involution():
+    bits = canonical.layout(VARIANTS['7x8'])
+    _, mask, _ = canonical.to_bitboards(random_board(VARIANTS['7x8'], 15, seed=4))
+    assert canonical.mirror(canonical.mirror(mask, bits), bits) == mask
+
+
+@pytest.mark.parametrize('cols', [4, 7, 8])
+def test_map_move_round_trips(cols):
+    for col in range(cols):
+        assert canonical.map_move(col, False, cols) == col
+        assert canonical.map_move(canonical.map_move(col, True, cols), True, cols) == col
+        assert canonical.map_move(col, True, cols) == cols - 1 - col
+
+
+def test_cached_move_is_mirrored_for_the_mirrored_board():
+    cache = LRUCache(16)
+    board = create_board(STANDARD)
+    for col, player in ((0, 1), (1, 2), (0, 1), (1, 2), (0, 1)):
+        drop_piece(board, col, player)
+    mirrored = [row[::-1] for row in board]
+
+    # Player 2 must block column 0, or column 6 on the mirrored board
+    assert ai.get_ai_move(board, 2, cache=cache) == 0
+    assert ai.get_ai_move(mirrored, 2, cache=cache) == STANDARD.cols - 1
+    assert cache.to_dict()['hits'] == 1
+
+
+def test_cache_hits_are_counted_in_the_search_stats():
+    cache = LRUCache(16)
+    board = random_board(STANDARD, 6, seed=3)
+    searched, cached = ai.SearchStats(), ai.SearchStats()
+    totals_before = ai.search_totals.cache_hits
+
+    col = ai.get_ai_move(board, 1, searched, depth=3, cache=cache)
+    assert ai.get_ai_move(board, 1, cached, depth=3, cache=cache) == col
+
+    assert searched.cache_hits == 0
+    assert (cached.cache_hits, cached.searches, cached.nodes) == (1, 0, 0)
+    assert cached.to_dict()['cache_hits'] == 1
+    assert ai.search_totals.cache_hits == totals_before + 1
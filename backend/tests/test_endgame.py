@@ -0,0 +1,62 @@
+"""Exact endgame solver against an exhaustive search."""
+import random
+import pytest
+from app.services import endgame
+from app.services.board_spec import STANDARD, BoardSpec
+from app.services.game_logic import check_winner, create_board, drop_piece, get_valid_columns
+
+
+def brute_force(board, player: int, moves: int, spec: BoardSpec) -> int:
+    """Score of the side to move by searching every continuation, no pruning."""
+    columns = get_valid_columns(board)
+    if not columns:
+        return 0
+    children = []
+    for col in columns:
+        child = [row[:] for row in board]
+        drop_piece(child, col, player)
+        if check_winner(child, spec.connect):
+            return (spec.cells + 1 - moves) // 2
+        children.append(child)
+    return max(-brute_force(child, 3 - player, moves + 1, spec) for child in children)
+
+
+def endgame_positions(spec: BoardSpec, empty: int, count: int, seed: int):
+    """Random positions without a winner that have `empty` cells left."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = create_board(spec)
+        moves = 0
+        while moves < spec.cells - empty:
+            drop_piece(board, rng.choice(get_valid_columns(board)), 1 + moves % 2)
+            moves += 1
+            if check_winner(board, spec.connect):
+                break
+        else:
+            positions.append((board, 1 + moves % 2, moves))
+    return positions
+
+
+@pytest.mark.parametrize('spec', [STANDARD, BoardSpec(5, 6, 4)])
+def test_solve_matches_brute_force(spec):
+    endgame.cache.clear()
+    for board, player, moves in endgame_positions(spec, empty=9, count=25, seed=spec.cells):
+        expected = brute_force(board, player, moves, spec)
+        score, col = endgame.solve(board, spec)
+
+        assert score == expected
+        child = [row[:] for row in board]
+        drop_piece(child, col, player)
+        if not check_winner(child, spec.connect):
+            assert -brute_force(child, 3 - player, moves + 1, spec) == expected
+
+
+def test_solve_answers_mirrored_positions_from_the_cache():
+    endgame.cache.clear()
+    board, player, moves = endgame_positions(STANDARD, empty=9, count=1, seed=3)[0]
+    mirrored = [row[::-1] for row in board]
+
+    score, col = endgame.solve(board)
+    assert endgame.solve(mirrored) == (score, STANDARD.cols - 1 - col)
+    assert endgame.cache.to_dict()['hits'] == 1
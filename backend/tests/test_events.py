@@ -0,0 +1,80 @@
+"""Game event log: replaying games and forfeits."""
+from app.extensions import db
+from app.models import Game, GameEvent
+from app.services import events
+
+# A local game won by player 1 on move 35, past two snapshot intervals
+WINNING_GAME = [int(column) for column in '36466334641164354610321040535100012']
+
+
+def play(client, columns, **body):
+    game_id = client.post('/api/game/local', json=body).get_json()['id']
+    for column in columns:
+        response = client.post(f'/api/game/{game_id}/move', json={'column': column})
+        assert response.status_code == 200, response.get_json()
+    return game_id
+
+
+def game_row(app, game_id: int) -> dict:
+    with app.app_context():
+        row = dict(db.session.execute(db.select(Game.__table__).where(Game.id == game_id)).mappings().one())
+        db.session.remove()
+        return row
+
+
+def test_board_is_replayed_past_the_last_checkpoint(app, client):
+    game_id = play(client, WINNING_GAME[:20])
+    live = client.get(f'/api/game/{game_id}').get_json()
+    row = game_row(app, game_id)
+
+    # Moves since the snapshot at event 16 (move 15) are not in board_state yet
+    assert row['board_moves'] == 15
+    assert sum(cell != 0 for line in live['board_state'] for cell in line) == 20
+    with app.app_context():
+        assert events.load_state(game_id).board == live['board_state']
+
+
+def test_project_games_rebuilds_the_live_row(app, client):
+    finished = play(client, WINNING_GAME)
+    playing = play(client, WINNING_GAME[:21], variant='7x8')
+    expected = {game_id: client.get(f'/api/game/{game_id}').get_json() for game_id in (finished, playing)}
+    assert expected[finished]['status'] == 'finished' and expected[finished]['winner'] == 1
+
+    with app.app_context():
+        # Drop the play state, then rebuild it from the log alone
+        db.session.execute(db.update(Game).values(board_state='[]', board_moves=0, moves='',
+                                                  status='waiting', winner=None, current_player=1,
+                                                  updated_at=Game.updated_at))
+        db.session.commit()
+        assert events.project_games() == {'games': 2, 'updated': 2}
+
+    for game_id in (finished, playing):
+        assert client.get(f'/api/game/{game_id}').get_json() == expected[game_id]
+
+
+def test_project_games_is_idempotent(app, client):
+    game_ids = [play(client, WINNING_GAME[:n]) for n in (5, 18, len(WINNING_GAME))]
+    with app.app_context():
+        events.project_games(batch_size=2)
+    once = [game_row(app, game_id) for game_id in game_ids]
+    with app.app_context():
+        events.project_games(batch_size=2)
+
+    assert [game_row(app, game_id) for game_id in game_ids] == once
+
+
+def test_resign_is_logged_and_replayed(app, client):
+    game_id = play(client, [3, 3, 4])
+    response = client.post(f'/api/game/{game_id}/resign')
+    assert response.status_code == 200
+    assert (response.get_json()['status'], response.get_json()['winner']) == ('finished', 1)
+    assert client.post(f'/api/game/{game_id}/resign').status_code == 400
+
+    with app.app_context():
+        logged = db.session.execute(
+            db.select(GameEvent.type, GameEvent.player).where(GameEvent.game_id == game_id)
+            .order_by(GameEvent.seq)
+        ).all()
+        state = events.load_state(game_id)
+    assert logged[-2:] == [('resign', 2), ('finished', None)]
+    assert (state.status, state.winner, state.moves) == ('finished', 1, '334')
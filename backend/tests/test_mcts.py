@@ -0,0 +1,26 @@
+"""Monte Carlo tree search move choice."""
+import pytest
+from app.services import engines, mcts
+from app.services.game_logic import create_board, drop_piece
+
+
+@pytest.mark.parametrize('settings', [{'iterations': 0}, {'iterations': 100, 'time_budget': 0.0}])
+def test_search_without_budget_still_plays_a_legal_move(settings):
+    board = create_board()
+    for col in range(6):
+        drop_piece(board, 0, 1 + col % 2)
+
+    col, info = mcts.search(board, seed=1, **settings)
+
+    assert col in range(1, 7)
+    assert info['iterations'] == 1
+
+
+def test_engines_must_implement_choose_move():
+    class Silent(engines.Engine):
+        name = 'silent'
+
+    with pytest.raises(TypeError):
+        Silent()
+    for engine_class in engines.ENGINES.values():
+        assert engine_class().choose_move(create_board(), 2) in range(7)
@@ -0,0 +1,50 @@
+"""Metrics endpoint and SQL statement timing."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app import metrics
+from app.extensions import db
+from tests.conftest import close_app, make_app
+
+
+def test_failed_statement_leaves_no_timer_behind(app):
+    with app.app_context():
+        before = metrics.DB_QUERIES.value()
+        with pytest.raises(OperationalError):
+            db.session.execute(text('SELECT * FROM no_such_table'))
+        db.session.rollback()
+        db.session.execute(text('SELECT 1'))
+        connection = db.session.connection()
+
+        assert 'metrics_query_start' not in connection.info
+        assert metrics.DB_QUERIES.value() == before + 1
+
+
+def test_active_counts_are_reused_within_the_ttl(app, client):
+    metrics._active_counts = None
+    client.post('/api/game/local', json={})
+    assert 'bingo_active{kind="games"} 1' in client.get('/api/metrics').get_data(as_text=True)
+
+    client.post('/api/game/local', json={})
+    assert 'bingo_active{kind="games"} 1' in client.get('/api/metrics').get_data(as_text=True)
+
+    metrics._active_counts = None
+    assert 'bingo_active{kind="games"} 2' in client.get('/api/metrics').get_data(as_text=True)
+
+
+def test_metrics_token_is_required_when_set(tmp_path):
+    app = make_app(tmp_path, METRICS_TOKEN='scrape-secret')
+    client = app.test_client()
+
+    assert client.get('/api/metrics').status_code == 401
+    assert client.get('/api/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/api/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+    close_app(app)
+
+
+def test_metric_types_must_implement_samples():
+    class Untyped(metrics.Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Untyped('bingo_untyped', 'Missing samples()')
@@ -0,0 +1,31 @@
+"""Taking pondered AI replies."""
+from concurrent.futures import Future
+import pytest
+from app.services import ponder
+from app.services.engines import MinimaxEngine
+
+
+@pytest.fixture
+def pondered():
+    """Searches of game 1 after the moves '33': column 0 finished, column 1 running."""
+    finished, running = Future(), Future()
+    finished.set_result(4)
+    running.set_running_or_notify_cancel()
+    ponder._games[1] = ponder._Ponder('33', MinimaxEngine(), {0: finished, 1: running})
+    yield finished, running
+    ponder._games.clear()
+
+
+def test_take_returns_a_finished_reply(pondered):
+    assert ponder.take(1, '33', 0, MinimaxEngine()) == 4
+    assert ponder.pondering() == 0
+
+
+def test_take_does_not_wait_for_a_running_search(pondered):
+    _, running = pondered
+    assert ponder.take(1, '33', 1, MinimaxEngine()) is None
+    assert not running.done()  # Left to finish unused, nobody blocked on it
+
+
+def test_take_ignores_replies_to_another_position(pondered):
+    assert ponder.take(1, '34', 0, MinimaxEngine()) is None
@@ -0,0 +1,128 @@
+"""Presence registry, heartbeat expiry and timeout claims on absent opponents."""
+import time
+import pytest
+from flask_jwt_extended import create_access_token
+from app.extensions import socketio
+from app.models import GameEvent
+from app.services import presence
+from app.services.presence import Departure, LocalPresenceBackend, PresenceBackend
+from tests.conftest import auth_header, make_user
+
+
+@pytest.fixture(autouse=True)
+def backend(monkeypatch):
+    backend = LocalPresenceBackend()
+    monkeypatch.setattr(presence, 'backend', backend)
+    return backend
+
+
+def test_user_stays_in_a_room_until_their_last_sid_leaves(backend):
+    assert backend.connect('a', 1, now=0)
+    assert not backend.connect('b', 1, now=0)
+    assert backend.join('a', 'game_1')
+    assert not backend.join('b', 'game_1')
+
+    assert not backend.leave('a', 'game_1')
+    assert backend.is_present('game_1', 1)
+    assert backend.disconnect('b') == Departure(1, ['game_1'], False)
+    assert not backend.is_present('game_1', 1)
+    assert backend.disconnect('a') == Departure(1, [], True)
+    assert not backend.is_online(1)
+    assert backend.disconnect('a') is None
+
+
+def test_expired_lists_sids_without_a_recent_heartbeat(backend):
+    backend.connect('a', 1, now=0)
+    backend.connect('b', 2, now=0)
+    assert backend.heartbeat('b', now=50)
+    assert not backend.heartbeat('unknown', now=50)
+
+    assert backend.expired(now=60, ttl=60) == []
+    assert backend.expired(now=61, ttl=60) == ['a']
+    assert sorted(backend.expired(now=111, ttl=60)) == ['a', 'b']
+
+
+def connect_socket(app, user_id: int):
+    with app.app_context():
+        token = create_access_token(identity=str(user_id))
+    socket = socketio.test_client(app, auth={'token': token})
+    socket.get_received()
+    return socket
+
+
+def start_online_game(app, client) -> int:
+    host, guest = make_user(app, 'host'), make_user(app, 'guest')
+    code = client.post('/api/lobby/create', headers=auth_header(app, host)).get_json()['code']
+    room = client.post(f'/api/lobby/join/{code}', headers=auth_header(app, guest)).get_json()
+    response = client.post(f"/api/lobby/start/{room['id']}", headers=auth_header(app, host))
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['id']
+
+
+def sid_of(socket) -> str:
+    return socketio.server.manager.sid_from_eio_sid(socket.eio_sid, '/')
+
+
+def test_sweep_expires_silent_sids_and_announces_them(app, backend):
+    game_id = start_online_game(app, app.test_client())
+    silent, watcher = connect_socket(app, 1), connect_socket(app, 2)
+    silent.emit('join_game', {'game_id': game_id})
+    watcher.emit('join_game', {'game_id': game_id})
+    watcher.get_received()
+    later = time.time() + app.config['PRESENCE_TTL'] + 1
+    backend.heartbeat(sid_of(watcher), later)
+
+    assert presence.expire(later) == 1
+
+    room = presence.game_room(game_id)
+    assert backend.members(room) == [2]
+    assert not backend.is_online(1)
+    assert not silent.is_connected()
+    announced = [event['args'][0] for event in watcher.get_received() if event['name'] == 'presence']
+    assert announced == [{'room': room, 'user_id': 1, 'present': False, 'members': [2]}]
+    assert presence.expire(later) == 0
+    watcher.disconnect()
+
+
+def test_timeout_is_claimed_once_the_opponent_is_away_past_the_grace(app, client):
+    game_id = start_online_game(app, client)
+    host, guest = auth_header(app, 1), auth_header(app, 2)
+    assert client.post(f'/api/game/{game_id}/move', json={'column': 3}, headers=host).status_code == 200
+    away = connect_socket(app, 2)
+    away.emit('join_game', {'game_id': game_id})
+
+    def claim(headers):
+        return client.post(f'/api/game/{game_id}/claim-timeout', headers=headers)
+
+    assert claim(guest).status_code == 409  # Their own turn
+    assert claim(host).get_json() == {'error': 'Opponent is connected'}
+    away.disconnect()
+    assert claim(host).get_json() == {'error': 'Opponent still has time to move'}
+
+    app.config['PRESENCE_FORFEIT_GRACE'] = 0
+    response = claim(host)
+
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'finished'
+    assert response.get_json()['winner'] == 1
+    with app.app_context():
+        logged = GameEvent.query.filter_by(game_id=game_id).order_by(GameEvent.seq).all()
+        assert [(row.type, row.player) for row in logged[-2:]] == [('timeout', 2), ('finished', None)]
+    assert claim(host).status_code == 400
+
+
+def test_register_backend_rejects_incomplete_backends(monkeypatch):
+    monkeypatch.setattr(presence, 'BACKENDS', dict(presence.BACKENDS))
+
+    class Partial(PresenceBackend):
+        def connect(self, sid, user_id, now):
+            return True
+
+    with pytest.raises(TypeError):
+        presence.register_backend('dict', dict)
+    with pytest.raises(TypeError, match='Partial does not implement'):
+        presence.register_backend('partial', Partial)
+    with pytest.raises(TypeError):
+        Partial()
+    presence.register_backend('copy', type('Copy', (LocalPresenceBackend,), {}))
+    assert 'copy' in presence.BACKENDS
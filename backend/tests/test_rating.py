@@ -0,0 +1,59 @@
+"""Elo updates of online games and the batch recompute."""
+import random
+import pytest
+from app.extensions import db
+from app.models import Game, Player, User
+from app.services import rating
+from tests.conftest import make_user
+
+
+def finished_online_game(user1: int, user2: int, winner: int) -> Game:
+    game = Game(game_mode='online', status='finished', winner=winner, board_state='[]')
+    game.players = [
+        Player(user_id=user1, nickname='one', color='red', player_number=1),
+        Player(user_id=user2, nickname='two', color='yellow', player_number=2),
+    ]
+    db.session.add(game)
+    return game
+
+
+def test_update_ratings_applies_the_elo_change(app):
+    alice, bob = make_user(app, 'alice'), make_user(app, 'bob')
+    with app.app_context():
+        db.session.get(User, alice).rating = 1400.0
+        db.session.commit()
+        expected = rating.elo_update(1400.0, rating.DEFAULT_RATING, 0.0)
+
+        rating.update_ratings(finished_online_game(alice, bob, winner=2))
+        db.session.commit()
+        db.session.expire_all()
+
+        assert db.session.get(User, alice).rating == pytest.approx(expected[0])
+        assert db.session.get(User, bob).rating == pytest.approx(expected[1])
+        assert db.session.get(User, alice).rated_games == db.session.get(User, bob).rated_games == 1
+
+
+def test_numpy_replay_matches_sequential_updates():
+    np = pytest.importorskip('numpy')
+    rng = random.Random(7)
+    players = 12
+    a, b, scores = [], [], []
+    for _ in range(500):
+        i, j = rng.sample(range(players), 2)
+        a.append(i)
+        b.append(j)
+        scores.append(rng.choice((0.0, 0.5, 1.0)))
+
+    expected = [rating.DEFAULT_RATING] * players
+    expected_counts = [0] * players
+    for i, j, score in zip(a, b, scores):
+        expected[i], expected[j] = rating.elo_update(expected[i], expected[j], score)
+        expected_counts[i] += 1
+        expected_counts[j] += 1
+
+    ratings = np.full(players, rating.DEFAULT_RATING)
+    counts = np.zeros(players, dtype=np.int64)
+    rating._replay_chunk_numpy(ratings, counts, a, b, scores, rating.K_FACTOR)
+
+    assert ratings.tolist() == pytest.approx(expected)
+    assert counts.tolist() == expected_counts
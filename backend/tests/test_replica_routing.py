@@ -0,0 +1,57 @@
+"""Read-your-writes routing between the primary and a replica SQLite file.
+
+The replica is a separate database that never receives the primary's
+writes, so a read that finds a freshly written row must have gone to the
+primary and a read that misses it went to the replica.
+"""
+from flask_jwt_extended import create_access_token
+from app.extensions import socketio
+from tests.conftest import auth_header
+
+
+def create_game(app, user_id: int) -> int:
+    response = app.test_client().post('/api/game/local', json={}, headers=auth_header(app, user_id))
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def test_writer_reads_from_primary(replicated_app):
+    game_id = create_game(replicated_app, 1)
+
+    response = replicated_app.test_client().get(f'/api/game/{game_id}', headers=auth_header(replicated_app, 1))
+
+    assert response.status_code == 200
+    assert response.get_json()['id'] == game_id
+
+
+def test_other_clients_read_from_replica(replicated_app):
+    game_id = create_game(replicated_app, 1)
+
+    other_user = replicated_app.test_client().get(f'/api/game/{game_id}', headers=auth_header(replicated_app, 2))
+    anonymous = replicated_app.test_client().get(f'/api/game/{game_id}')
+
+    # Same address as the writer, but keyed by user, so neither is pinned
+    assert other_user.status_code == 404
+    assert anonymous.status_code == 404
+
+
+def connect_socket(app, user_id: int):
+    with app.app_context():
+        token = create_access_token(identity=str(user_id))
+    socket = socketio.test_client(app, auth={'token': token})
+    socket.get_received()
+    return socket
+
+
+def test_socket_reads_follow_the_users_rest_write(replicated_app):
+    writer = connect_socket(replicated_app, 1)
+    other = connect_socket(replicated_app, 2)
+    game_id = create_game(replicated_app, 1)
+
+    writer.emit('join_game', {'game_id': game_id})
+    other.emit('join_game', {'game_id': game_id})
+
+    assert [event['name'] for event in writer.get_received()] == ['presence', 'joined_game']
+    assert other.get_received() == [{'name': 'error', 'args': [{'message': 'Game not found'}], 'namespace': '/'}]
+    writer.disconnect()
+    other.disconnect()
@@ -0,0 +1,71 @@
+"""Catch-up of reconnecting clients once the ring buffers evict events."""
+import pytest
+from app.extensions import socketio
+from app.services import resume
+from tests.conftest import close_app, make_app
+
+BUFFER_SIZE = 4
+
+
+@pytest.fixture
+def app(tmp_path):
+    resume.buffers.clear()
+    app = make_app(tmp_path, RESUME_BUFFER_SIZE=BUFFER_SIZE, RESUME_MAX_GAMES=2)
+    yield app
+    resume.buffers.clear()
+    close_app(app)
+
+
+def play(client, moves: int) -> int:
+    """Create a local game, make `moves` moves and return its id (seq is moves + 1)."""
+    game_id = client.post('/api/game/local', json={}).get_json()['id']
+    for column in range(moves):
+        assert client.post(f'/api/game/{game_id}/move', json={'column': column % 7}).status_code == 200
+    return game_id
+
+
+def seqs(entries) -> list:
+    return [entry['seq'] for entry in entries]
+
+
+def test_missed_only_covers_the_buffered_events(app, client):
+    game_id = play(client, 6)  # Events 1-7, the buffer keeps 4-7
+
+    assert seqs(resume.missed(game_id, 5)) == [6, 7]
+    assert resume.missed(game_id, 7) == []
+    assert seqs(resume.missed(game_id, 3)) == [4, 5, 6, 7]
+    assert resume.missed(game_id, 2) is None
+    assert resume.missed(game_id, 8) is None
+
+
+def test_logged_reads_evicted_events_up_to_the_buffer_size(app, client):
+    game_id = play(client, 6)
+
+    with app.app_context():
+        assert seqs(resume.logged(game_id, 3, 7)) == [4, 5, 6, 7]
+        assert resume.logged(game_id, 3, 7) == resume.missed(game_id, 3)
+        assert resume.logged(game_id, 7, 7) == []
+        # More missed than a buffer holds, or a client ahead of the game
+        assert resume.logged(game_id, 2, 7) is None
+        assert resume.logged(game_id, 8, 7) is None
+
+
+def test_evicted_game_falls_back_to_the_log_then_the_snapshot(app, client):
+    first = play(client, 6)
+    play(client, 1)
+    play(client, 1)  # Evicts the least recently used game
+
+    assert first not in resume.buffers
+    assert resume.missed(first, 4) is None
+    socket = socketio.test_client(app)
+    socket.get_received()
+
+    socket.emit('resume', {'game_id': first, 'last_seq': 4})
+    socket.emit('resume', {'game_id': first, 'last_seq': 2, 'spectate': True})
+    replies = socket.get_received()
+
+    assert [reply['name'] for reply in replies] == ['resume_events', 'resume_snapshot']
+    assert replies[0]['args'][0]['seq'] == 7
+    assert seqs(replies[0]['args'][0]['events']) == [5, 6, 7]
+    assert replies[1]['args'][0]['game']['seq'] == 7
+    socket.disconnect()
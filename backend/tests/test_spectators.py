@@ -0,0 +1,37 @@
+"""Spectator frames: chunked emits to the spectator room only."""
+from app.extensions import socketio
+from app.services import spectators
+from tests.conftest import auth_header
+
+
+def create_game(client, user_id: int, app) -> int:
+    response = client.post('/api/game/local', json={}, headers=auth_header(app, user_id))
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def spectator_updates(socket) -> list:
+    return [event['args'][0] for event in socket.get_received() if event['name'] == 'spectator_update']
+
+
+def test_flush_sends_one_frame_to_every_spectator_in_chunks(app, client):
+    game_id = create_game(client, 1, app)
+    watchers = [socketio.test_client(app) for _ in range(5)]
+    for socket in watchers:
+        socket.emit('spectate_game', {'game_id': game_id})
+        socket.get_received()
+    bystander = socketio.test_client(app)
+    bystander.get_received()
+    spectators.discard()
+    spectators._pending[game_id] = {'id': game_id, 'seq': 3}
+
+    with app.app_context():
+        reached = spectators.flush(chunk_size=2)
+
+    assert reached == 5
+    for socket in watchers:
+        assert spectator_updates(socket) == [{'id': game_id, 'seq': 3, 'spectators': 5}]
+    assert bystander.get_received() == []
+    assert spectators.flush(chunk_size=2) == 0
+    for socket in watchers + [bystander]:
+        socket.disconnect()
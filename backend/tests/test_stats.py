@@ -0,0 +1,52 @@
+"""Incremental user stats and the cached leaderboard."""
+import pytest
+from app.extensions import db
+from app.models import UserStats
+from app.services import stats
+from tests.conftest import make_user
+
+
+@pytest.fixture(autouse=True)
+def empty_leaderboard_cache():
+    stats._leaderboard_cache = None
+    yield
+    stats._leaderboard_cache = None
+
+
+def test_increment_creates_then_updates_the_row(app):
+    user_id = make_user(app, 'alice')
+    with app.app_context():
+        stats._increment(user_id, ['games_played', 'wins', 'ai_wins'])
+        stats._increment(user_id, ['games_played', 'losses', 'ai_losses'])
+        db.session.commit()
+        row = db.session.get(UserStats, user_id)
+
+        assert (row.games_played, row.wins, row.losses, row.ai_wins, row.ai_losses) == (2, 1, 1, 1, 1)
+        assert row.draws == 0
+
+
+def test_increment_without_upsert_support_updates_or_inserts(app, monkeypatch):
+    monkeypatch.setattr(stats, '_UPSERT_INSERTS', {})
+    user_id = make_user(app, 'alice')
+    with app.app_context():
+        stats._increment(user_id, ['games_played', 'wins', 'ai_wins'])
+        stats._increment(user_id, ['games_played', 'losses', 'ai_losses'])
+        db.session.commit()
+        row = db.session.get(UserStats, user_id)
+
+        assert (row.games_played, row.wins, row.losses, row.ai_wins, row.ai_losses) == (2, 1, 1, 1, 1)
+
+
+def test_leaderboard_is_rebuilt_from_the_primary(replicated_app):
+    user_id = make_user(replicated_app, 'alice')
+    client = replicated_app.test_client()
+    assert client.get('/api/leaderboard').get_json()['entries'] == []
+
+    with replicated_app.app_context():
+        stats._increment(user_id, ['games_played', 'wins', 'ai_wins'])
+        db.session.info['leaderboard_stale'] = True
+        db.session.commit()
+
+    # The replica has no stats or users at all; the cache must come from the primary
+    entries = client.get('/api/leaderboard').get_json()['entries']
+    assert [(entry['username'], entry['wins']) for entry in entries] == [('alice', 1)]
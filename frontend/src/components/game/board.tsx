@@ -10,8 +10,14 @@ interface BoardProps {
 function Board({ board, onColumnClick, disabled }: BoardProps) {
 	console.log('Board rendered with board:', board, 'board length:', board?.length, 'disabled:', disabled)
 	
-	// Validate board structure
-	if (!board || !Array.isArray(board) || board.length !== 6) {
+	// Validate board structure: any non-empty rectangular board (the game's board spec)
+	if (
+		!Array.isArray(board) ||
+		board.length === 0 ||
+		!Array.isArray(board[0]) ||
+		board[0].length === 0 ||
+		board.some(row => !Array.isArray(row) || row.length !== board[0].length)
+	) {
 		console.error('Invalid board structure:', board)
 		return <div>Invalid board structure</div>
 	}
@@ -27,8 +33,8 @@ function Board({ board, onColumnClick, disabled }: BoardProps) {
 		onColumnClick(col)
 	}
 	
-	// Render board correctly: 6 rows x 7 columns
-	// Row 0 is top, Row 5 is bottom
+	// Render board correctly: 6 rows x 7 columns, or the game's board spec
+	// Row 0 is top, the last row is the bottom
 	return (
 		<div className='inline-block bg-blue-600 p-4 rounded-lg shadow-2xl'>
 			<div className='flex flex-col gap-2'>
@@ -29,7 +29,12 @@ function Game() {
 	const [isProcessingMove, setIsProcessingMove] = useState(false)
 	const [players, setPlayers] = useState<{ [key: number]: PlayerType }>({})
 	const [myPlayerNumber, setMyPlayerNumber] = useState<number | null>(null)
-	const gameHandlersRef = useRef<{ handleGameUpdate?: (data: any) => void; handleGameReset?: (data: any) => void }>({})
+	const gameHandlersRef = useRef<{
+		handleGameUpdate?: (data: any) => void
+		handleGameReset?: (data: any) => void
+		handleResumeEvents?: (data: any) => void
+		handleResumeSnapshot?: (data: any) => void
+	}>({})
 	
 	// Debug: Log state changes
 	useEffect(() => {
@@ -109,7 +114,7 @@ function Game() {
 						if (token) {
 							// Connect and join game
 							socketService.connect(token)
-								.then(() => socketService.joinGame(gameId))
+								.then(() => socketService.joinGame(gameId, game.seq ?? 0))
 								.then(() => {
 									console.log('Successfully connected and joined game:', gameId)
 								})
@@ -139,6 +144,30 @@ function Game() {
 								}
 							}
 							
+							// After a reconnect the server sends the missed events, or the full game if too many were missed
+							const handleResumeEvents = (data: any) => {
+								if (data.game_id !== gameId) return
+								for (const event of data.events || []) {
+									if (event.type === 'move') {
+										dispatch(makeMoveAction({ column: event.column, player: event.player }))
+										dispatch(setCurrentPlayer((3 - event.player) as 1 | 2))
+									} else if (event.type === 'resign' || event.type === 'timeout') {
+										dispatch(setWinner((3 - event.player) as 1 | 2))
+									} else if (event.type === 'finished') {
+										if (event.data?.status === 'draw') {
+											dispatch(setGameStatus('draw'))
+										} else {
+											dispatch(setWinner(event.data?.winner ?? null))
+										}
+									}
+								}
+							}
+							const handleResumeSnapshot = (data: any) => {
+								if (data.game_id === gameId && data.game) {
+									handleGameUpdate(data.game)
+								}
+							}
+							
 							// Set up game reset handler
 							const handleGameReset = (data: any) => {
 								console.log('Game reset received:', data)
@@ -148,9 +177,11 @@ function Game() {
 							
 							socketService.onGameUpdate(handleGameUpdate)
 							socketService.on('game_reset', handleGameReset)
+							socketService.on('resume_events', handleResumeEvents)
+							socketService.on('resume_snapshot', handleResumeSnapshot)
 							
 							// Store handlers for cleanup
-							gameHandlersRef.current = { handleGameUpdate, handleGameReset }
+							gameHandlersRef.current = { handleGameUpdate, handleGameReset, handleResumeEvents, handleResumeSnapshot }
 						}
 					}
 				}
@@ -175,6 +206,12 @@ function Game() {
 				if (handlers.handleGameReset) {
 					socketService.off('game_reset', handlers.handleGameReset)
 				}
+				if (handlers.handleResumeEvents) {
+					socketService.off('resume_events', handlers.handleResumeEvents)
+				}
+				if (handlers.handleResumeSnapshot) {
+					socketService.off('resume_snapshot', handlers.handleResumeSnapshot)
+				}
 				gameHandlersRef.current = {}
 			}
 		}
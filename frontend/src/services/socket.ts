@@ -5,10 +5,19 @@ import { io, Socket } from 'socket.io-client'
 // In production, Flask serves Socket.IO from the same origin
 const SOCKET_URL = ''
 
+// Games joined on this socket and the last event seen of each, to resume after a reconnect
+interface JoinedGame {
+	lastSeq: number
+	spectate: boolean
+}
+
 class SocketService {
 	private socket: Socket | null = null
 	private token: string | null = null
 	private connectionPromise: Promise<Socket> | null = null
+	private games = new Map<number, JoinedGame>()
+	private hasConnected = false
+	private heartbeatTimer: ReturnType<typeof setInterval> | null = null
 
 	async connect(token?: string): Promise<Socket> {
 		// If already connected with the same token, return existing socket
@@ -26,6 +35,7 @@ class SocketService {
 		if (this.socket && this.token !== newToken) {
 			this.socket.disconnect()
 			this.socket = null
+			this.games.clear()
 		}
 
 		this.token = newToken
@@ -72,10 +82,25 @@ class SocketService {
 				}
 			}
 
+			// Every connect after the first is a reconnect: catch up on the joined games
+			this.hasConnected = false
+			const onEveryConnect = () => {
+				if (this.hasConnected) {
+					this.resumeGames()
+				}
+				this.hasConnected = true
+			}
+
 			this.socket.once('connect', onConnect)
 			this.socket.once('connect_error', onConnectError)
+			this.socket.on('connect', onEveryConnect)
 			this.socket.on('error', onError)
 			this.socket.on('disconnect', onDisconnect)
+			this.socket.on('game_update', (data: any) => this.trackSeq(data?.id, data?.seq))
+			this.socket.on('spectator_update', (data: any) => this.trackSeq(data?.id, data?.seq))
+			this.socket.on('resume_events', (data: any) => this.trackSeq(data?.game_id, data?.seq))
+			this.socket.on('resume_snapshot', (data: any) => this.trackSeq(data?.game_id, data?.game?.seq))
+			this.socket.on('connected', (data: any) => this.startHeartbeat(data?.heartbeat_interval))
 
 			// If already connected, resolve immediately
 			if (this.socket.connected) {
@@ -87,6 +112,37 @@ class SocketService {
 		return this.connectionPromise
 	}
 
+	private trackSeq(gameId: number | undefined, seq: number | undefined) {
+		const game = gameId !== undefined ? this.games.get(gameId) : undefined
+		if (game && typeof seq === 'number' && seq > game.lastSeq) {
+			game.lastSeq = seq
+		}
+	}
+
+	private startHeartbeat(intervalSeconds: number | undefined) {
+		// Connections that stop sending heartbeats are dropped from the server's presence registry
+		this.stopHeartbeat()
+		if (intervalSeconds) {
+			this.heartbeatTimer = setInterval(() => {
+				this.socket?.emit('heartbeat')
+			}, intervalSeconds * 1000)
+		}
+	}
+
+	private stopHeartbeat() {
+		if (this.heartbeatTimer) {
+			clearInterval(this.heartbeatTimer)
+			this.heartbeatTimer = null
+		}
+	}
+
+	private resumeGames() {
+		// The server replies with the missed events (resume_events) or the full game (resume_snapshot)
+		this.games.forEach((game, gameId) => {
+			this.socket?.emit('resume', { game_id: gameId, last_seq: game.lastSeq, spectate: game.spectate })
+		})
+	}
+
 	async ensureConnected(): Promise<Socket> {
 		if (this.socket?.connected) {
 			return this.socket
@@ -100,13 +156,15 @@ class SocketService {
 			this.socket = null
 			this.connectionPromise = null
 		}
+		this.stopHeartbeat()
+		this.games.clear()
 	}
 
 	getSocket(): Socket | null {
 		return this.socket
 	}
 
-	async joinGame(gameId: number): Promise<void> {
+	async joinGame(gameId: number, lastSeq = 0): Promise<void> {
 		const socket = await this.ensureConnected()
 		return new Promise((resolve, reject) => {
 			if (!socket.connected) {
@@ -122,6 +180,7 @@ class SocketService {
 				clearTimeout(timeout)
 				socket.off('error', onError)
 				console.log('Joined game:', data)
+				this.games.set(gameId, { lastSeq, spectate: false })
 				resolve()
 			}
 
@@ -139,11 +198,51 @@ class SocketService {
 	}
 
 	leaveGame(gameId: number) {
+		this.games.delete(gameId)
 		if (this.socket?.connected) {
 			this.socket.emit('leave_game', { game_id: gameId })
 		}
 	}
 
+	async spectateGame(gameId: number): Promise<any> {
+		const socket = await this.ensureConnected()
+		return new Promise((resolve, reject) => {
+			if (!socket.connected) {
+				reject(new Error('Socket not connected'))
+				return
+			}
+
+			const timeout = setTimeout(() => {
+				reject(new Error('Spectate game timeout'))
+			}, 5000)
+
+			const onSpectating = (data: any) => {
+				clearTimeout(timeout)
+				socket.off('error', onError)
+				this.games.set(gameId, { lastSeq: data.game?.seq ?? 0, spectate: true })
+				resolve(data.game)
+			}
+
+			const onError = (error: any) => {
+				clearTimeout(timeout)
+				socket.off('spectating', onSpectating)
+				console.error('Spectate game error:', error)
+				reject(error)
+			}
+
+			socket.once('spectating', onSpectating)
+			socket.once('error', onError)
+			socket.emit('spectate_game', { game_id: gameId })
+		})
+	}
+
+	stopSpectating(gameId: number) {
+		this.games.delete(gameId)
+		if (this.socket?.connected) {
+			this.socket.emit('stop_spectating', { game_id: gameId })
+		}
+	}
+
 	async joinRoom(roomCode: string): Promise<void> {
 		const socket = await this.ensureConnected()
 		return new Promise((resolve, reject) => {
@@ -194,6 +293,30 @@ class SocketService {
 		}
 	}
 
+	onSpectatorUpdate(callback: (data: any) => void) {
+		if (this.socket) {
+			this.socket.on('spectator_update', callback)
+		}
+	}
+
+	offSpectatorUpdate(callback: (data: any) => void) {
+		if (this.socket) {
+			this.socket.off('spectator_update', callback)
+		}
+	}
+
+	onPresence(callback: (data: any) => void) {
+		if (this.socket) {
+			this.socket.on('presence', callback)
+		}
+	}
+
+	offPresence(callback: (data: any) => void) {
+		if (this.socket) {
+			this.socket.off('presence', callback)
+		}
+	}
+
 	onRoomUpdate(callback: (data: any) => void) {
 		if (this.socket) {
 			this.socket.on('room_update', callback)
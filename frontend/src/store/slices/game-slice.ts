@@ -29,7 +29,7 @@ const gameSlice = createSlice({
 		makeMove: (state, action: PayloadAction<{ column: number; player: 1 | 2 }>) => {
 			const { column, player } = action.payload
 			// Find the lowest empty row in the column
-			for (let row = 5; row >= 0; row--) {
+			for (let row = state.board.length - 1; row >= 0; row--) {
 				if (state.board[row][column] === 0) {
 					state.board[row][column] = player
 					break
@@ -50,19 +50,20 @@ const gameSlice = createSlice({
 		},
 		setBoard: (state, action: PayloadAction<CellValue[][]>) => {
 			// Create a deep copy to ensure React detects the change
-			// Validate and ensure we have a 6x7 board
+			// Validate and ensure we have a rectangular board (6x7 unless the game has another board spec)
 			console.log('setBoard reducer called with:', action.payload)
 			console.log('Current board in state:', state.board)
 			
-			if (Array.isArray(action.payload) && action.payload.length === 6) {
+			const columns = Array.isArray(action.payload?.[0]) ? action.payload[0].length : 0
+			if (Array.isArray(action.payload) && action.payload.length > 0 && columns > 0) {
 				// Create a completely new array structure
 				const newBoard: CellValue[][] = []
-				for (let i = 0; i < 6; i++) {
+				for (let i = 0; i < action.payload.length; i++) {
 					const row = action.payload[i]
-					if (Array.isArray(row) && row.length === 7) {
+					if (Array.isArray(row) && row.length === columns) {
 						newBoard.push([...row] as CellValue[])
 					} else {
-						newBoard.push(Array(7).fill(0) as CellValue[])
+						newBoard.push(Array(columns).fill(0) as CellValue[])
 					}
 				}
 				console.log('Setting new board:', newBoard)